@@ -16,14 +16,19 @@
 # THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
+import time
+import asyncio
+import weakref
 import numpy as np
 import random
 import bittensor as bt
 
+from checkerchain.utils.metrics import record_cache
 
-async def ping_uids(dendrite, metagraph, uids, timeout=3):
+
+async def probe_uids(dendrite, metagraph, uids, timeout=3):
     """
-    Pings a list of UIDs to check their availability on the Bittensor network.
+    Pings a list of UIDs with an empty synapse and reports each one's status code and latency.
 
     Args:
         dendrite (bittensor.dendrite): The dendrite instance to use for pinging nodes.
@@ -32,10 +37,14 @@ async def ping_uids(dendrite, metagraph, uids, timeout=3):
         timeout (int, optional): The timeout in seconds for each ping. Defaults to 3.
 
     Returns:
-        tuple: A tuple containing two lists:
-            - The first list contains UIDs that were successfully pinged.
-            - The second list contains UIDs that failed to respond.
+        tuple: A tuple containing two arrays aligned with `uids`:
+            - The status code of each ping (0 if the request itself failed).
+            - The round-trip time of each ping in seconds (NaN if it did not succeed).
     """
+    status_codes = np.zeros(len(uids), dtype=np.int64)
+    latencies = np.full(len(uids), np.nan)
+    if not len(uids):
+        return status_codes, latencies
     axons = [metagraph.axons[uid] for uid in uids]
     try:
         responses = await dendrite(
@@ -44,25 +53,54 @@ async def ping_uids(dendrite, metagraph, uids, timeout=3):
             deserialize=False,
             timeout=timeout,
         )
-        successful_uids = [
-            uid
-            for uid, response in zip(uids, responses)
-            if response.dendrite.status_code == 200
-        ]
-        failed_uids = [
-            uid
-            for uid, response in zip(uids, responses)
-            if response.dendrite.status_code != 200
-        ]
     except Exception as e:
         bt.logging.error(f"Dendrite ping failed: {e}")
-        successful_uids = []
-        failed_uids = uids
+        return status_codes, latencies
+    for i, response in enumerate(responses):
+        status_codes[i] = int(response.dendrite.status_code or 0)
+        if status_codes[i] == 200 and response.dendrite.process_time is not None:
+            latencies[i] = float(response.dendrite.process_time)
+    return status_codes, latencies
+
+
+async def ping_uids(dendrite, metagraph, uids, timeout=3):
+    """
+    Pings a list of UIDs to check their availability on the Bittensor network.
+
+    Args:
+        dendrite (bittensor.dendrite): The dendrite instance to use for pinging nodes.
+        metagraph (bittensor.metagraph): The metagraph instance containing network information.
+        uids (list): A list of UIDs (unique identifiers) to ping.
+        timeout (int, optional): The timeout in seconds for each ping. Defaults to 3.
+
+    Returns:
+        tuple: A tuple containing two lists:
+            - The first list contains UIDs that were successfully pinged.
+            - The second list contains UIDs that failed to respond.
+    """
+    status_codes, _ = await probe_uids(dendrite, metagraph, uids, timeout=timeout)
+    successful_uids = [uid for uid, code in zip(uids, status_codes) if code == 200]
+    failed_uids = [uid for uid, code in zip(uids, status_codes) if code != 200]
     bt.logging.debug(f"ping() successful uids: {successful_uids}")
     bt.logging.debug(f"ping() failed uids    : {failed_uids}")
     return successful_uids, failed_uids
 
 
+def rank_query_api_nodes(metagraph, n=0.1):
+    """
+    Returns the candidate API node UIDs: validators with trust among the top `n` fraction by stake,
+    ranked by stake (highest first).
+    """
+    stake = np.asarray(metagraph.S, dtype=np.float64)
+    if not stake.size:
+        return []
+    candidates = np.flatnonzero(
+        (np.asarray(metagraph.validator_trust) > 0)
+        & (stake > np.quantile(stake, 1 - n))
+    )
+    return candidates[np.argsort(-stake[candidates], kind="stable")].tolist()
+
+
 async def get_query_api_nodes(dendrite, metagraph, n=0.1, timeout=3):
     """
     Fetches the available API nodes to query for the particular subnet.
@@ -79,17 +117,8 @@ async def get_query_api_nodes(dendrite, metagraph, n=0.1, timeout=3):
     bt.logging.debug(
         f"Fetching available API nodes for subnet {metagraph.netuid}"
     )
-    vtrust_uids = [
-        uid.item()
-        for uid in metagraph.uids
-        if metagraph.validator_trust[uid] > 0
-    ]
-    top_uids = np.where(metagraph.S > np.quantile(metagraph.S, 1 - n))[
-        0
-    ].tolist()
-    init_query_uids = set(top_uids).intersection(set(vtrust_uids))
     query_uids, _ = await ping_uids(
-        dendrite, metagraph, list(init_query_uids), timeout=timeout
+        dendrite, metagraph, rank_query_api_nodes(metagraph, n=n), timeout=timeout
     )
     bt.logging.debug(
         f"Available API node UIDs for subnet {metagraph.netuid}: {query_uids}"
@@ -99,6 +128,136 @@ async def get_query_api_nodes(dendrite, metagraph, n=0.1, timeout=3):
     return query_uids
 
 
+class QueryApiClient:
+    """
+    Long-lived client for locating a subnet's query API nodes.
+
+    Holds one dendrite (and so one HTTP session) for its whole lifetime, a metagraph that is
+    re-synced at most every `metagraph_ttl` seconds, and the ranked list of API nodes that answered
+    a ping, which is reused for `nodes_ttl` seconds. Once warm, `get_axons` does no network I/O, so a
+    client query costs a single round-trip to the chosen node.
+
+    A metagraph passed in is the caller's to sync; only a metagraph the client created itself is
+    re-synced. The HTTP session of a dendrite the client created is bound to the event loop it was
+    first used on, so the client creates a new dendrite when it is used from another loop (e.g. one
+    `asyncio.run` per query). An empty node list is never memoized, since it usually means the
+    pings themselves failed.
+    """
+
+    def __init__(
+        self,
+        wallet: "bt.wallet",
+        netuid: int = 21,
+        metagraph: "bt.metagraph" = None,
+        subtensor: "bt.subtensor" = None,
+        n: float = 0.1,
+        timeout: float = 3,
+        metagraph_ttl: float = 600,
+        nodes_ttl: float = 300,
+        dendrite: "bt.dendrite" = None,
+    ):
+        self.netuid = netuid
+        self.subtensor = subtensor
+        self.n = n
+        self.timeout = timeout
+        self.metagraph_ttl = metagraph_ttl
+        self.nodes_ttl = nodes_ttl
+        # Pass an existing dendrite (e.g. the validator's) to share its HTTP session.
+        self.wallet = wallet
+        self._owns_dendrite = dendrite is None
+        self.dendrite = dendrite if dendrite is not None else bt.dendrite(wallet=wallet)
+        self._loop = None
+        self._owns_metagraph = metagraph is None
+        self._metagraph = metagraph
+        self._metagraph_synced_at = time.monotonic() if metagraph is not None else None
+        self._nodes = None
+        self._nodes_fetched_at = None
+
+    def _get_subtensor(self) -> "bt.subtensor":
+        if self.subtensor is None:
+            self.subtensor = bt.subtensor()
+        return self.subtensor
+
+    def _bind_loop(self):
+        """Replaces the owned dendrite if its HTTP session belongs to another (possibly closed) event loop."""
+        loop = asyncio.get_running_loop()
+        bound = self._loop() if self._loop is not None else None
+        if bound is loop:
+            return
+        if self._loop is not None and self._owns_dendrite:
+            # The old session cannot be closed from this loop; it goes away with the old dendrite.
+            self.dendrite = bt.dendrite(wallet=self.wallet)
+        self._loop = weakref.ref(loop)
+
+    def use_metagraph(self, metagraph: "bt.metagraph"):
+        """Switches to a caller's metagraph, which the caller keeps in sync, and re-ranks the nodes."""
+        if metagraph is self._metagraph:
+            return
+        self._metagraph = metagraph
+        self._owns_metagraph = False
+        self._metagraph_synced_at = time.monotonic()
+        self._nodes = None
+
+    @property
+    def metagraph(self) -> "bt.metagraph":
+        """The cached metagraph, synced first if it is older than `metagraph_ttl`."""
+        now = time.monotonic()
+        if self._metagraph is None:
+            self._metagraph = bt.metagraph(netuid=self.netuid, subtensor=self._get_subtensor())
+            self._metagraph_synced_at = now
+        elif self._owns_metagraph and now - self._metagraph_synced_at >= self.metagraph_ttl:
+            self._metagraph.sync(subtensor=self._get_subtensor())
+            self._metagraph_synced_at = now
+            # The node ranking depends on stake and trust; re-rank after a sync.
+            self._nodes = None
+        return self._metagraph
+
+    async def get_nodes(self, refresh: bool = False):
+        """Returns the ranked UIDs of the API nodes that answered a ping, pinging only when the memo is stale."""
+        metagraph = self.metagraph
+        now = time.monotonic()
+        stale = (
+            refresh
+            or self._nodes is None
+            or now - self._nodes_fetched_at >= self.nodes_ttl
+        )
+        record_cache("query_api_nodes", hit=not stale)
+        if not stale:
+            return self._nodes
+        self._bind_loop()
+        nodes, _ = await ping_uids(
+            self.dendrite,
+            metagraph,
+            rank_query_api_nodes(metagraph, n=self.n),
+            timeout=self.timeout,
+        )
+        bt.logging.debug(f"Available API node UIDs for subnet {self.netuid}: {nodes}")
+        if nodes:
+            self._nodes, self._nodes_fetched_at = nodes, now
+        else:
+            self._nodes = None
+        return nodes
+
+    async def get_axons(self, uids=None, k: int = 3):
+        """
+        Returns the axons to query: the given `uids`, or `k` random nodes from the memoized ranking.
+        """
+        if uids is not None:
+            query_uids = [uids] if isinstance(uids, int) else uids
+        else:
+            nodes = await self.get_nodes()
+            query_uids = random.sample(nodes, k) if len(nodes) > k else list(nodes)
+        metagraph = self.metagraph
+        return [metagraph.axons[uid] for uid in query_uids]
+
+    async def close(self):
+        await self.dendrite.aclose_session()
+
+
+# One client per (hotkey, netuid, n, timeout), so get_query_api_axons reuses its dendrite and metagraph.
+_clients = {}
+
+
 async def get_query_api_axons(
     wallet, metagraph=None, n=0.1, timeout=3, uids=None
 ):
@@ -115,15 +274,14 @@ async def get_query_api_axons(
     Returns:
         list: A list of axon objects for the available API nodes.
     """
-    dendrite = bt.dendrite(wallet=wallet)
-
-    if metagraph is None:
-        metagraph = bt.metagraph(netuid=21)
-
-    if uids is not None:
-        query_uids = [uids] if isinstance(uids, int) else uids
-    else:
-        query_uids = await get_query_api_nodes(
-            dendrite, metagraph, n=n, timeout=timeout
+    netuid = metagraph.netuid if metagraph is not None else 21
+    key = (wallet.hotkey.ss58_address, netuid, n, timeout)
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = QueryApiClient(
+            wallet, netuid=netuid, metagraph=metagraph, n=n, timeout=timeout
         )
-    return [metagraph.axons[uid] for uid in query_uids]
+    elif metagraph is not None:
+        # A caller may pass a fresher metagraph than the one the client was built with.
+        client.use_metagraph(metagraph)
+    return await client.get_axons(uids=uids)
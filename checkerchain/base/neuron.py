@@ -23,8 +23,11 @@ import bittensor as bt
 from abc import ABC, abstractmethod
 
 # Sync calls set weights and also resyncs the metagraph.
-from checkerchain.utils.config import check_config, add_args, config
+from checkerchain.utils.config import check_config, add_args, config, resolve_device
+from checkerchain.utils.metrics import start_metrics_server
+from checkerchain.utils.profiling import build_profiler
 from checkerchain.utils.misc import ttl_get_block
+from checkerchain.base.utils.hyperparameters import SubnetHyperparameterCache
 from checkerchain import __spec_version__ as spec_version
 from checkerchain.mock import MockSubtensor, MockMetagraph
 
@@ -59,6 +62,12 @@ class BaseNeuron(ABC):
     def block(self):
         return ttl_get_block(self)
 
+    @property
+    def device(self) -> str:
+        # If a gpu is required, set the device to cuda:N (e.g. cuda:0).
+        # "auto" is only probed (once per process) when something actually asks for the device.
+        return resolve_device(self.config.neuron.device)
+
     def __init__(self, config=None):
         base_config = copy.deepcopy(config or BaseNeuron.config())
         self.config = self.config()
@@ -69,12 +78,15 @@ class BaseNeuron(ABC):
         # Set up logging with the provided configuration.
         bt.logging.set_config(config=self.config.logging)
 
-        # If a gpu is required, set the device to cuda:N (e.g. cuda:0)
-        self.device = self.config.neuron.device
-
         # Log the configuration for reference.
         bt.logging.info(self.config)
 
+        # Optional local Prometheus endpoint.
+        start_metrics_server(self.config.neuron.metrics_port)
+
+        # Optional profiling of every Nth forward; None when disabled.
+        self.profiler = build_profiler(self.config)
+
         # Build Bittensor objects
         # These are core Bittensor classes to interact with the network.
         bt.logging.info("Setting up bittensor objects.")
@@ -92,6 +104,13 @@ class BaseNeuron(ABC):
         bt.logging.info(f"Subtensor: {self.subtensor}")
         bt.logging.info(f"Metagraph: {self.metagraph}")
 
+        # Subnet hyperparameters are refreshed during resync_metagraph, not on every set_weights.
+        self.hyperparameters = SubnetHyperparameterCache(
+            self.subtensor,
+            self.config.netuid,
+            ttl_blocks=self.config.neuron.hyperparameter_ttl,
+        )
+
         # Check if the miner is registered on the Bittensor network before proceeding further.
         self.check_registered()
 
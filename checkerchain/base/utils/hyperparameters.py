@@ -0,0 +1,62 @@
+from typing import Optional
+
+import bittensor as bt
+
+from checkerchain.utils.metrics import record_cache
+
+
+class SubnetHyperparameterCache:
+    """
+    Block-based TTL cache of the subnet hyperparameters used when processing weights.
+
+    `min_allowed_weights` and `max_weight_limit` change rarely, so they are fetched from the chain
+    at most once every `ttl_blocks` blocks, from `resync_metagraph`, instead of on every
+    `set_weights`. Reading a value never hits the chain unless the cache has never been filled.
+    """
+
+    def __init__(self, subtensor: "bt.subtensor", netuid: int, ttl_blocks: int = 360):
+        self.subtensor = subtensor
+        self.netuid = netuid
+        self.ttl_blocks = ttl_blocks
+        self.fetched_at_block: Optional[int] = None
+        self._min_allowed_weights: Optional[int] = None
+        self._max_weight_limit: Optional[float] = None
+
+    def is_stale(self, block: int) -> bool:
+        return self.fetched_at_block is None or block - self.fetched_at_block >= self.ttl_blocks
+
+    def refresh(self, block: int, force: bool = False) -> bool:
+        """Re-fetches the hyperparameters if the cache is stale at `block`. Returns True if it fetched."""
+        if not force and not self.is_stale(block):
+            record_cache("hyperparameters", hit=True)
+            return False
+        record_cache("hyperparameters", hit=False)
+        try:
+            min_allowed_weights = self.subtensor.min_allowed_weights(netuid=self.netuid)
+            max_weight_limit = self.subtensor.max_weight_limit(netuid=self.netuid)
+        except Exception as e:
+            # Keep serving the previous values; the next resync will try again.
+            bt.logging.warning(f"Failed to refresh subnet hyperparameters: {e}")
+            return False
+        self._min_allowed_weights = min_allowed_weights
+        self._max_weight_limit = max_weight_limit
+        self.fetched_at_block = block
+        bt.logging.debug(
+            f"Subnet hyperparameters at block {block}: min_allowed_weights={min_allowed_weights}, "
+            f"max_weight_limit={max_weight_limit}"
+        )
+        return True
+
+    def _ensure_loaded(self):
+        if self.fetched_at_block is None:
+            self.refresh(self.subtensor.get_current_block(), force=True)
+
+    @property
+    def min_allowed_weights(self) -> int:
+        self._ensure_loaded()
+        return self._min_allowed_weights
+
+    @property
+    def max_weight_limit(self) -> float:
+        self._ensure_loaded()
+        return self._max_weight_limit
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+
+import bittensor as bt
+import numpy as np
+
+
+def axon_fingerprint(axon: "bt.AxonInfo") -> int:
+    """Hash of the fields that identify where and how a UID is served."""
+    return hash(
+        (axon.hotkey, axon.coldkey, axon.ip, axon.port, axon.ip_type, axon.protocol, axon.version)
+    )
+
+
+@dataclass(frozen=True)
+class MetagraphDiff:
+    """UIDs that changed between two metagraph snapshots."""
+
+    # UIDs that exist in both snapshots but are now held by a different hotkey.
+    replaced: np.ndarray
+    # UIDs that only exist in the newer snapshot (the subnet grew).
+    added: np.ndarray
+    # UIDs that only exist in the older snapshot (the subnet shrank).
+    removed: np.ndarray
+    # UIDs held by the same hotkey whose axon was re-served (new IP, port, version, ...).
+    updated_axons: np.ndarray
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.replaced.size or self.added.size or self.removed.size or self.updated_axons.size)
+
+
+@dataclass(frozen=True)
+class MetagraphSnapshot:
+    """
+    Per-UID hotkeys and axon fingerprints of a metagraph.
+
+    Replaces keeping a deep copy of the whole metagraph around just to detect what changed across
+    a sync: a snapshot is two flat arrays, and `diff` compares them with vectorized operations.
+    """
+
+    hotkeys: np.ndarray
+    axons: np.ndarray
+
+    @classmethod
+    def from_metagraph(cls, metagraph: "bt.metagraph") -> "MetagraphSnapshot":
+        return cls(
+            hotkeys=np.asarray(metagraph.hotkeys, dtype=str),
+            axons=np.fromiter(
+                (axon_fingerprint(axon) for axon in metagraph.axons),
+                dtype=np.int64,
+                count=len(metagraph.axons),
+            ),
+        )
+
+    def with_hotkeys(self, hotkeys) -> "MetagraphSnapshot":
+        """Returns a copy whose hotkeys are replaced, e.g. by the ones restored from saved state."""
+        return MetagraphSnapshot(hotkeys=np.asarray(hotkeys, dtype=str), axons=self.axons)
+
+    def diff(self, newer: "MetagraphSnapshot") -> MetagraphDiff:
+        old_n, new_n = len(self.hotkeys), len(newer.hotkeys)
+        common = min(old_n, new_n)
+        replaced = np.flatnonzero(self.hotkeys[:common] != newer.hotkeys[:common])
+
+        common_axons = min(common, len(self.axons), len(newer.axons))
+        axon_changed = self.axons[:common_axons] != newer.axons[:common_axons]
+        axon_changed[replaced[replaced < common_axons]] = False
+
+        return MetagraphDiff(
+            replaced=replaced,
+            added=np.arange(old_n, new_n),
+            removed=np.arange(new_n, old_n),
+            updated_axons=np.flatnonzero(axon_changed),
+        )
@@ -0,0 +1,122 @@
+import os
+from typing import Optional
+
+import numpy as np
+
+
+def _capacity_for(n: int) -> int:
+    """Next power of two >= n (at least 256), so growth reallocates only O(log n) times."""
+    return max(256, 1 << max(0, int(n) - 1).bit_length())
+
+
+class ScoreStore:
+    """
+    Preallocated moving-average scores and their last-known-good copy.
+
+    Both live in one `(2, capacity)` array of a fixed dtype: row 0 holds the scores, row 1 the last
+    scores. `scores` and `last_scores` are views of the first `n` columns, and every update writes
+    into them in place, so a round allocates nothing and growing the metagraph only reallocates
+    when it outgrows the capacity. With `path`, the array is a memory-mapped `.npy` file: updates
+    land in the page cache as they happen and survive restarts without being re-serialized.
+    """
+
+    def __init__(self, n: int, dtype=np.float32, path: Optional[str] = None):
+        self.dtype = np.dtype(dtype)
+        self.path = path
+        self.n = int(n)
+        # Whether `path` did not exist yet, i.e. the values still have to be restored from elsewhere.
+        self.created = path is not None and not os.path.exists(path)
+        self._data = self._open(_capacity_for(self.n))
+        self._scratch = np.zeros(self.capacity, dtype=self.dtype)
+
+    @property
+    def capacity(self) -> int:
+        return self._data.shape[1]
+
+    @property
+    def persistent(self) -> bool:
+        return self.path is not None
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self._data[0, : self.n]
+
+    @property
+    def last_scores(self) -> np.ndarray:
+        return self._data[1, : self.n]
+
+    def _open(self, capacity: int) -> np.ndarray:
+        if self.path is None:
+            return np.zeros((2, capacity), dtype=self.dtype)
+        if os.path.exists(self.path):
+            data = np.lib.format.open_memmap(self.path, mode="r+")
+            if data.dtype == self.dtype and data.shape[0] == 2 and data.shape[1] >= capacity:
+                return data
+            # Wrong layout or too small: migrate the existing values into a fresh file.
+            return self._replace_file(data, max(capacity, data.shape[1]))
+        data = np.lib.format.open_memmap(
+            self.path, mode="w+", dtype=self.dtype, shape=(2, capacity)
+        )
+        data[:] = 0
+        return data
+
+    def _replace_file(self, old: np.ndarray, capacity: int) -> np.ndarray:
+        tmp_path = f"{self.path}.tmp.npy"
+        new = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=self.dtype, shape=(2, capacity))
+        new[:] = 0
+        rows, cols = min(2, old.shape[0]), min(capacity, old.shape[1])
+        new[:rows, :cols] = old[:rows, :cols]
+        new.flush()
+        del old
+        os.replace(tmp_path, self.path)
+        return new
+
+    def resize(self, n: int):
+        """Makes room for `n` UIDs. New UIDs start at zero."""
+        n = int(n)
+        if n > self.capacity:
+            capacity = _capacity_for(n)
+            if self.path is None:
+                grown = np.zeros((2, capacity), dtype=self.dtype)
+                grown[:, : self.capacity] = self._data
+                self._data = grown
+            else:
+                self._data = self._replace_file(self._data, capacity)
+            self._scratch = np.zeros(capacity, dtype=self.dtype)
+        if n > self.n:
+            # Columns past `n` may hold values of UIDs that existed before a shrink.
+            self._data[:, self.n : n] = 0
+            self.n = n
+
+    def update(self, uids: np.ndarray, rewards: np.ndarray, alpha: float):
+        """scores = alpha * scattered(rewards) + (1 - alpha) * scores, in place; then last_scores = scores."""
+        scores = self.scores
+        scattered = self._scratch[: self.n]
+        scattered[:] = 0
+        scattered[uids] = rewards
+        np.multiply(scores, 1 - alpha, out=scores)
+        np.multiply(scattered, alpha, out=scattered)
+        np.add(scores, scattered, out=scores)
+        np.copyto(self.last_scores, scores)
+
+    def revert(self):
+        """Restores the scores to the last scores."""
+        np.copyto(self.scores, self.last_scores)
+
+    def reset(self, uids):
+        """Zeroes the scores of `uids`, e.g. when their hotkey has been replaced."""
+        self.scores[uids] = 0
+
+    def assign(self, scores: Optional[np.ndarray] = None, last_scores: Optional[np.ndarray] = None):
+        """Overwrites the given rows, resizing to fit (e.g. when loading saved state)."""
+        for row, values in enumerate((scores, last_scores)):
+            if values is None:
+                continue
+            values = np.asarray(values)
+            self.resize(max(self.n, len(values)))
+            self._data[row, : self.n] = 0
+            self._data[row, : len(values)] = values
+
+    def flush(self):
+        if isinstance(self._data, np.memmap):
+            self._data.flush()
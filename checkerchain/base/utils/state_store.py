@@ -0,0 +1,107 @@
+import hashlib
+import os
+import zipfile
+from typing import Dict, Iterable, List, Optional
+
+import bittensor as bt
+import numpy as np
+
+# Version 1 is the original unversioned state.npz; version 2 adds the schema version itself,
+# byte-string hotkeys and latest_miner_performance.
+STATE_VERSION = 2
+
+
+def encode_hotkeys(hotkeys: Iterable[str]) -> np.ndarray:
+    """Packs hotkeys into a fixed-width bytes array, which loads without pickle."""
+    encoded = [str(hotkey).encode("utf-8") for hotkey in hotkeys]
+    width = max((len(h) for h in encoded), default=1)
+    return np.array(encoded, dtype=f"S{width}")
+
+
+def decode_hotkeys(hotkeys: np.ndarray) -> List[str]:
+    return [h.decode("utf-8") if isinstance(h, bytes) else str(h) for h in hotkeys.tolist()]
+
+
+class StateStore:
+    """
+    Crash-safe store for a neuron's array state.
+
+    `save` writes a compressed .npz to a temporary file in the same directory, fsyncs it and renames
+    it over the previous file, so a crash leaves either the old or the new state, never a torn one.
+    It skips the write entirely when nothing but the `volatile` keys changed since the last save.
+    `load` never unpickles current files, upgrades unversioned (version 1) files, and sets
+    unreadable files aside instead of failing every restart on them.
+    """
+
+    def __init__(self, path: str, volatile: Iterable[str] = ("step",)):
+        self.path = path
+        self.volatile = set(volatile)
+        self._last_digest: Optional[bytes] = None
+
+    def _digest(self, state: Dict[str, np.ndarray]) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        for key in sorted(state):
+            if key in self.volatile:
+                continue
+            value = np.ascontiguousarray(state[key])
+            digest.update(key.encode())
+            digest.update(str((value.dtype.str, value.shape)).encode())
+            digest.update(value.tobytes())
+        return digest.digest()
+
+    def save(self, state: Dict[str, np.ndarray]) -> bool:
+        """Atomically writes `state` if it changed. Returns True if the file was written."""
+        digest = self._digest(state)
+        if digest == self._last_digest:
+            return False
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, version=np.asarray(STATE_VERSION), **state)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        # Persist the rename itself.
+        dir_fd = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        self._last_digest = digest
+        return True
+
+    def load(self) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Returns the saved state upgraded to the current version, or None if there is none.
+        A corrupt file is renamed to `<path>.corrupt` and treated as missing.
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            try:
+                state = self._read(allow_pickle=False)
+            except ValueError:
+                # Version 1 files may hold hotkeys as a pickled object array.
+                state = self._read(allow_pickle=True)
+                if "version" in state:
+                    raise ValueError("versioned state must not contain pickled arrays")
+        except (zipfile.BadZipFile, ValueError, OSError, EOFError, KeyError) as e:
+            corrupt_path = f"{self.path}.corrupt"
+            bt.logging.error(f"State at {self.path} is unreadable ({e}); moving it to {corrupt_path}.")
+            os.replace(self.path, corrupt_path)
+            return None
+
+        version = int(state.pop("version", 1))
+        if version > STATE_VERSION:
+            bt.logging.warning(
+                f"State version {version} is newer than supported version {STATE_VERSION}."
+            )
+        if "hotkeys" in state:
+            state["hotkeys"] = encode_hotkeys(decode_hotkeys(state["hotkeys"]))
+        self._last_digest = self._digest(state)
+        return state
+
+    def _read(self, allow_pickle: bool) -> Dict[str, np.ndarray]:
+        with np.load(self.path, allow_pickle=allow_pickle) as npz:
+            # Materialize every array so that a truncated member fails here, not later.
+            return {key: npz[key] for key in npz.files}
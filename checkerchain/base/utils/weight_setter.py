@@ -0,0 +1,169 @@
+import random
+import threading
+from typing import List, NamedTuple, Optional
+
+import bittensor as bt
+
+from checkerchain.utils.metrics import QUEUE_DEPTH
+
+
+class WeightSubmission(NamedTuple):
+    uids: List[int]
+    weights: List[int]
+    # Block at which the extrinsic was sent; None while it is still pending.
+    block: Optional[int] = None
+
+
+class WeightSetter:
+    """
+    Submits the validator's weights to the chain from a background thread.
+
+    `submit` only records the latest weight vector, so `sync()` never blocks on the chain. The
+    worker sends it with its own subtensor connection, retries failed submissions with exponential
+    backoff, and watches the validator's `LastUpdate` entry (what `metagraph.last_update` is built
+    from) to confirm that the extrinsic was included. A submission not included within
+    `inclusion_timeout` blocks is retried. Submitting the same vector that is already pending or in
+    flight is a no-op; an identical vector submitted after the previous one landed is still sent, as
+    setting weights is also what keeps the validator active on the subnet.
+    """
+
+    def __init__(
+        self,
+        subtensor: "bt.subtensor",
+        wallet: "bt.wallet",
+        netuid: int,
+        uid: int,
+        version_key: int,
+        poll_interval: float = 12.0,
+        inclusion_timeout: int = 20,
+        max_backoff: float = 600.0,
+    ):
+        self.subtensor = subtensor
+        self.wallet = wallet
+        self.netuid = netuid
+        self.uid = uid
+        self.version_key = version_key
+        self.poll_interval = poll_interval
+        self.inclusion_timeout = inclusion_timeout
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self.pending: Optional[WeightSubmission] = None
+        self.in_flight: Optional[WeightSubmission] = None
+        self.last_included: Optional[WeightSubmission] = None
+
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+
+    def submit(self, uids: List[int], weights: List[int]) -> bool:
+        """
+        Queues a weight vector for submission.
+
+        Returns:
+            bool: False if the vector was skipped because it is already pending or in flight.
+        """
+        submission = WeightSubmission(list(uids), list(weights))
+        with self._lock:
+            for queued in (self.pending, self.in_flight):
+                if queued is not None and _same_weights(queued, submission):
+                    bt.logging.info("Weights unchanged since the last submission. Skipping.")
+                    return False
+            self.pending = submission
+        self._wakeup.set()
+        return True
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="weight-setter", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                delay = self.poll_once()
+            except Exception as e:
+                bt.logging.error(f"Weight setter error: {e}")
+                self._failures += 1
+                delay = self._backoff()
+            with self._lock:
+                queued = (self.pending is not None) + (self.in_flight is not None)
+            QUEUE_DEPTH.labels(queue="weights").set(queued)
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+
+    def _backoff(self) -> float:
+        delay = min(self.max_backoff, 2 ** min(self._failures, 16))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _last_update(self) -> int:
+        last_update = self.subtensor.get_hyperparameter(param_name="LastUpdate", netuid=self.netuid)
+        return int(last_update[self.uid])
+
+    def poll_once(self) -> float:
+        """
+        Checks the in-flight submission for inclusion, then sends the pending one if nothing is in flight.
+
+        Returns:
+            float: Seconds to wait before polling again.
+        """
+        if self.in_flight is not None:
+            block = self.subtensor.get_current_block()
+            if self._last_update() >= self.in_flight.block:
+                bt.logging.info(f"Weights submitted at block {self.in_flight.block} were included.")
+                with self._lock:
+                    self.last_included, self.in_flight = self.in_flight, None
+                self._failures = 0
+            elif block - self.in_flight.block > self.inclusion_timeout:
+                bt.logging.warning(
+                    f"Weights submitted at block {self.in_flight.block} were not included after "
+                    f"{self.inclusion_timeout} blocks. Retrying."
+                )
+                with self._lock:
+                    # A newer vector supersedes the one that was lost.
+                    if self.pending is None:
+                        self.pending = self.in_flight._replace(block=None)
+                    self.in_flight = None
+                self._failures += 1
+                return self._backoff()
+            else:
+                return self.poll_interval
+
+        with self._lock:
+            submission = self.pending
+        if submission is None:
+            return self.poll_interval
+
+        block = self.subtensor.get_current_block()
+        bt.logging.info(f"Submitting {len(submission.weights)} weights at block {block}.")
+        result, msg = self.subtensor.set_weights(
+            wallet=self.wallet,
+            netuid=self.netuid,
+            uids=submission.uids,
+            weights=submission.weights,
+            wait_for_finalization=False,
+            wait_for_inclusion=False,
+            version_key=self.version_key,
+        )
+        if result is not True:
+            bt.logging.error(f"set_weights failed: {msg}")
+            self._failures += 1
+            return self._backoff()
+
+        with self._lock:
+            self.in_flight = submission._replace(block=block)
+            if self.pending is submission:
+                self.pending = None
+        return self.poll_interval
+
+
+def _same_weights(a: WeightSubmission, b: WeightSubmission) -> bool:
+    return a.uids == b.uids and a.weights == b.weights
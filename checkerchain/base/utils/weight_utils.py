@@ -1,8 +1,10 @@
 import numpy as np
-from typing import Tuple, List, Union, Any
+from typing import Tuple, List, Optional, Union, Any
 import bittensor
 from numpy import ndarray, dtype, floating, complexfloating
 
+from checkerchain.utils import logging as log
+
 U32_MAX = 4294967295
 U16_MAX = 65535
 
@@ -35,9 +37,7 @@ def normalize_max_weight(x: np.ndarray, limit: float = 0.1) -> np.ndarray:
         cumsum = np.cumsum(estimation, 0)
 
         # Determine the index of cutoff
-        estimation_sum = np.array(
-            [(len(values) - i - 1) * estimation[i] for i in range(len(values))]
-        )
+        estimation_sum = np.arange(len(values) - 1, -1, -1) * estimation
         n_values = (
             estimation / (estimation_sum + cumsum + epsilon) < limit
         ).sum()
@@ -56,6 +56,61 @@ def normalize_max_weight(x: np.ndarray, limit: float = 0.1) -> np.ndarray:
         return y
 
 
+def rankdata_average(x: np.ndarray) -> np.ndarray:
+    r"""Ranks x in ascending order starting at 1, giving tied values the average of their ranks.
+    Matches ``scipy.stats.rankdata(x, method="average")``.
+    Args:
+        x (:obj:`np.ndarray`):
+            1-D array of values to rank.
+    Returns:
+        ranks (:obj:`np.ndarray`):
+            Float ranks, aligned with x.
+    """
+    x = np.asarray(x)
+    if x.size == 0:
+        return np.zeros(0, dtype=np.float64)
+    order = np.argsort(x, kind="mergesort")
+    sorted_x = x[order]
+    # Start index of every run of equal values, plus the end sentinel.
+    starts = np.flatnonzero(np.r_[True, sorted_x[1:] != sorted_x[:-1]])
+    bounds = np.r_[starts, x.size]
+    # Ranks in a run [start, stop) are start+1 .. stop, so their average is (start + stop + 1) / 2.
+    run_ranks = (bounds[:-1] + bounds[1:] + 1) / 2.0
+    ranks = np.empty(x.size, dtype=np.float64)
+    ranks[order] = np.repeat(run_ranks, np.diff(bounds))
+    return ranks
+
+
+def compute_rank_weights(
+    performance: np.ndarray, observed: np.ndarray, dividends: np.ndarray
+) -> np.ndarray:
+    r"""Turns per-UID performance into L1-normalized, rank-based weights.
+    Observed UIDs are ranked by performance (best gets the highest rank, ties share the average
+    rank), UIDs earning dividends (validators) are zeroed, and the result is normalized to sum to 1.
+    Has no side effects.
+    Args:
+        performance (:obj:`np.ndarray`):
+            Performance of every UID, indexed by UID.
+        observed (:obj:`np.ndarray`):
+            Boolean mask of UIDs that have been scored; the others get zero weight.
+        dividends (:obj:`np.ndarray`):
+            Dividends of every UID, indexed by UID.
+    Returns:
+        weights (:obj:`np.ndarray`):
+            Weights indexed by UID, summing to 1, or all zeros if nothing can be weighted.
+    """
+    performance = np.nan_to_num(np.asarray(performance, dtype=np.float64), nan=0.0)
+    observed = np.asarray(observed, dtype=bool)
+    weights = np.zeros(performance.size, dtype=np.float32)
+    ranked_uids = np.flatnonzero(observed)
+    weights[ranked_uids] = rankdata_average(performance[ranked_uids])
+    weights[np.asarray(dividends) > 0] = 0.0
+    norm = weights.sum()
+    if norm <= 0:
+        return np.zeros_like(weights)
+    return weights / norm
+
+
 def convert_weights_and_uids_for_emit(
     uids: np.ndarray, weights: np.ndarray
 ) -> Tuple[List[int], List[int]]:
@@ -106,24 +161,20 @@ def convert_weights_and_uids_for_emit(
         return [], []  # Nothing to set on chain.
     else:
         max_weight = float(np.max(weights))
-        weights = [
-            float(value) / max_weight for value in weights
-        ]  # max-upscale values (max_weight = 1).
+        weights = (
+            weights.astype(np.float64) / max_weight
+        )  # max-upscale values (max_weight = 1).
         bittensor.logging.debug(
             f"setting on chain max: {max_weight} and weights: {weights}"
         )
 
-    weight_vals = []
-    weight_uids = []
-    for i, (weight_i, uid_i) in enumerate(list(zip(weights, uids))):
-        uint16_val = round(
-            float(weight_i) * int(U16_MAX)
-        )  # convert to int representation.
-
-        # Filter zeros
-        if uint16_val != 0:  # Filter zeros
-            weight_vals.append(uint16_val)
-            weight_uids.append(uid_i)
+    # Convert to int representation. np.rint rounds half to even, like Python's round().
+    uint16_vals = np.rint(weights * int(U16_MAX)).astype(np.int64)
+
+    # Filter zeros
+    keep = uint16_vals != 0
+    weight_vals = uint16_vals[keep].tolist()
+    weight_uids = uids[keep].tolist()
     bittensor.logging.debug(f"final params: {weight_uids} : {weight_vals}")
     return weight_uids, weight_vals
 
@@ -135,6 +186,8 @@ def process_weights_for_netuid(
     subtensor: "bittensor.subtensor",
     metagraph: "bittensor.metagraph" = None,
     exclude_quantile: int = 0,
+    min_allowed_weights: Optional[int] = None,
+    max_weight_limit: Optional[float] = None,
 ) -> Union[
     tuple[
         ndarray[Any, dtype[Any]],
@@ -150,10 +203,10 @@ def process_weights_for_netuid(
     tuple[Any, ndarray],
 ]:
     bittensor.logging.debug("process_weights_for_netuid()")
-    bittensor.logging.debug("weights", weights)
-    bittensor.logging.debug("netuid", netuid)
-    bittensor.logging.debug("subtensor", subtensor)
-    bittensor.logging.debug("metagraph", metagraph)
+    log.debug("weights: %s", weights)
+    log.debug("netuid: %s", netuid)
+    log.debug("subtensor: %s", subtensor)
+    log.debug("metagraph: %s", metagraph)
 
     # Get latest metagraph from chain if metagraph is None.
     if metagraph is None:
@@ -166,11 +219,14 @@ def process_weights_for_netuid(
     # Network configuration parameters from an subtensor.
     # These parameters determine the range of acceptable weights for each neuron.
     quantile = exclude_quantile / U16_MAX
-    min_allowed_weights = subtensor.min_allowed_weights(netuid=netuid)
-    max_weight_limit = subtensor.max_weight_limit(netuid=netuid)
-    bittensor.logging.debug("quantile", quantile)
-    bittensor.logging.debug("min_allowed_weights", min_allowed_weights)
-    bittensor.logging.debug("max_weight_limit", max_weight_limit)
+    # Callers holding a SubnetHyperparameterCache pass them in to avoid the chain round-trips.
+    if min_allowed_weights is None:
+        min_allowed_weights = subtensor.min_allowed_weights(netuid=netuid)
+    if max_weight_limit is None:
+        max_weight_limit = subtensor.max_weight_limit(netuid=netuid)
+    log.debug("quantile: %s", quantile)
+    log.debug("min_allowed_weights: %s", min_allowed_weights)
+    log.debug("max_weight_limit: %s", max_weight_limit)
 
     # Find all non zero weights.
     non_zero_weight_idx = np.argwhere(weights > 0).squeeze()
@@ -180,7 +236,7 @@ def process_weights_for_netuid(
     if non_zero_weights.size == 0 or metagraph.n < min_allowed_weights:
         bittensor.logging.warning("No non-zero weights returning all ones.")
         final_weights = np.ones(metagraph.n) / metagraph.n
-        bittensor.logging.debug("final_weights", final_weights)
+        log.debug("final_weights: %s", final_weights)
         return np.arange(len(final_weights)), final_weights
 
     elif non_zero_weights.size < min_allowed_weights:
@@ -191,13 +247,13 @@ def process_weights_for_netuid(
             np.ones(metagraph.n) * 1e-5
         )  # creating minimum even non-zero weights
         weights[non_zero_weight_idx] += non_zero_weights
-        bittensor.logging.debug("final_weights", weights)
+        log.debug("final_weights: %s", weights)
         normalized_weights = normalize_max_weight(
             x=weights, limit=max_weight_limit
         )
         return np.arange(len(normalized_weights)), normalized_weights
 
-    bittensor.logging.debug("non_zero_weights", non_zero_weights)
+    log.debug("non_zero_weights: %s", non_zero_weights)
 
     # Compute the exclude quantile and find the weights in the lowest quantile
     max_exclude = max(0, len(non_zero_weights) - min_allowed_weights) / len(
@@ -205,22 +261,22 @@ def process_weights_for_netuid(
     )
     exclude_quantile = min([quantile, max_exclude])
     lowest_quantile = np.quantile(non_zero_weights, exclude_quantile)
-    bittensor.logging.debug("max_exclude", max_exclude)
-    bittensor.logging.debug("exclude_quantile", exclude_quantile)
-    bittensor.logging.debug("lowest_quantile", lowest_quantile)
+    log.debug("max_exclude: %s", max_exclude)
+    log.debug("exclude_quantile: %s", exclude_quantile)
+    log.debug("lowest_quantile: %s", lowest_quantile)
 
     # Exclude all weights below the allowed quantile.
     non_zero_weight_uids = non_zero_weight_uids[
         lowest_quantile <= non_zero_weights
     ]
     non_zero_weights = non_zero_weights[lowest_quantile <= non_zero_weights]
-    bittensor.logging.debug("non_zero_weight_uids", non_zero_weight_uids)
-    bittensor.logging.debug("non_zero_weights", non_zero_weights)
+    log.debug("non_zero_weight_uids: %s", non_zero_weight_uids)
+    log.debug("non_zero_weights: %s", non_zero_weights)
 
     # Normalize weights and return.
     normalized_weights = normalize_max_weight(
         x=non_zero_weights, limit=max_weight_limit
     )
-    bittensor.logging.debug("final_weights", normalized_weights)
+    log.debug("final_weights: %s", normalized_weights)
 
     return non_zero_weight_uids, normalized_weights
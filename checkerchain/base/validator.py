@@ -18,7 +18,6 @@
 # DEALINGS IN THE SOFTWARE.
 
 
-import copy
 import numpy as np
 import asyncio
 import argparse
@@ -30,11 +29,22 @@ from traceback import print_exception
 
 from checkerchain.base.neuron import BaseNeuron
 from checkerchain.base.utils.weight_utils import (
+    compute_rank_weights,
     process_weights_for_netuid,
     convert_weights_and_uids_for_emit,
 )  # TODO: Replace when bittensor switches to numpy
+from checkerchain.base.utils.metagraph_snapshot import MetagraphSnapshot
+from checkerchain.base.utils.score_store import ScoreStore
+from checkerchain.base.utils.state_store import StateStore, decode_hotkeys, encode_hotkeys
+from checkerchain.base.utils.weight_setter import WeightSetter
 from checkerchain.mock import MockDendrite
-from checkerchain.utils.config import add_validator_args
+from checkerchain.utils import logging as log
+from checkerchain.utils.config import add_validator_args, IS_OWNER
+from checkerchain.utils.uids import EligibilityIndex
+from checkerchain.utils.stats_server import build_stats_uploader
+from checkerchain.validator.archive import build_prediction_archive
+from checkerchain.validator.health import HealthProber
+from checkerchain.validator.score_history import ScoreHistory
 
 
 class BaseValidatorNeuron(BaseNeuron):
@@ -53,7 +63,18 @@ class BaseValidatorNeuron(BaseNeuron):
         super().__init__(config=config)
 
         # Save a copy of the hotkeys to local memory.
-        self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
+        self.hotkeys = list(self.metagraph.hotkeys)
+        # Hotkeys and axon fingerprints per UID, diffed on every resync to find changed UIDs.
+        self.metagraph_snapshot = MetagraphSnapshot.from_metagraph(self.metagraph)
+        # Uids eligible for querying, read by every forward and rebuilt on resync.
+        self.eligibility_index = EligibilityIndex(self.config.neuron.vpermit_tao_limit)
+        self.eligibility_index.rebuild(self.metagraph)
+        # Up/down state of miner axons from periodic pings; forward skips miners that are down.
+        self.health_prober = None
+        if not self.config.neuron.health_probe_off:
+            self.health_prober = HealthProber(
+                self.metagraph.n, interval=self.config.neuron.health_probe_interval
+            )
 
         # Dendrite lets us send messages to other nodes (axons) in the network.
         if self.config.mock:
@@ -64,9 +85,46 @@ class BaseValidatorNeuron(BaseNeuron):
 
         # Set up initial scoring weights for validation
         bt.logging.info("Building validation weights.")
-        self.scores = np.zeros(self.metagraph.n, dtype=np.float32)
-        self.last_scores = np.zeros(self.metagraph.n, dtype=np.float32)
+        # Preallocated float32 scores updated in place; optionally a memory-mapped file that
+        # persists them without going through state.npz.
+        self.score_store = ScoreStore(
+            self.metagraph.n,
+            path=(
+                self.config.neuron.full_path + "/scores.npy"
+                if self.config.neuron.scores_mmap
+                else None
+            ),
+        )
         self.latest_miner_performance = {} # Initialize this attribute
+        # Decayed per-UID accuracy over past rounds; set_weights ranks miners from it.
+        self.score_history = ScoreHistory(
+            self.metagraph.n, half_life=self.config.neuron.score_history_half_life
+        )
+
+        # Scored rounds are archived before their rows are deleted from the live database.
+        self.prediction_archive = build_prediction_archive(self.config)
+
+        # Owner-only telemetry is uploaded from a background thread through a durable outbox.
+        self.stats_uploader = None
+        if IS_OWNER:
+            self.stats_uploader = build_stats_uploader(
+                self.config, coldkey=self.metagraph.coldkeys[0]
+            )
+
+        # Weights are submitted from a background thread with its own subtensor connection,
+        # since the websocket behind a subtensor must not be shared between threads.
+        self.weight_setter = WeightSetter(
+            subtensor=self.subtensor if self.config.mock else bt.subtensor(config=self.config),
+            wallet=self.wallet,
+            netuid=self.config.netuid,
+            uid=self.uid,
+            version_key=self.spec_version,
+            inclusion_timeout=self.config.neuron.weights_inclusion_timeout,
+        )
+        self.weight_setter.start()
+
+        # Atomic, versioned state.npz that is only rewritten when the state changed.
+        self.state_store = StateStore(self.config.neuron.full_path + "/state.npz")
 
         # Init sync with the network. Updates the metagraph.
         try:
@@ -105,6 +163,7 @@ class BaseValidatorNeuron(BaseNeuron):
         self.is_running: bool = False
         self.thread: Union[threading.Thread, None] = None
         self.lock = asyncio.Lock()
+        self.current_round = None
 
     def serve_axon(self):
         """Serve axon to enable external connections."""
@@ -130,8 +189,11 @@ class BaseValidatorNeuron(BaseNeuron):
             pass
 
     async def concurrent_forward(self):
+        # Each forward handles its own shard of the round's miners; shared state is guarded by self.lock.
+        num_forwards = max(1, self.config.neuron.num_concurrent_forwards)
         coroutines = [
-            self.forward() for _ in range(self.config.neuron.num_concurrent_forwards)
+            self.forward(shard=shard, num_shards=num_forwards)
+            for shard in range(num_forwards)
         ]
         await asyncio.gather(*coroutines)
 
@@ -160,6 +222,10 @@ class BaseValidatorNeuron(BaseNeuron):
 
         bt.logging.info(f"Validator starting at block: {self.block}")
 
+        # The prober runs on the validator's event loop, alongside the forwards.
+        if self.health_prober is not None:
+            self.loop.create_task(self.health_prober.run(self))
+
         # This loop maintains the validator's operations until intentionally stopped.
         try:
             while True:
@@ -180,6 +246,7 @@ class BaseValidatorNeuron(BaseNeuron):
         # If someone intentionally stops the validator, it'll safely terminate operations.
         except KeyboardInterrupt:
             self.axon.stop()
+            self.stop_background_workers()
             bt.logging.success("Validator killed by keyboard interrupt.")
             exit()
 
@@ -196,11 +263,20 @@ class BaseValidatorNeuron(BaseNeuron):
         if not self.is_running:
             bt.logging.debug("Starting validator in background thread.")
             self.should_exit = False
+            self.weight_setter.start()
+            if self.stats_uploader is not None:
+                self.stats_uploader.start()
             self.thread = threading.Thread(target=self.run, daemon=True)
             self.thread.start()
             self.is_running = True
             bt.logging.debug("Started")
 
+    def stop_background_workers(self):
+        """Stops the threads that outlive a single step, so no queued work runs after shutdown."""
+        self.weight_setter.stop()
+        if self.stats_uploader is not None:
+            self.stats_uploader.stop(flush=True)
+
     def stop_run_thread(self):
         """
         Stops the validator's operations that are running in the background thread.
@@ -211,6 +287,7 @@ class BaseValidatorNeuron(BaseNeuron):
             self.thread.join(5)
             self.is_running = False
             bt.logging.debug("Stopped")
+        self.stop_background_workers()
 
     def __enter__(self):
         self.run_in_background_thread()
@@ -235,99 +312,43 @@ class BaseValidatorNeuron(BaseNeuron):
             self.thread.join(5)
             self.is_running = False
             bt.logging.debug("Stopped")
+        self.stop_background_workers()
 
     def set_weights(self):
         """
         Sets the validator weights to the metagraph hotkeys based on the scores it has received from the miners. The weights determine the trust and incentive level the validator assigns to miner nodes on the network.
         """
-        # Initialize ranked_scores array.
-        ranked_scores = np.zeros(self.metagraph.n, dtype=np.float32)
         bt.logging.info("Starting set_weights operation.")
-
-        if not hasattr(self, 'latest_miner_performance') or not self.latest_miner_performance:
-            bt.logging.warning("No latest_miner_performance data available. Skipping rank-based weight setting. Setting all weights to zero.")
-            # ranked_scores is already initialized to zeros.
-        else:
-            bt.logging.info(f"Using latest_miner_performance (first 5 items): {dict(list(self.latest_miner_performance.items())[:5])}...")
-            bt.logging.debug(f"Full latest_miner_performance: {self.latest_miner_performance}")
-
-            # Rank miners based on accuracy_score.
-            # Sort by accuracy_score in descending order.
-            # self.latest_miner_performance is {uid: accuracy_score}
-            sorted_miners = sorted(self.latest_miner_performance.items(), key=lambda item: item[1], reverse=True)
-            
-            num_ranked_miners = len(sorted_miners)
-            bt.logging.info(f"Ranking {num_ranked_miners} miners based on performance.")
-            for rank, (uid, accuracy_score) in enumerate(sorted_miners):
-                if uid < self.metagraph.n: # Ensure UID is valid for the current metagraph
-                    # Assign weight based on rank: N - rank
-                    ranked_scores[uid] = num_ranked_miners - rank
-                else:
-                    bt.logging.warning(f"UID {uid} from latest_miner_performance is out of bounds for metagraph (size {self.metagraph.n}). Skipping.")
-            
-            initial_ranked_scores_summary = {uid: score for uid, score in enumerate(ranked_scores) if score > 0}
-            bt.logging.info(f"Initial ranked scores (before dividend check) summary: {initial_ranked_scores_summary}")
-            bt.logging.debug(f"Full initial ranked_scores before dividend check: {ranked_scores.tolist()}")
-
-        # Dividend Check: Iterate through all UIDs and zero out scores for those with dividends > 0.
-        # This must happen *after* initial rank-based weights are assigned.
-        uids_actively_zeroed_by_dividend = []
-        uids_already_zero_with_dividend = []
-
-        for uid_check in self.metagraph.uids:
-            # Ensure uid_check is within the bounds of ranked_scores and metagraph.dividends
-            if uid_check < len(ranked_scores) and uid_check < len(self.metagraph.dividends):
-                if self.metagraph.dividends[uid_check] > 0:
-                    current_score = ranked_scores[uid_check]
-                    if current_score > 0:
-                        bt.logging.info(f"UID {uid_check} (score: {current_score}) has non-zero dividends ({self.metagraph.dividends[uid_check]}). Actively setting its ranked_score to 0.")
-                        ranked_scores[uid_check] = 0
-                        uids_actively_zeroed_by_dividend.append(uid_check)
-                    else:
-                        # Score was already zero, but has dividend. Just log this fact.
-                        bt.logging.info(f"UID {uid_check} (score: {current_score}) has non-zero dividends ({self.metagraph.dividends[uid_check]}). Score was already 0.")
-                        uids_already_zero_with_dividend.append(uid_check)
-            else:
-                bt.logging.warning(f"UID {uid_check} is out of bounds for ranked_scores or metagraph.dividends during dividend check. Metagraph size: {self.metagraph.n}")
-
-        if uids_actively_zeroed_by_dividend:
-            bt.logging.info(f"UIDs actively zeroed out due to dividends: {uids_actively_zeroed_by_dividend}")
-        else:
-            bt.logging.info("No UIDs had their scores actively changed from non-zero to zero due to dividends this round.")
-        
-        if uids_already_zero_with_dividend:
-            bt.logging.info(f"UIDs that already had zero score but possess non-zero dividends: {uids_already_zero_with_dividend}")
-        
-        final_ranked_scores_summary = {uid: score for uid, score in enumerate(ranked_scores) if score > 0}
-        bt.logging.info(f"Ranked scores (after dividend check) summary: {final_ranked_scores_summary}")
-        bt.logging.debug(f"Full ranked_scores after dividend check: {ranked_scores.tolist()}")
-
-        # Check if ranked_scores contains any NaN values and log a warning if it does.
-        # This shouldn't happen with the current rank-based logic unless latest_miner_performance contained NaNs.
-        if np.isnan(ranked_scores).any():
-            bt.logging.warning(
-                f"Ranked scores contain NaN values. This may indicate an issue with accuracy_score data."
-            )
-            ranked_scores = np.nan_to_num(ranked_scores, nan=0.0) # Replace NaNs with 0
-
-        # Compute the norm of the ranked_scores
-        norm = np.linalg.norm(ranked_scores, ord=1, axis=0, keepdims=True)
-
-        # Check if the norm is zero or contains NaN values
-        if np.any(norm == 0) or np.isnan(norm).any():
-            bt.logging.warning("Norm of ranked_scores is zero or NaN. All miner scores might be zero or no miners participated/ranked.")
-            if np.any(norm == 0): # More specific check for zero norm
-                 raw_weights = np.zeros_like(ranked_scores, dtype=float)
-            else: # Handles NaN case by previous logic or could be more specific
-                 norm = np.ones_like(norm) # Fallback for NaN to prevent division error
-                 raw_weights = ranked_scores / norm
-        else:
-            raw_weights = ranked_scores / norm
-        
-        raw_weights_summary = {uid: weight for uid, weight in enumerate(raw_weights) if weight > 0}
-        bt.logging.info(f"Raw weights (before processing) summary: {raw_weights_summary}")
-        bt.logging.debug(f"Full raw_weights: {raw_weights.tolist()}")
-        bt.logging.debug(f"UIDs for raw_weights (metagraph.uids): {str(self.metagraph.uids.tolist())}")
+        n = int(self.metagraph.n)
+
+        # Rank on the decayed accuracy history rather than the last round alone,
+        # so a single lucky (or unlucky) round does not reshuffle every weight.
+        performance = np.zeros(n, dtype=np.float64)
+        observed = np.zeros(n, dtype=bool)
+        history_n = min(n, len(self.score_history))
+        performance[:history_n] = self.score_history.accuracy()[:history_n]
+        observed[:history_n] = self.score_history.observed()[:history_n]
+        dividends = np.zeros(n, dtype=np.float64)
+        dividends_n = min(n, len(self.metagraph.dividends))
+        dividends[:dividends_n] = self.metagraph.dividends[:dividends_n]
+
+        if not observed.any():
+            bt.logging.warning("No score history available. Setting all weights to zero.")
+        raw_weights = compute_rank_weights(performance, observed, dividends)
+
+        zeroed_by_dividend = np.flatnonzero(observed & (dividends > 0))
+        if zeroed_by_dividend.size:
+            log.info("UIDs zeroed out due to dividends: %s", log.Lazy(zeroed_by_dividend.tolist))
+        ranked = int(observed.sum())
+        log.info("Ranking %s miners based on performance.", ranked)
+
+        weighted_uids = np.flatnonzero(raw_weights)
+        log.info("Raw weights (before processing): %s non-zero", weighted_uids.size)
+        log.debug(
+            "Raw weights (before processing) summary: %s",
+            log.Lazy(lambda: dict(zip(weighted_uids.tolist(), raw_weights[weighted_uids].tolist()))),
+        )
+        log.debug("UIDs for raw_weights (metagraph.uids): %s", log.Lazy(self.metagraph.uids.tolist))
 
         # NEW CONDITIONAL BLOCK STARTS HERE
         if np.all(raw_weights == 0):
@@ -345,13 +366,15 @@ class BaseValidatorNeuron(BaseNeuron):
                 netuid=self.config.netuid,
                 subtensor=self.subtensor,
                 metagraph=self.metagraph,
+                min_allowed_weights=self.hyperparameters.min_allowed_weights,
+                max_weight_limit=self.hyperparameters.max_weight_limit,
             )
         # NEW CONDITIONAL BLOCK ENDS HERE
         
-        bt.logging.info(f"Processed weight UIDs (first 10): {processed_weight_uids.tolist()[:10]}...")
-        bt.logging.info(f"Processed weights (first 10): {processed_weights.tolist()[:10]}...")
-        bt.logging.debug(f"Full processed_weight_uids: {processed_weight_uids.tolist()}")
-        bt.logging.debug(f"Full processed_weights: {processed_weights.tolist()}")
+        log.info("Processed weight UIDs (first 10): %s...", log.Lazy(lambda: processed_weight_uids[:10].tolist()))
+        log.info("Processed weights (first 10): %s...", log.Lazy(lambda: processed_weights[:10].tolist()))
+        log.debug("Full processed_weight_uids: %s", log.Lazy(processed_weight_uids.tolist))
+        log.debug("Full processed_weights: %s", log.Lazy(processed_weights.tolist))
 
         # Convert to uint16 weights and uids.
         (
@@ -360,29 +383,23 @@ class BaseValidatorNeuron(BaseNeuron):
         ) = convert_weights_and_uids_for_emit(
             uids=processed_weight_uids, weights=processed_weights
         )
-        bt.logging.debug(f"uint_weights for emission: {uint_weights}")
-        bt.logging.debug(f"uint_uids for emission: {uint_uids}")
+        log.debug("uint_weights for emission: %s", uint_weights)
+        log.debug("uint_uids for emission: %s", uint_uids)
+        log.event(
+            "set_weights",
+            ranked=ranked,
+            zeroed_by_dividend=int(zeroed_by_dividend.size),
+            weights=len(uint_weights),
+        )
 
         # Check if there are any non-zero weights to set.
         # convert_weights_and_uids_for_emit returns empty lists if all weights were zero or below threshold.
         if not uint_weights:  # This implies uint_uids will also be empty
             bt.logging.info("No non-zero weights to set for this round. Skipping chain submission.")
         else:
-            # Set the weights on chain via our subtensor connection.
-            bt.logging.info(f"Attempting to set {len(uint_weights)} non-zero weights on chain.")
-            result, msg = self.subtensor.set_weights(
-                wallet=self.wallet,
-                netuid=self.config.netuid,
-                uids=uint_uids,
-                weights=uint_weights,
-                wait_for_finalization=False,
-                wait_for_inclusion=False,
-                version_key=self.spec_version,
-            )
-            if result is True:
-                bt.logging.info("set_weights on chain successfully!")
-            else:
-                bt.logging.error(f"set_weights failed: {msg}")
+            # The weight setter submits from its own thread, retrying until the weights are included.
+            bt.logging.info(f"Queueing {len(uint_weights)} non-zero weights for submission.")
+            self.weight_setter.submit(uint_uids, uint_weights)
         
         bt.logging.info("Finished set_weights operation.")
 
@@ -390,35 +407,57 @@ class BaseValidatorNeuron(BaseNeuron):
         """Resyncs the metagraph and updates the hotkeys and moving averages based on the new metagraph."""
         bt.logging.info("resync_metagraph()")
 
-        # Copies state of metagraph before syncing.
-        previous_metagraph = copy.deepcopy(self.metagraph)
-
         # Sync the metagraph.
         self.metagraph.sync(subtensor=self.subtensor)
-
-        # Check if the metagraph axon info has changed.
-        if previous_metagraph.axons == self.metagraph.axons:
+        self.hyperparameters.refresh(self.block)
+        # Stake and validator permits move on every sync, not only when hotkeys or axons change.
+        self.eligibility_index.rebuild(self.metagraph)
+
+        # Diff the per-UID hotkeys and axon fingerprints against the previous sync.
+        previous_snapshot = self.metagraph_snapshot
+        self.metagraph_snapshot = MetagraphSnapshot.from_metagraph(self.metagraph)
+        diff = previous_snapshot.diff(self.metagraph_snapshot)
+        if not diff.changed:
             return
 
         bt.logging.info(
-            "Metagraph updated, re-syncing hotkeys, dendrite pool and moving averages"
+            f"Metagraph updated ({diff.replaced.size} replaced, {diff.added.size} added, "
+            f"{diff.removed.size} removed, {diff.updated_axons.size} re-served), "
+            "re-syncing hotkeys, dendrite pool and moving averages"
         )
-        # Zero out all hotkeys that have been replaced.
-        for uid, hotkey in enumerate(self.hotkeys):
-            if hotkey != self.metagraph.hotkeys[uid]:
-                self.scores[uid] = 0  # hotkey has been replaced
+        # Zero out all hotkeys that have been replaced or have left the subnet.
+        stale = np.concatenate([diff.replaced, diff.removed])
+        self.score_store.reset(stale[stale < len(self.scores)])
+        self.score_history.reset(stale[stale < len(self.score_history)])
+        if self.health_prober is not None:
+            self.health_prober.reset(stale[stale < len(self.health_prober)])
+            self.health_prober.resize(self.metagraph.n)
 
         # Check to see if the metagraph has changed size.
         # If so, we need to add new hotkeys and moving averages.
-        if len(self.hotkeys) < len(self.metagraph.hotkeys):
+        if diff.added.size and len(self.scores) < self.metagraph.n:
             # Update the size of the moving average scores.
-            new_moving_average = np.zeros((self.metagraph.n))
-            min_len = min(len(self.hotkeys), len(self.scores))
-            new_moving_average[:min_len] = self.scores[:min_len]
-            self.scores = new_moving_average
+            self.score_store.resize(self.metagraph.n)
+            self.score_history.resize(self.metagraph.n)
 
         # Update the hotkeys.
-        self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
+        self.hotkeys = list(self.metagraph.hotkeys)
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self.score_store.scores
+
+    @scores.setter
+    def scores(self, scores: np.ndarray):
+        self.score_store.assign(scores)
+
+    @property
+    def last_scores(self) -> np.ndarray:
+        return self.score_store.last_scores
+
+    @last_scores.setter
+    def last_scores(self, last_scores: np.ndarray):
+        self.score_store.assign(last_scores=last_scores)
 
     def update_scores(self, rewards: np.ndarray, uids: List[int]):
         """Performs exponential moving average on the scores based on the rewards received from the miners."""
@@ -460,48 +499,68 @@ class BaseValidatorNeuron(BaseNeuron):
             )
 
             # Preserve previous scores and add zeros for new users
-            new_scores = np.zeros(new_size)
-            new_scores[:old_size] = self.scores
-            self.scores = new_scores
+            self.score_store.resize(new_size)
 
-        # Compute forward pass rewards, assumes uids are mutually exclusive.
-        # shape: [ metagraph.n ]
-        scattered_rewards: np.ndarray = np.zeros_like(self.scores)
-        scattered_rewards[uids_array] = rewards
-        bt.logging.debug(f"Scattered rewards: {rewards}")
-
-        # Update scores with rewards produced by this step.
+        # Update scores in place with rewards produced by this step, assumes uids are mutually
+        # exclusive. Also snapshots them as the last scores.
         # shape: [ metagraph.n ]
+        log.debug("Scattered rewards: %s", rewards)
         alpha: float = self.config.neuron.moving_average_alpha
-        self.scores: np.ndarray = alpha * scattered_rewards + (1 - alpha) * self.scores
-        self.last_scores = copy.deepcopy(self.scores)
-        bt.logging.debug(f"Updated moving avg scores: {self.scores}")
+        self.score_store.update(uids_array, rewards, alpha)
+        log.debug("Updated moving avg scores: %s", log.Lazy(lambda: self.scores))
 
     def update_to_last_scores(self):
         """Updates the last scores to the current scores."""
         bt.logging.info("Falling back to last scores.")
-        self.scores = copy.deepcopy(self.last_scores)
+        self.score_store.revert()
 
     def save_state(self):
         """Saves the state of the validator to a file."""
         bt.logging.info("Saving validator state.")
 
-        # Save the state of the validator to file.
-        np.savez(
-            self.config.neuron.full_path + "/state.npz",
-            step=self.step,
-            scores=self.scores,
-            hotkeys=self.hotkeys,
-            last_scores=self.last_scores,
+        # Save the state of the validator to file. Skipped if nothing but the step changed.
+        performance_uids = np.fromiter(self.latest_miner_performance.keys(), dtype=np.int64)
+        if self.score_store.persistent:
+            # The memory-mapped scores only need their dirty pages written back.
+            self.score_store.flush()
+            scores = {}
+        else:
+            scores = dict(scores=self.scores, last_scores=self.last_scores)
+        written = self.state_store.save(
+            dict(
+                step=np.asarray(self.step),
+                hotkeys=encode_hotkeys(self.hotkeys),
+                **scores,
+                performance_uids=performance_uids,
+                performance_values=np.fromiter(
+                    self.latest_miner_performance.values(), dtype=np.float64, count=len(performance_uids)
+                ),
+                **self.score_history.state_dict(),
+            )
         )
+        if not written:
+            bt.logging.debug("Validator state unchanged. Skipping write.")
 
     def load_state(self):
         """Loads the state of the validator from a file."""
         bt.logging.info("Loading validator state.")
 
         # Load the state of the validator from file.
-        state = np.load(self.config.neuron.full_path + "/state.npz")
-        self.step = state["step"]
-        self.scores = state["scores"]
-        self.hotkeys = state["hotkeys"]
-        self.last_scores = state["last_scores"]
+        state = self.state_store.load()
+        if state is None:
+            raise FileNotFoundError(self.state_store.path)
+        self.step = int(state["step"])
+        # Memory-mapped scores are already loaded, unless their file was just created.
+        if "scores" in state and (not self.score_store.persistent or self.score_store.created):
+            self.score_store.assign(state["scores"], state["last_scores"])
+        self.hotkeys = decode_hotkeys(state["hotkeys"])
+        # Diff the next resync against the hotkeys the saved scores belong to.
+        self.metagraph_snapshot = self.metagraph_snapshot.with_hotkeys(self.hotkeys)
+        # State files written before the score history existed don't carry it.
+        if "history_round" in state:
+            self.score_history.load_state_dict(state)
+        # Restoring the last round's performance avoids a zero-weight epoch after a restart.
+        if "performance_uids" in state:
+            self.latest_miner_performance = dict(
+                zip(state["performance_uids"].tolist(), state["performance_values"].tolist())
+            )
@@ -70,6 +70,31 @@ def add_prediction(session: Session, product_id, miner_id, prediction):
     session.commit()
 
 
+@with_db_session
+def add_predictions(session: Session, predictions: ty.Iterable[ty.Tuple[str, int, ty.Optional[float]]]):
+    """Upserts many (product_id, miner_id, prediction) rows in a single statement and transaction."""
+    rows = [
+        dict(
+            product_id=product_id,
+            miner_id=int(miner_id),
+            prediction=float(prediction) if prediction is not None else None,
+        )
+        for product_id, miner_id, prediction in predictions
+    ]
+    if not rows:
+        return
+    ups_stmt = sqlite_upsert(MinerPrediction)
+    query = ups_stmt.on_conflict_do_update(
+        index_elements=[
+            "product_id",
+            "miner_id",
+        ],
+        set_=dict(prediction=ups_stmt.excluded.prediction),
+    )
+    session.execute(query, rows)
+    session.commit()
+
+
 @with_db_session
 def remove_prediction(session: Session, prediction_id):
     session.execute(delete(MinerPrediction).where(MinerPrediction.id == prediction_id))
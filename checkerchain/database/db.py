@@ -1,13 +1,29 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import os
+from functools import lru_cache
 
 from .model import Base
 
-DATABASE_URL = "sqlite:///checker_db.db"
+DATABASE_URL = os.environ.get("CHECKERCHAIN_DATABASE_URL", "sqlite:///checker_db.db")
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+@lru_cache(maxsize=None)
+def get_engine():
+    """Creates the engine on first use, so importing the database package doesn't open anything."""
+    from sqlalchemy import create_engine
+
+    return create_engine(DATABASE_URL, echo=False, future=True)
+
+
+@lru_cache(maxsize=None)
+def _session_factory():
+    from sqlalchemy.orm import sessionmaker
+
+    return sessionmaker(bind=get_engine(), autoflush=False, autocommit=False)
+
+
+def SessionLocal():
+    return _session_factory()()
 
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
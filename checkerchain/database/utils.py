@@ -1,11 +1,15 @@
 from functools import wraps
+
+from checkerchain.utils.metrics import DB_DURATION
 from .db import SessionLocal
 
 
 def with_db_session(func):
+    duration = DB_DURATION.labels(operation=func.__name__)
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        with SessionLocal() as session:
+        with duration.time(), SessionLocal() as session:
             return func(session, *args, **kwargs)
 
     return wrapper
@@ -8,6 +8,7 @@ from checkerchain.miner.llm import (
     generate_review_score,
 )
 from checkerchain.utils.checker_chain import fetch_product_data
+from checkerchain.utils.metrics import record_cache
 import bittensor as bt
 
 miner_preds = {}
@@ -53,7 +54,9 @@ async def forward(self: Miner, synapse: checkerchain.protocol.CheckerChainSynaps
     predictions = [None] * len(synapse.query)  # Placeholder for responses
 
     for i, product_id in enumerate(synapse.query):
-        if product_id in miner_preds:
+        cached = product_id in miner_preds
+        record_cache("miner_predictions", hit=cached)
+        if cached:
             bt.logging.info(
                 f"Using cached prediction for {product_id}: {miner_preds[product_id]}"
             )
@@ -1,9 +1,8 @@
 # OpenAI API Key (ensure this is set in env variables or a secure place)
 from pydantic import BaseModel, Field
 from checkerchain.types.checker_chain import UnreviewedProduct
-from langchain_openai import ChatOpenAI
-from langchain.schema import SystemMessage, HumanMessage
 from checkerchain.utils.config import OPENAI_API_KEY
+from checkerchain.utils.metrics import LLM_LATENCY, LLM_TOKENS
 
 
 class ScoreBreakdown(BaseModel):
@@ -37,6 +36,9 @@ async def create_llm():
     """
     Create an instance of the LLM with structured output.
     """
+    # Imported here: LangChain and the OpenAI client take seconds to import and are only needed once a query arrives.
+    from langchain_openai import ChatOpenAI
+
     try:
         model = ChatOpenAI(
             api_key=OPENAI_API_KEY,
@@ -48,7 +50,8 @@ async def create_llm():
             presence_penalty=0.0,
             stop=["\n\n"],
         )
-        return model.with_structured_output(ReviewScoreSchema)
+        # include_raw keeps the raw message, whose usage metadata feeds the token metrics.
+        return model.with_structured_output(ReviewScoreSchema, include_raw=True)
     except Exception as e:
         raise Exception(f"Failed to create LLM: {str(e)}")
 
@@ -86,14 +89,22 @@ async def generate_review_score(product: UnreviewedProduct):
     Scores must be integers between 0 and 10.
     """
 
+    from langchain.schema import SystemMessage, HumanMessage
+
     try:
         llm = await create_llm()
-        result = await llm.ainvoke(
-            [
-                SystemMessage(content="You are an expert product reviewer."),
-                HumanMessage(content=prompt),
-            ]
-        )
-        return result
+        with LLM_LATENCY.time():
+            result = await llm.ainvoke(
+                [
+                    SystemMessage(content="You are an expert product reviewer."),
+                    HumanMessage(content=prompt),
+                ]
+            )
+        usage = getattr(result["raw"], "usage_metadata", None) or {}
+        LLM_TOKENS.labels(kind="input").inc(usage.get("input_tokens", 0))
+        LLM_TOKENS.labels(kind="output").inc(usage.get("output_tokens", 0))
+        if result["parsing_error"] is not None:
+            raise result["parsing_error"]
+        return result["parsed"]
     except Exception as e:
         raise Exception(f"Failed to generate review score: {str(e)}")
@@ -1,18 +1,22 @@
-import time
-
 import asyncio
-import random
+import numpy as np
 import bittensor as bt
 
-from typing import List
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+from bittensor.utils import networking
+
+from checkerchain.protocol import CheckerChainSynapse
 
 
 class MockSubtensor(bt.MockSubtensor):
     def __init__(self, netuid, n=16, wallet=None, network="mock"):
         super().__init__(network=network)
 
-        if not self.subnet_exists(netuid):
-            self.create_subnet(netuid)
+        # No-op if the subnet exists. `subnet_exists` queries the (mocked) substrate, not the chain state.
+        self.create_subnet(netuid)
 
         # Register ourself (the validator) as a neuron at uid=0
         if wallet is not None:
@@ -34,6 +38,33 @@ class MockSubtensor(bt.MockSubtensor):
                 stake=100000,
             )
 
+    def _uid_for_hotkey(self, netuid: int, hotkey: str) -> Optional[int]:
+        uids = self.chain_state["SubtensorModule"]["Uids"][netuid]
+        if hotkey not in uids:
+            return None
+        return self._get_most_recent_storage(uids[hotkey])
+
+    def get_hyperparameter(self, param_name, netuid, block=None):
+        """Answers `LastUpdate` from the mock chain state; other parameters go to bittensor's mock."""
+        if param_name != "LastUpdate":
+            return super().get_hyperparameter(param_name, netuid, block=block)
+        state = self.chain_state["SubtensorModule"]
+        n = self._get_most_recent_storage(state["SubnetworkN"][netuid], block) or 0
+        last_update = state["LastUpdate"][netuid]
+        return [
+            self._get_most_recent_storage(last_update.get(uid, {}), block) or 0
+            for uid in range(n)
+        ]
+
+    def set_weights(self, wallet, netuid, uids, weights, version_key=0, **kwargs):
+        """Includes the weights in the current block, which updates the sender's `LastUpdate`."""
+        uid = self._uid_for_hotkey(netuid, wallet.hotkey.ss58_address)
+        if uid is None:
+            return False, "Hotkey is not registered on the subnet"
+        block = self.get_current_block()
+        self.chain_state["SubtensorModule"]["LastUpdate"][netuid].setdefault(uid, {})[block] = block
+        return True, ""
+
 
 class MockMetagraph(bt.metagraph):
     def __init__(self, netuid=1, network="mock", subtensor=None):
@@ -51,13 +82,54 @@ class MockMetagraph(bt.metagraph):
         bt.logging.info(f"Axons: {self.axons}")
 
 
+@dataclass
+class MinerProfile:
+    """How a simulated miner answers: its latency distribution, failure rate and prediction noise."""
+
+    # Mean and standard deviation of the response time, in seconds.
+    latency: float = 0.5
+    jitter: float = 0.25
+    # Probability that a query fails with a 500.
+    error_rate: float = 0.0
+    # Standard deviation of the predictions around the true trust score.
+    noise: float = 10.0
+
+
 class MockDendrite(bt.dendrite):
     """
-    Replaces a real bittensor network request with a mock request that just returns some static response for all axons that are passed and adds some random delay.
+    Replaces a real bittensor network request with a simulated miner response.
+
+    Each axon is answered according to the MinerProfile of its hotkey (`default_profile` for the
+    others): after a latency drawn from the profile, scaled by `time_scale`, a CheckerChainSynapse
+    gets one prediction per queried product, drawn around `truth(product_id)` when a truth lookup is
+    given and uniformly otherwise. Slower responses than the timeout come back as 408s and failed
+    ones as 500s, both without a response. Other synapses (e.g. health pings) just get a status.
     """
 
-    def __init__(self, wallet):
-        super().__init__(wallet)
+    def __init__(
+        self,
+        wallet,
+        profiles: Optional[Dict[str, MinerProfile]] = None,
+        default_profile: Optional[MinerProfile] = None,
+        truth: Optional[Callable[[str], Optional[float]]] = None,
+        time_scale: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        # bt.dendrite.__init__ looks up the external IP over the network; the mock stays offline.
+        with patch.object(networking, "get_external_ip", return_value="127.0.0.1"):
+            super().__init__(wallet)
+
+        self.profiles = profiles or {}
+        self.default_profile = default_profile or MinerProfile()
+        self.truth = truth
+        self.time_scale = time_scale
+        self.rng = np.random.default_rng(seed)
+
+    def _predict(self, product_id: str, profile: MinerProfile) -> float:
+        actual = self.truth(product_id) if self.truth is not None else None
+        if actual is None:
+            return float(self.rng.uniform(0, 100))
+        return float(np.clip(self.rng.normal(actual, profile.noise), 0, 100))
 
     async def forward(
         self,
@@ -71,46 +143,39 @@ class MockDendrite(bt.dendrite):
         if streaming:
             raise NotImplementedError("Streaming not implemented yet.")
 
-        async def query_all_axons(streaming: bool):
-            """Queries all axons for responses."""
-
-            async def single_axon_response(i, axon):
-                """Queries a single axon for a response."""
-
-                start_time = time.time()
-                s = synapse.copy()
-                # Attach some more required data so it looks real
-                s = self.preprocess_synapse_for_request(axon, s, timeout)
-                # We just want to mock the response, so we'll just fill in some data
-                process_time = random.random()
-                if process_time < timeout:
-                    s.dendrite.process_time = str(time.time() - start_time)
-                    # Update the status code and status message of the dendrite to match the axon
-                    # TODO (developer): replace with your own expected synapse data
-                    s.dummy_output = s.dummy_input * 2
+        async def single_axon_response(axon):
+            """Simulates a single axon's response."""
+            s = synapse.model_copy()
+            # Attach some more required data so it looks real
+            s = self.preprocess_synapse_for_request(axon, s, timeout)
+            profile = self.profiles.get(axon.hotkey, self.default_profile)
+            process_time = max(0.0, self.rng.normal(profile.latency, profile.jitter))
+            failed = self.rng.random() < profile.error_rate
+
+            if process_time >= timeout:
+                await asyncio.sleep(timeout * self.time_scale)
+                s.dendrite.status_code = 408
+                s.dendrite.status_message = "Timeout"
+                s.dendrite.process_time = str(timeout)
+            else:
+                await asyncio.sleep(process_time * self.time_scale)
+                s.dendrite.process_time = str(process_time)
+                if failed:
+                    s.dendrite.status_code = 500
+                    s.dendrite.status_message = "Internal Server Error"
+                else:
+                    if isinstance(s, CheckerChainSynapse):
+                        s.response = [self._predict(product_id, profile) for product_id in s.query]
                     s.dendrite.status_code = 200
                     s.dendrite.status_message = "OK"
-                    synapse.dendrite.process_time = str(process_time)
-                else:
-                    s.dummy_output = 0
-                    s.dendrite.status_code = 408
-                    s.dendrite.status_message = "Timeout"
-                    synapse.dendrite.process_time = str(timeout)
-
-                # Return the updated synapse object after deserializing if requested
-                if deserialize:
-                    return s.deserialize()
-                else:
-                    return s
 
-            return await asyncio.gather(
-                *(
-                    single_axon_response(i, target_axon)
-                    for i, target_axon in enumerate(axons)
-                )
-            )
+            # Return the updated synapse object after deserializing if requested
+            if deserialize:
+                return s.deserialize()
+            else:
+                return s
 
-        return await query_all_axons(streaming)
+        return await asyncio.gather(*(single_axon_response(axon) for axon in axons))
 
     def __str__(self) -> str:
         """
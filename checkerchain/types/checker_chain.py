@@ -2,6 +2,14 @@ from typing import List
 from typing import Any
 from dataclasses import dataclass
 
+import bittensor as bt
+
+try:
+    # orjson decodes API pages several times faster than the standard library.
+    from orjson import loads
+except ImportError:
+    from json import loads
+
 
 @dataclass
 class Category:
@@ -328,6 +336,79 @@ class UnreviewedProductApiResponse:
         _data = UnreviewedProduct.from_dict(obj.get("data"))
         return UnreviewedProductApiResponse(_message, _data)
 
+
+class ProductSummary:
+    """
+    The fields of a product that the validator uses.
+
+    Parsing a page of products into summaries only reads these four fields of each product
+    document. The nested objects that from_dict builds for every product (category, operation,
+    creator, rewards, ...) are never materialized, and `__slots__` keeps each summary small.
+    """
+
+    __slots__ = ("_id", "name", "slug", "trustScore")
+
+    def __init__(self, _id: str, name: str, slug: str, trustScore: float):
+        self._id = _id
+        self.name = name
+        self.slug = slug
+        self.trustScore = trustScore
+
+    def __repr__(self) -> str:
+        return f"ProductSummary(_id={self._id!r}, name={self.name!r}, trustScore={self.trustScore!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ProductSummary):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    @staticmethod
+    def from_dict(obj: Any, require_trust_score: bool = False) -> 'ProductSummary':
+        """Raises ValueError, TypeError or AttributeError if `obj` is not a valid product document."""
+        product_id = obj.get("_id")
+        if not product_id:
+            raise ValueError("product has no _id")
+        trust_score = obj.get("trustScore")
+        if trust_score is None:
+            if require_trust_score:
+                raise ValueError(f"reviewed product {product_id} has no trustScore")
+            # Unreviewed products have no trust score yet.
+            trust_score = 0.0
+        return ProductSummary(
+            str(product_id), str(obj.get("name")), str(obj.get("slug")), float(trust_score)
+        )
+
+
+@dataclass
+class DecodedProducts:
+    products: List[ProductSummary]
+    # Number of product documents that were skipped because they were malformed.
+    errors: int = 0
+
+
+def parse_product_summaries(payload: bytes, require_trust_score: bool = False) -> DecodedProducts:
+    """
+    Decodes a products API page (raw response body) into product summaries.
+
+    Every product is validated on its own: a malformed one is skipped and counted instead of
+    failing the whole page. Raises ValueError only if the page itself is not a products page.
+    """
+    try:
+        documents = loads(payload)["data"]["products"]
+        iter(documents)
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Malformed products page: {e!r}") from e
+
+    decoded = DecodedProducts([])
+    for document in documents:
+        try:
+            decoded.products.append(ProductSummary.from_dict(document, require_trust_score))
+        except (ValueError, TypeError, AttributeError) as e:
+            decoded.errors += 1
+            bt.logging.warning(f"Skipping malformed product: {e}")
+    return decoded
+
+
 # Example Usage
 # jsonstring = json.loads(myjsonstring)
 # root = Root.from_dict(jsonstring)
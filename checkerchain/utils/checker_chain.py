@@ -1,33 +1,40 @@
+import os
 from dataclasses import dataclass
 from typing import List
 import requests
 import bittensor as bt
 
-from checkerchain.database.actions import add_product, get_products
 from checkerchain.types.checker_chain import (
-    ReviewedProduct,
-    ReviewedProductsApiResponse,
+    ProductSummary,
     UnreviewedProductApiResponse,
-    UnreviewedProductsApiResponse,
+    loads,
+    parse_product_summaries,
 )
+from checkerchain.utils.metrics import API_FETCH_DURATION, PRODUCT_DECODE_ERRORS
+
+# Overridable so that validators and miners can run against a local API, e.g. the simulator's.
+API_URL = os.environ.get("CHECKERCHAIN_API_URL", "https://api.checkerchain.com")
+BACKEND_URL = os.environ.get("CHECKERCHAIN_BACKEND_URL", "https://backend.checkerchain.com")
 
 
 @dataclass
 class FetchProductsReturnType:
     unmined_products: List[str]
-    reward_items: List[ReviewedProduct]
+    reward_items: List[ProductSummary]
+    # Malformed products that were skipped while decoding this round's pages.
+    decode_errors: int = 0
 
 
 def fetch_products():
     # Reviewed products
-    url_reviewed = "https://api.checkerchain.com/api/v1/products?page=1&limit=30"
+    url_reviewed = f"{API_URL}/api/v1/products?page=1&limit=30"
     # Unreviewed (published) products
-    url_unreviewed = (
-        "https://api.checkerchain.com/api/v1/products?page=1&limit=30&status=published"
-    )
+    url_unreviewed = f"{API_URL}/api/v1/products?page=1&limit=30&status=published"
 
-    response_reviewed = requests.get(url_reviewed)
-    response_unreviewed = requests.get(url_unreviewed)
+    with API_FETCH_DURATION.labels(endpoint="reviewed").time():
+        response_reviewed = requests.get(url_reviewed)
+    with API_FETCH_DURATION.labels(endpoint="published").time():
+        response_unreviewed = requests.get(url_unreviewed)
 
     if response_reviewed.status_code != 200:
         bt.logging.error(
@@ -36,29 +43,35 @@ def fetch_products():
         return FetchProductsReturnType([], [])
 
     if response_unreviewed.status_code != 200:
-        bt.logging.errorint(
+        bt.logging.error(
             f"Error fetching unreviewed products: {response_unreviewed.status_code}"
         )
         return FetchProductsReturnType([], [])
 
-    reviewed_response = ReviewedProductsApiResponse.from_dict(response_reviewed.json())
-    unreviewed_response = UnreviewedProductsApiResponse.from_dict(
-        response_unreviewed.json()
-    )
-
-    if not isinstance(reviewed_response, ReviewedProductsApiResponse) or not isinstance(
-        unreviewed_response, UnreviewedProductsApiResponse
-    ):
-        return FetchProductsReturnType([], [])
-
-    reviewed_products = reviewed_response.data.products
-    unreviewed_products = unreviewed_response.data.products
+    # The validator only needs the ids, names, slugs and trust scores of the products.
+    # Malformed products are skipped one by one rather than failing the round.
+    try:
+        reviewed = parse_product_summaries(response_reviewed.content, require_trust_score=True)
+        unreviewed = parse_product_summaries(response_unreviewed.content)
+    except ValueError as e:
+        bt.logging.error(f"Error decoding products: {e}")
+        PRODUCT_DECODE_ERRORS.inc()
+        return FetchProductsReturnType([], [], decode_errors=1)
+    reviewed_products = reviewed.products
+    unreviewed_products = unreviewed.products
+    decode_errors = reviewed.errors + unreviewed.errors
+    PRODUCT_DECODE_ERRORS.inc(decode_errors)
+    if decode_errors:
+        bt.logging.warning(f"Skipped {decode_errors} malformed products.")
+
+    # Fetch existing product IDs from the database.
+    # Imported here so that miners, which only call fetch_product_data, never load SQLAlchemy.
+    from checkerchain.database.actions import add_product, get_products
 
-    # Fetch existing product IDs from the database
     all_products = get_products()
     existing_product_ids = {p._id for p in all_products}
     unmined_products: List[str] = []
-    reward_items: List[ReviewedProduct] = []
+    reward_items: List[ProductSummary] = []
 
     # Process unreviewed products (newly published ones)
     for product in unreviewed_products:
@@ -71,20 +84,25 @@ def fetch_products():
         if product._id in existing_product_ids:
             reward_items.append(product)
 
-    return FetchProductsReturnType(unmined_products, reward_items)
+    return FetchProductsReturnType(unmined_products, reward_items, decode_errors)
 
 
 def fetch_product_data(product_id):
     """Fetch product data from the API using the product ID."""
-    url = f"https://backend.checkerchain.com/api/v1/products/{product_id}"
-    response = requests.get(url)
+    url = f"{BACKEND_URL}/api/v1/products/{product_id}"
+    with API_FETCH_DURATION.labels(endpoint="product").time():
+        response = requests.get(url)
     if response.status_code == 200:
-        productData = UnreviewedProductApiResponse.from_dict(response.json())
+        try:
+            productData = UnreviewedProductApiResponse.from_dict(loads(response.content))
+        except (ValueError, TypeError, AttributeError) as e:
+            bt.logging.error(f"Malformed product data for {product_id}: {e!r}")
+            return None
         if not (isinstance(productData, UnreviewedProductApiResponse)):
             return None
         return productData.data
     else:
         bt.logging.error(
-            "Error fetching product data:", response.status_code, response.text
+            f"Error fetching product data: {response.status_code} {response.text}"
         )
         return None
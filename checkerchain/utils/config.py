@@ -19,6 +19,7 @@
 import os
 import subprocess
 import argparse
+from functools import lru_cache
 import bittensor as bt
 from .logging import setup_events_logger
 import dotenv
@@ -33,7 +34,9 @@ STATS_SERVER_URL = os.getenv("STATS_SERVER_URL")
 JWT_SECRET = os.getenv("JWT_SECRET")
 
 
+@lru_cache(maxsize=None)
 def is_cuda_available():
+    """Probes for a CUDA toolchain by running nvidia-smi / nvcc. Memoized, so it runs at most once per process."""
     try:
         output = subprocess.check_output(["nvidia-smi", "-L"], stderr=subprocess.STDOUT)
         if "NVIDIA" in output.decode("utf-8"):
@@ -49,6 +52,13 @@ def is_cuda_available():
     return "cpu"
 
 
+def resolve_device(device: str) -> str:
+    """Resolves the "auto" device to "cuda" or "cpu"; any other value is returned unchanged."""
+    if device == "auto":
+        return is_cuda_available()
+    return device
+
+
 def check_config(cls, config: "bt.Config"):
     r"""Checks/validates the config namespace object."""
     full_path = os.path.expanduser(
@@ -82,8 +92,8 @@ def add_args(cls, parser):
     parser.add_argument(
         "--neuron.device",
         type=str,
-        help="Device to run on.",
-        default=is_cuda_available(),
+        help="Device to run on. 'auto' picks cuda or cpu the first time the device is needed.",
+        default="auto",
     )
 
     parser.add_argument(
@@ -93,6 +103,13 @@ def add_args(cls, parser):
         default=100,
     )
 
+    parser.add_argument(
+        "--neuron.hyperparameter_ttl",
+        type=int,
+        help="How many blocks cached subnet hyperparameters (min_allowed_weights, max_weight_limit) are reused before being refetched.",
+        default=360,
+    )
+
     parser.add_argument(
         "--mock",
         action="store_true",
@@ -100,6 +117,35 @@ def add_args(cls, parser):
         default=False,
     )
 
+    parser.add_argument(
+        "--neuron.metrics_port",
+        type=int,
+        help="If set, Prometheus metrics are served on http://127.0.0.1:<port>/metrics.",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--neuron.profile_every",
+        type=int,
+        help="If set, every Nth forward (on validators, every Nth round) is profiled into <full_path>/profiles.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--neuron.profiler",
+        type=str,
+        choices=["cprofile", "sampling"],
+        help="cprofile writes .prof dumps; sampling writes flamegraph-ready .folded stacks.",
+        default="cprofile",
+    )
+
+    parser.add_argument(
+        "--neuron.profile_memory",
+        action="store_true",
+        help="Also dump a tracemalloc snapshot of the allocations of every profiled forward.",
+        default=False,
+    )
+
     parser.add_argument(
         "--neuron.events_retention_size",
         type=str,
@@ -195,7 +241,7 @@ def add_validator_args(cls, parser):
     parser.add_argument(
         "--neuron.num_concurrent_forwards",
         type=int,
-        help="The number of concurrent forwards running at any time.",
+        help="The number of concurrent forwards running at any time. Eligible miners are split between them.",
         default=1,
     )
 
@@ -237,6 +283,69 @@ def add_validator_args(cls, parser):
         default=4096,
     )
 
+    parser.add_argument(
+        "--neuron.health_probe_interval",
+        type=float,
+        help="Seconds between health pings of the eligible miners. Miners that keep failing pings are not queried.",
+        default=120.0,
+    )
+
+    parser.add_argument(
+        "--neuron.health_probe_off",
+        action="store_true",
+        help="If set, miners are not health-probed and every eligible miner is queried.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.weights_inclusion_timeout",
+        type=int,
+        help="Blocks to wait for a weight submission to be included before submitting it again.",
+        default=20,
+    )
+
+    parser.add_argument(
+        "--neuron.score_history_half_life",
+        type=float,
+        help="Half-life, in scoring rounds, of the decayed accuracy history used to rank miners.",
+        default=12.0,
+    )
+
+    parser.add_argument(
+        "--neuron.scores_mmap",
+        action="store_true",
+        help="If set, scores are kept in a memory-mapped scores.npy instead of being saved to state.npz.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.archive_off",
+        action="store_true",
+        help="If set, scored predictions are not archived to predictions_archive/ before being deleted.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.stats_batch_size",
+        type=int,
+        help="Maximum number of records per stats server upload (owner only).",
+        default=500,
+    )
+
+    parser.add_argument(
+        "--neuron.stats_flush_interval",
+        type=float,
+        help="Maximum seconds a record waits in the stats outbox before being uploaded (owner only).",
+        default=30.0,
+    )
+
+    parser.add_argument(
+        "--neuron.stats_compression_off",
+        action="store_true",
+        help="If set, stats server uploads are sent without gzip compression (owner only).",
+        default=False,
+    )
+
     parser.add_argument(
         "--wandb.project_name",
         type=str,
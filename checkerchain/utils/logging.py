@@ -1,6 +1,10 @@
 import os
+import json
 import logging
 from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, Hashable
+
+import bittensor as bt
 
 EVENTS_LEVEL_NUM = 38
 DEFAULT_LOG_BACKUP_COUNT = 10
@@ -33,3 +37,75 @@ def setup_events_logger(full_path, events_retention_size):
     logger.addHandler(file_handler)
 
     return logger
+
+
+# Hot-path logging. Messages use %-style arguments that are only formatted (and wrapped `Lazy`
+# values only computed) if the level is enabled, so a debug dump of a full score array costs
+# nothing at INFO.
+
+
+class Lazy:
+    """Defers an expensive log argument, e.g. `Lazy(lambda: scores.tolist())`, until it is formatted."""
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+    def __str__(self) -> str:
+        return str(self.fn())
+
+
+def is_enabled_for(level: int) -> bool:
+    return bt.logging.get_level() <= level
+
+
+def debug(msg: str, *args):
+    if is_enabled_for(logging.DEBUG):
+        bt.logging.debug(msg % args if args else msg)
+
+
+def info(msg: str, *args):
+    if is_enabled_for(logging.INFO):
+        bt.logging.info(msg % args if args else msg)
+
+
+def warning(msg: str, *args):
+    if is_enabled_for(logging.WARNING):
+        bt.logging.warning(msg % args if args else msg)
+
+
+def _json_default(value: Any) -> Any:
+    # numpy arrays and scalars
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def event(name: str, **fields: Any):
+    """Writes a structured JSON event to events.log, if the events logger was set up."""
+    logger = logging.getLogger("event")
+    if not logger.handlers or not logger.isEnabledFor(EVENTS_LEVEL_NUM):
+        return
+    logger.log(EVENTS_LEVEL_NUM, json.dumps({"event": name, **fields}, default=_json_default))
+
+
+class LogSampler:
+    """
+    Rate-limits repetitive messages, such as one warning per miner per product.
+
+    `allow(key)` lets the first message of each key through and then one in every `every`; the
+    caller reports `count(key)` so the log still shows how often the message occurred.
+    """
+
+    def __init__(self, every: int = 100):
+        self.every = every
+        self._counts: Dict[Hashable, int] = {}
+
+    def allow(self, key: Hashable) -> bool:
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.every == 0
+
+    def count(self, key: Hashable) -> int:
+        return self._counts.get(key, 0)
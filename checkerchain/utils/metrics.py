@@ -0,0 +1,153 @@
+"""
+Prometheus metrics for miners and validators.
+
+The metrics live in their own registry and are served on `--neuron.metrics_port` (localhost only)
+when that flag is set. Without prometheus_client installed every metric is a no-op, so call sites
+never need to check whether metrics are enabled.
+"""
+
+from typing import Optional
+
+import bittensor as bt
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+# Buckets for network and LLM calls, which take from milliseconds to the 25 s query timeout.
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 60)
+# Buckets for local database operations.
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+# Buckets for whole validator rounds and their stages.
+ROUND_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class _NoopMetric:
+    """Stands in for a metric when prometheus_client is not installed."""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def observe(self, value: float):
+        pass
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+    def time(self) -> "_NoopMetric":
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+if prometheus_client is not None:
+    REGISTRY = prometheus_client.CollectorRegistry()
+
+    def _histogram(name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return prometheus_client.Histogram(
+            name, documentation, labelnames, registry=REGISTRY, buckets=buckets
+        )
+
+    def _counter(name, documentation, labelnames=()):
+        return prometheus_client.Counter(name, documentation, labelnames, registry=REGISTRY)
+
+    def _gauge(name, documentation, labelnames=()):
+        return prometheus_client.Gauge(name, documentation, labelnames, registry=REGISTRY)
+
+else:
+    REGISTRY = None
+
+    def _histogram(name, documentation, labelnames=(), buckets=None):
+        return _NoopMetric()
+
+    _counter = _gauge = _histogram
+
+
+ROUND_DURATION = _histogram(
+    "checkerchain_round_duration_seconds",
+    "Duration of a validator round, from fetching its products to updating the scores.",
+    buckets=ROUND_BUCKETS,
+)
+ROUND_STAGE_DURATION = _histogram(
+    "checkerchain_round_stage_duration_seconds",
+    "Duration of each stage of a validator round (per shard for query and score).",
+    ["stage"],
+    buckets=ROUND_BUCKETS,
+)
+DENDRITE_LATENCY = _histogram(
+    "checkerchain_dendrite_latency_seconds",
+    "Response time of miner queries, per miner UID.",
+    ["uid"],
+)
+DENDRITE_RESPONSES = _counter(
+    "checkerchain_dendrite_responses_total",
+    "Miner query responses by status code.",
+    ["status_code"],
+)
+DB_DURATION = _histogram(
+    "checkerchain_db_operation_duration_seconds",
+    "Duration of database operations.",
+    ["operation"],
+    buckets=DB_BUCKETS,
+)
+API_FETCH_DURATION = _histogram(
+    "checkerchain_api_fetch_duration_seconds",
+    "Duration of CheckerChain API requests.",
+    ["endpoint"],
+)
+PRODUCT_DECODE_ERRORS = _counter(
+    "checkerchain_product_decode_errors_total",
+    "Malformed products skipped while decoding CheckerChain API pages.",
+)
+LLM_LATENCY = _histogram(
+    "checkerchain_llm_latency_seconds",
+    "Duration of LLM review requests.",
+)
+LLM_TOKENS = _counter(
+    "checkerchain_llm_tokens_total",
+    "Tokens used by LLM review requests.",
+    ["kind"],
+)
+CACHE_REQUESTS = _counter(
+    "checkerchain_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+QUEUE_DEPTH = _gauge(
+    "checkerchain_queue_depth",
+    "Items waiting in a background queue.",
+    ["queue"],
+)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def start_metrics_server(port: Optional[int], addr: str = "127.0.0.1") -> bool:
+    """Serves /metrics on `addr:port`. Does nothing without a port. Returns True if the server started."""
+    if not port:
+        return False
+    if prometheus_client is None:
+        bt.logging.warning(
+            "prometheus_client is not installed; --neuron.metrics_port is ignored."
+        )
+        return False
+    try:
+        prometheus_client.start_http_server(port, addr=addr, registry=REGISTRY)
+    except OSError as e:
+        bt.logging.error(f"Could not serve metrics on {addr}:{port}: {e}")
+        return False
+    bt.logging.info(f"Serving metrics on http://{addr}:{port}/metrics")
+    return True
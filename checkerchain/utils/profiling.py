@@ -0,0 +1,206 @@
+"""
+Opt-in profiling of miner and validator forwards.
+
+With `--neuron.profile_every N`, every Nth forward of a neuron is profiled and the results are
+written to `<neuron.full_path>/profiles`:
+
+- `cprofile` (default): a `.prof` pstats dump, for `python -m pstats`, snakeviz or flameprof.
+- `sampling`: a `.folded` file of stack samples, one `frame;frame;... count` line per stack, which
+  flamegraph.pl and speedscope read directly. Its overhead does not grow with the number of calls.
+
+`--neuron.profile_memory` additionally traces allocations with tracemalloc during the profiled
+forward and dumps a `.tracemalloc` snapshot (`tracemalloc.Snapshot.load`). Forwards are coroutines
+sharing the event loop, so a profile also covers whatever else runs on the loop meanwhile, and only
+one profile is taken at a time. The validator's concurrent forwards pass the step as `key`: they
+count as one forward and share a single profile of the whole round. With profiling disabled,
+`profiled` costs a single None check.
+"""
+
+import cProfile
+import glob
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import nullcontext
+from typing import Dict, Hashable, Optional
+
+import bittensor as bt
+
+PROFILERS = ("cprofile", "sampling")
+# Stack depth recorded per allocation by tracemalloc.
+TRACEMALLOC_FRAMES = 25
+# Interval between stack samples of the sampling profiler, in seconds.
+SAMPLE_INTERVAL = 0.005
+
+
+class StackSampler:
+    """Samples the stack of one thread from a background thread and counts the folded stacks."""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class _Session:
+    """
+    Profiles one forward; created by `ForwardProfiler.profile`. Re-entrant: blocks sharing the
+    session's key enter it too, and it stops when the last of them exits.
+    """
+
+    def __init__(self, profiler: "ForwardProfiler", name: str, key: Hashable, stem: str):
+        self.profiler = profiler
+        self.name = name
+        self.key = key
+        self.stem = stem
+        self.depth = 0
+        self.cprofile: Optional[cProfile.Profile] = None
+        self.sampler: Optional[StackSampler] = None
+        self.traced = False
+
+    def __enter__(self):
+        self.depth += 1
+        if self.depth > 1:
+            return self
+        if self.profiler.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.traced = True
+        if self.profiler.kind == "sampling":
+            self.sampler = StackSampler(threading.get_ident())
+            self.sampler.start()
+        else:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.depth -= 1
+        if self.depth:
+            return False
+        duration = time.perf_counter() - self.started_at
+        written = []
+        try:
+            if self.cprofile is not None:
+                self.cprofile.disable()
+                self.cprofile.dump_stats(f"{self.stem}.prof")
+                written.append(f"{self.stem}.prof")
+            if self.sampler is not None:
+                self.sampler.stop()
+                self.sampler.write(f"{self.stem}.folded")
+                written.append(f"{self.stem}.folded")
+            if self.traced:
+                tracemalloc.take_snapshot().dump(f"{self.stem}.tracemalloc")
+                written.append(f"{self.stem}.tracemalloc")
+        except OSError as e:
+            bt.logging.error(f"Could not write profile {self.stem}: {e}")
+        finally:
+            if self.traced:
+                tracemalloc.stop()
+            self.profiler._finish(self.name)
+        bt.logging.info(f"Profiled forward in {duration:.3f}s: {', '.join(written)}")
+        return False
+
+
+class ForwardProfiler:
+    """
+    Profiles every `every`th call of `profile(name)` per name, keeping the files of the last
+    `keep` profiles per name.
+    """
+
+    def __init__(self, directory: str, every: int, kind: str = "cprofile", memory: bool = False, keep: int = 20):
+        if kind not in PROFILERS:
+            raise ValueError(f"Unknown profiler {kind!r}, expected one of {PROFILERS}")
+        self.directory = directory
+        self.every = max(1, int(every))
+        self.kind = kind
+        self.memory = memory
+        self.keep = keep
+        self.calls: Counter = Counter()
+        self._last_keys: Dict[str, Hashable] = {}
+        self.session: Optional[_Session] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def active(self) -> bool:
+        return self.session is not None
+
+    def profile(self, name: str, key: Optional[Hashable] = None):
+        """
+        Context manager that profiles the block if it is the `every`th call for `name`. Consecutive
+        calls with the same non-None `key` count once and join the same profile.
+        """
+        session = self.session
+        if key is not None and session is not None and (session.name, session.key) == (name, key):
+            return session
+        if key is not None and self._last_keys.get(name) == key:
+            return nullcontext()
+        self._last_keys[name] = key
+        self.calls[name] += 1
+        count = self.calls[name]
+        if count % self.every or session is not None:
+            return nullcontext()
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.session = _Session(self, name, key, os.path.join(self.directory, f"{name}-{stamp}-{count}"))
+        return self.session
+
+    def _finish(self, name: str):
+        self.session = None
+        stems = sorted(
+            {path.rsplit(".", 1)[0] for path in glob.glob(os.path.join(self.directory, f"{name}-*"))},
+            key=lambda s: min(os.path.getmtime(p) for p in glob.glob(f"{s}.*")),
+        )
+        for old in stems[: max(0, len(stems) - self.keep)]:
+            for path in glob.glob(f"{old}.*"):
+                os.remove(path)
+
+
+def build_profiler(config: "bt.Config") -> Optional[ForwardProfiler]:
+    """Returns the profiler configured by `--neuron.profile_*`, or None if profiling is off."""
+    every = config.neuron.profile_every
+    if not every:
+        return None
+    profiler = ForwardProfiler(
+        os.path.join(config.neuron.full_path, "profiles"),
+        every=every,
+        kind=config.neuron.profiler,
+        memory=config.neuron.profile_memory,
+    )
+    bt.logging.info(f"Profiling every {profiler.every} forwards into {profiler.directory}")
+    return profiler
+
+
+def profiled(profiler: Optional[ForwardProfiler], name: str, key: Optional[Hashable] = None):
+    """`profiler.profile(name, key)`, or a no-op context manager if profiling is off."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.profile(name, key)
@@ -1,4 +1,38 @@
-import random, requests
+"""
+Offline simulation of validator rounds.
+
+`MockCheckerChainAPI` serves the CheckerChain product endpoints from fixtures on a local port,
+`checkerchain.mock.MockDendrite` plays the miners, and `run_simulation` drives real validator
+forwards against both and reports where each round spent its time:
+
+    python -m checkerchain.utils.simulator --rounds 5 --miners 256 --products 10
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import bittensor as bt
+import numpy as np
+import requests
+
+from checkerchain.base.utils.score_store import ScoreStore
+from checkerchain.base.validator import BaseValidatorNeuron
+from checkerchain.utils import checker_chain
+from checkerchain.validator.score_history import ScoreHistory
 
 
 def simulate_mining(num):
@@ -10,7 +44,7 @@ def simulate_mining(num):
 
 
 def get_first_product():
-    url = "https://backend.checkerchain.com/api/v1/products?page=1&limit=30"
+    url = f"{checker_chain.BACKEND_URL}/api/v1/products?page=1&limit=30"
     response = requests.get(url)
 
     if response.status_code == 200:
@@ -25,3 +59,368 @@ def get_first_product():
             return "Invalid data structure."
     else:
         return f"Error: {response.status_code}"
+
+
+def make_product(index: int, trust_score: Optional[float] = None) -> dict:
+    """Builds a product document shaped like the CheckerChain API's. Reviewed if it has a trust score."""
+    product_id = f"{index:024x}"
+    product = {
+        "_id": product_id,
+        "id": product_id,
+        "name": f"Product {index}",
+        "slug": f"product-{index}",
+        "currentReviewCycle": 1,
+        "category": {"_id": "category", "name": "DeFi"},
+        "description": f"Simulated product {index}.",
+        "url": f"https://example.com/{index}",
+        "location": "",
+        "operation": {"availableAllTime": True, "_id": "operation", "days": []},
+        "specialReviewRequest": "",
+        "discountCode": "",
+        "offer": "",
+        "subcategories": [],
+        "gallery": [],
+        "teams": [],
+        "twitterProfile": "",
+        "isClaimed": False,
+        "isClaiming": False,
+        "network": "bittensor",
+        "createdBy": {
+            "_id": "creator",
+            "wallet": "",
+            "username": "simulator",
+            "profileScore": 0.0,
+            "bio": "",
+            "name": "Simulator",
+            "profilePicture": "",
+        },
+        "owners": [],
+        "status": "published",
+        "reviewDeadline": 0.0,
+        "rewards": [],
+        "createdAt": "",
+        "updatedAt": "",
+        "__v": 0,
+        "logo": "",
+        "coverImage": "",
+        "epoch": 0,
+        "reward": 0.0,
+        "subscribersCount": 0,
+        "isSubscribed": False,
+    }
+    if trust_score is not None:
+        product.update(
+            status="reviewed",
+            consensusScore=trust_score,
+            normalizedTrustScore=trust_score / 100,
+            trustScore=trust_score,
+            lastReviewed="",
+            ratingScore=trust_score / 20,
+            reviewCount=1,
+        )
+    return product
+
+
+class MockCheckerChainAPI:
+    """
+    Serves the CheckerChain product endpoints from in-memory fixtures on a local port.
+
+    `fixtures` holds "published" (not yet reviewed) and "reviewed" product documents, like the ones
+    `make_product` builds or a JSON dump of the real API. `publish` adds new products and `review`
+    gives every published product a trust score, which is how a simulated round turns the products
+    the miners predicted into the products their predictions are scored against.
+    """
+
+    def __init__(self, fixtures: Optional[Dict[str, List[dict]]] = None):
+        fixtures = fixtures or {}
+        self.published: List[dict] = list(fixtures.get("published", []))
+        self.reviewed: List[dict] = list(fixtures.get("reviewed", []))
+        self._next_index = len(self.published) + len(self.reviewed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @classmethod
+    def from_file(cls, path: str) -> "MockCheckerChainAPI":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def publish(self, count: int):
+        with self._lock:
+            for _ in range(count):
+                self.published.append(make_product(self._next_index))
+                self._next_index += 1
+
+    def review(self):
+        with self._lock:
+            reviewed = [
+                make_product(int(product["_id"], 16), self.trust_score(product["_id"]))
+                for product in self.published
+            ]
+            # Pages list the most recently reviewed products first, like the real API.
+            self.reviewed = reviewed + self.reviewed
+            self.published = []
+
+    def trust_score(self, product_id: str) -> Optional[float]:
+        """The trust score `product_id` gets when it is reviewed; what an ideal miner predicts."""
+        # Derived from the product id, so it is known before the product is reviewed.
+        return round(float(np.random.default_rng(int(product_id, 16)).uniform(0, 100)), 2)
+
+    def _products(self, status: Optional[str], page: int, limit: int) -> List[dict]:
+        with self._lock:
+            products = self.published if status == "published" else self.reviewed
+            return products[(page - 1) * limit : page * limit]
+
+    def _product(self, product_id: str) -> Optional[dict]:
+        with self._lock:
+            for product in self.published + self.reviewed:
+                if product["_id"] == product_id:
+                    return product
+        return None
+
+    def start(self) -> "MockCheckerChainAPI":
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                parts = url.path.rstrip("/").split("/")
+                if parts[:4] != ["", "api", "v1", "products"]:
+                    return self._send(404, {"message": "Not found"})
+                if len(parts) == 5:
+                    product = api._product(parts[4])
+                    if product is None:
+                        return self._send(404, {"message": "Product not found"})
+                    return self._send(200, {"message": "ok", "data": product})
+                products = api._products(
+                    params.get("status"), int(params.get("page", 1)), int(params.get("limit", 30))
+                )
+                self._send(200, {"message": "ok", "data": {"products": products}})
+
+            def _send(self, status: int, body: dict):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, name="mock-checkerchain-api", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@dataclass
+class RoundTimings:
+    """Seconds spent by one simulated round: in total, in database calls and in scoring."""
+
+    wall: float = 0.0
+    db: float = 0.0
+    scoring: float = 0.0
+
+
+@dataclass
+class SimulationReport:
+    rounds: List[RoundTimings] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        summary = {}
+        for name in ("wall", "db", "scoring"):
+            values = np.array([getattr(r, name) for r in self.rounds])
+            summary[name] = {
+                "mean": float(values.mean()) if values.size else 0.0,
+                "p50": float(np.median(values)) if values.size else 0.0,
+                "max": float(values.max()) if values.size else 0.0,
+            }
+        return summary
+
+    def __str__(self) -> str:
+        lines = [f"{'round':>5} {'wall (s)':>10} {'db (s)':>10} {'scoring (s)':>12}"]
+        for i, r in enumerate(self.rounds):
+            lines.append(f"{i:>5} {r.wall:>10.3f} {r.db:>10.3f} {r.scoring:>12.3f}")
+        for stat in ("mean", "p50", "max"):
+            s = {name: values[stat] for name, values in self.summary().items()}
+            lines.append(f"{stat:>5} {s['wall']:>10.3f} {s['db']:>10.3f} {s['scoring']:>12.3f}")
+        return "\n".join(lines)
+
+
+def _timed(fn, timings: RoundTimings, name: str):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            setattr(timings, name, getattr(timings, name) + time.perf_counter() - start)
+
+    return wrapper
+
+
+def _simulated_metagraph(miners: int) -> SimpleNamespace:
+    hotkeys = [f"miner-hotkey-{uid}" for uid in range(miners)]
+    coldkeys = [f"miner-coldkey-{uid}" for uid in range(miners)]
+    axons = [
+        bt.AxonInfo(version=0, ip="127.0.0.1", port=8091, ip_type=4, hotkey=hotkey, coldkey=coldkey)
+        for hotkey, coldkey in zip(hotkeys, coldkeys)
+    ]
+    return SimpleNamespace(n=miners, hotkeys=hotkeys, coldkeys=coldkeys, axons=axons)
+
+
+def _simulated_validator(metagraph, dendrite, alpha: float):
+    """The validator state that forward touches, without a wallet, chain or saved state."""
+    class SimulatedValidator:
+        # Borrowed from the validator, so that scores are updated by the production code.
+        scores = BaseValidatorNeuron.scores
+        last_scores = BaseValidatorNeuron.last_scores
+        update_scores = BaseValidatorNeuron.update_scores
+        update_to_last_scores = BaseValidatorNeuron.update_to_last_scores
+
+    validator = SimulatedValidator()
+    validator.config = SimpleNamespace(neuron=SimpleNamespace(moving_average_alpha=alpha))
+    validator.metagraph = metagraph
+    validator.dendrite = dendrite
+    validator.lock = asyncio.Lock()
+    validator.step = 0
+    validator.block = 0
+    validator.current_round = None
+    validator.eligibility_index = SimpleNamespace(uids=np.arange(metagraph.n), max_per_key=15)
+    validator.score_store = ScoreStore(metagraph.n)
+    validator.score_history = ScoreHistory(metagraph.n)
+    validator.latest_miner_performance = {}
+    validator.health_prober = None
+    validator.profiler = None
+    validator.prediction_archive = None
+    validator.stats_uploader = None
+    return validator
+
+
+def run_simulation(
+    rounds: int = 5,
+    miners: int = 64,
+    products: int = 10,
+    num_shards: int = 1,
+    profile=None,
+    time_scale: float = 1.0,
+    alpha: float = 0.1,
+    seed: Optional[int] = 0,
+    database_url: Optional[str] = None,
+) -> SimulationReport:
+    """
+    Runs `rounds` validator rounds against `miners` simulated miners, fully offline.
+
+    Every round publishes `products` new products (at most 30 are fetched per round, like the real
+    API pages) and reviews the ones published in the round before, so from the second round on the
+    validator both stores new predictions and scores the previous ones. Rounds run the validator's
+    real `forward` with `num_shards` concurrent shards, against a throwaway SQLite database unless
+    `database_url` is given. `profile` is the MinerProfile every miner answers with.
+    """
+    import checkerchain.database.actions as actions
+    from checkerchain.database import db
+    from checkerchain.mock import MockDendrite
+    from bittensor_wallet.mock import get_mock_wallet
+
+    # checkerchain.validator re-exports the forward function under the module's name.
+    forward_module = importlib.import_module("checkerchain.validator.forward")
+
+    report = SimulationReport()
+    with tempfile.TemporaryDirectory() as tmp, MockCheckerChainAPI() as api:
+        dendrite = MockDendrite(
+            get_mock_wallet(), default_profile=profile, truth=api.trust_score, time_scale=time_scale, seed=seed
+        )
+        validator = _simulated_validator(_simulated_metagraph(miners), dendrite, alpha)
+        timings = RoundTimings()
+
+        with mock.patch.multiple(checker_chain, API_URL=api.url, BACKEND_URL=api.url), mock.patch.object(
+            db, "DATABASE_URL", database_url or f"sqlite:///{os.path.join(tmp, 'simulator.db')}"
+        ), mock.patch.object(forward_module, "FORWARD_INTERVAL", 0), mock.patch.object(
+            forward_module, "score_miners", _timed(forward_module.score_miners, timings, "scoring")
+        ), mock.patch.multiple(
+            actions,
+            **{
+                name: _timed(getattr(actions, name), timings, "db")
+                for name in (
+                    "get_products",
+                    "add_product",
+                    "add_prediction",
+                    "add_predictions",
+                    "get_predictions_for_product",
+                    "delete_a_product",
+                    "db_get_unreviewd_products",
+                )
+            },
+        ):
+            db.get_engine.cache_clear()
+            db._session_factory.cache_clear()
+            try:
+                db.init_db()
+                validator.update_scores = _timed(validator.update_scores, timings, "scoring")
+
+                async def run_round():
+                    await asyncio.gather(
+                        *(forward_module.forward(validator, shard, num_shards) for shard in range(num_shards))
+                    )
+
+                for _ in range(rounds):
+                    api.review()
+                    api.publish(products)
+                    timings.wall = timings.db = timings.scoring = 0.0
+                    start = time.perf_counter()
+                    asyncio.run(run_round())
+                    timings.wall = time.perf_counter() - start
+                    report.rounds.append(RoundTimings(timings.wall, timings.db, timings.scoring))
+                    validator.step += 1
+                    # Every round runs on a fresh event loop.
+                    validator.lock = asyncio.Lock()
+            finally:
+                db.get_engine().dispose()
+                db.get_engine.cache_clear()
+                db._session_factory.cache_clear()
+    return report
+
+
+if __name__ == "__main__":
+    from checkerchain.mock import MinerProfile
+
+    parser = argparse.ArgumentParser(description="Benchmarks validator rounds against simulated miners.")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--miners", type=int, default=64)
+    parser.add_argument("--products", type=int, default=10)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.5, help="Mean miner latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.25, help="Standard deviation of the miner latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability that a miner query fails.")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiplier applied to simulated latencies.")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    print(
+        run_simulation(
+            rounds=args.rounds,
+            miners=args.miners,
+            products=args.products,
+            num_shards=args.shards,
+            profile=MinerProfile(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate),
+            time_scale=args.time_scale,
+            database_url=args.database_url,
+        )
+    )
@@ -0,0 +1,287 @@
+import gzip
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+import bittensor as bt
+import requests
+
+from checkerchain.utils.config import STATS_SERVER_URL, JWT_SECRET
+from checkerchain.utils.metrics import QUEUE_DEPTH
+
+PREDICTION_ENDPOINT = "/prediction/create"
+# Only these mean the server stored the batch; anything else (including redirects) is retried or dropped.
+SUCCESS_STATUSES = (200, 201, 202, 204)
+# Client errors that are transient rather than a rejection of the payload.
+RETRY_STATUSES = (401, 408, 429)
+
+
+class TokenManager:
+    """
+    Caches the HS256 token used to authenticate with the stats server.
+
+    A token is signed with an `exp` claim of `ttl` seconds and reused until it is within
+    `refresh_margin` seconds of expiring, instead of signing a new one for every request.
+    """
+
+    def __init__(self, subject: str, secret: str, ttl: float = 3600, refresh_margin: float = 300):
+        self.subject = subject
+        self.secret = secret
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+
+    def token(self) -> str:
+        now = time.time()
+        if self._token is None or now >= self._expires_at - self.refresh_margin:
+            import jwt
+
+            self._expires_at = now + self.ttl
+            self._token = jwt.encode(
+                {"sub": self.subject, "iat": int(now), "exp": int(self._expires_at)},
+                self.secret,
+                algorithm="HS256",
+            )
+        return self._token
+
+
+class OwnerTelemetryClient:
+    """
+    Authenticated HTTP client for the owner stats server.
+
+    Keeps one `requests.Session` (and its connection pool) for the lifetime of the neuron, with the
+    bearer token from `TokenManager` already set on it. Any owner telemetry (predictions, round
+    timings, score snapshots) can be sent through `post` by endpoint path.
+    """
+
+    def __init__(
+        self,
+        coldkey: str,
+        url: str = STATS_SERVER_URL,
+        jwt_secret: str = JWT_SECRET,
+        request_timeout: float = 10.0,
+    ):
+        self.url = url
+        self.request_timeout = request_timeout
+        self.tokens = TokenManager(subject=coldkey, secret=jwt_secret)
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        self._token: Optional[str] = None
+
+    def _authorize(self):
+        token = self.tokens.token()
+        if token != self._token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+            self._token = token
+
+    def post(self, endpoint: str, body: bytes, compress: bool = False) -> Optional[int]:
+        """
+        Posts an already JSON-encoded body.
+
+        Returns:
+            Optional[int]: The HTTP status code, or None if the request didn't complete.
+        """
+        self._authorize()
+        headers = {}
+        if compress:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        try:
+            result = self.session.post(
+                f"{self.url}{endpoint}",
+                data=body,
+                headers=headers,
+                timeout=self.request_timeout,
+                # A redirect must count as a failed upload, not be followed to some other page.
+                allow_redirects=False,
+            )
+            return result.status_code
+        except requests.RequestException as e:
+            bt.logging.warning(f"Error sending data to stats server: {e}")
+            return None
+
+    def close(self):
+        self.session.close()
+
+
+class StatsUploader:
+    """
+    Ships owner telemetry to the stats server from a background thread.
+
+    Records are appended to a SQLite outbox on disk by `enqueue`, which never touches the network,
+    so a slow or unreachable stats server can't add latency to a validator round. The worker thread
+    drains the outbox in batches (bounded by `batch_size` records or `flush_interval` seconds,
+    whichever comes first), gzips each batch and retries failed uploads with exponential backoff.
+    Records are only removed from the outbox once the server has accepted them, so they survive
+    restarts and outages.
+    """
+
+    def __init__(
+        self,
+        outbox_path: str,
+        client: OwnerTelemetryClient,
+        batch_size: int = 500,
+        flush_interval: float = 30.0,
+        compress: bool = True,
+        max_backoff: float = 600.0,
+    ):
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compress = compress
+        self.max_backoff = max_backoff
+
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(outbox_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "endpoint TEXT NOT NULL, "
+            "record TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures = 0
+
+    def enqueue(self, endpoint: str, records: List[dict]):
+        """Appends records to the outbox. Only touches local disk; the upload happens in the background."""
+        if not records:
+            return
+        now = time.time()
+        rows = [(endpoint, json.dumps(record), now) for record in records]
+        with self._db_lock:
+            self._conn.executemany(
+                "INSERT INTO outbox (endpoint, record, created_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+        if self.pending() >= self.batch_size:
+            self._wakeup.set()
+
+    def pending(self) -> int:
+        """Number of records waiting in the outbox."""
+        with self._db_lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="stats-uploader", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5, flush: bool = False):
+        """
+        Stops the upload thread. With `flush`, first uploads what is left in the outbox until a
+        batch fails; whatever remains is sent after the next start.
+        """
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        # Don't upload alongside a thread that is still stuck in a request.
+        if flush and (self._thread is None or not self._thread.is_alive()):
+            try:
+                while self.pending() and self.flush_once():
+                    pass
+            except Exception as e:
+                bt.logging.error(f"Stats uploader error while flushing: {e}")
+        self.client.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            delay = self.flush_interval
+            try:
+                if self._batch_ready():
+                    if self.flush_once():
+                        self._failures = 0
+                        # More may be waiting; keep draining without sleeping.
+                        delay = 0 if self.pending() else self.flush_interval
+                    else:
+                        self._failures += 1
+                        delay = self._backoff()
+            except Exception as e:
+                bt.logging.error(f"Stats uploader error: {e}")
+                self._failures += 1
+                delay = self._backoff()
+            try:
+                QUEUE_DEPTH.labels(queue="stats_outbox").set(self.pending())
+            except sqlite3.Error:
+                pass
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+
+    def _backoff(self) -> float:
+        delay = min(self.max_backoff, 2 ** min(self._failures, 16))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _batch_ready(self) -> bool:
+        with self._db_lock:
+            count, oldest = self._conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM outbox"
+            ).fetchone()
+        if not count:
+            return False
+        return count >= self.batch_size or time.time() - oldest >= self.flush_interval
+
+    def flush_once(self) -> bool:
+        """
+        Uploads the oldest batch of a single endpoint.
+
+        Returns:
+            bool: False if the upload failed and should be retried later.
+        """
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT endpoint FROM outbox ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return True
+            endpoint = row[0]
+            rows = self._conn.execute(
+                "SELECT id, record FROM outbox WHERE endpoint = ? ORDER BY id LIMIT ?",
+                (endpoint, self.batch_size),
+            ).fetchall()
+
+        ids = [r[0] for r in rows]
+        body = ("[" + ",".join(r[1] for r in rows) + "]").encode("utf-8")
+        status = self.client.post(endpoint, body, compress=self.compress)
+
+        if status in SUCCESS_STATUSES:
+            bt.logging.info(f"Successfully sent {len(ids)} records to stats server")
+        elif status is not None and 400 <= status < 500 and status not in RETRY_STATUSES:
+            # The server rejected the payload itself; retrying it would block the outbox forever.
+            bt.logging.error(
+                f"Stats server rejected {len(ids)} records for {endpoint} ({status}). Dropping batch."
+            )
+        else:
+            bt.logging.warning(
+                f"Stats server upload of {len(ids)} records to {endpoint} failed ({status}), will retry."
+            )
+            return False
+
+        with self._db_lock:
+            self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+        return True
+
+
+def build_stats_uploader(config: "bt.Config", coldkey: str) -> StatsUploader:
+    """Creates and starts the owner stats uploader with its outbox in the neuron's directory."""
+    uploader = StatsUploader(
+        outbox_path=os.path.join(config.neuron.full_path, "stats_outbox.db"),
+        client=OwnerTelemetryClient(coldkey=coldkey),
+        batch_size=config.neuron.stats_batch_size,
+        flush_interval=config.neuron.stats_flush_interval,
+        compress=not config.neuron.stats_compression_off,
+    )
+    uploader.start()
+    return uploader
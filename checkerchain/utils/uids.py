@@ -1,8 +1,6 @@
-import random
 import bittensor as bt
 import numpy as np
-from typing import List
-import copy
+from typing import List, Optional
 
 
 def check_uid_availability(
@@ -27,55 +25,181 @@ def check_uid_availability(
     return True
 
 
-def get_random_uids(self, k: int, exclude: List[int] = None) -> np.ndarray:
+def available_uid_mask(
+    metagraph: "bt.metagraph.Metagraph", vpermit_tao_limit: int
+) -> np.ndarray:
+    """Vectorized check_uid_availability over every uid.
+    Args:
+        metagraph (:obj: bt.metagraph.Metagraph): Metagraph object
+        vpermit_tao_limit (int): Validator permit tao limit
+    Returns:
+        mask (np.ndarray): Boolean mask over uids, True for available uids.
+    """
+    n = len(metagraph.axons)
+    is_serving = np.fromiter(
+        (axon.is_serving for axon in metagraph.axons), dtype=bool, count=n
+    )
+    validator_permit = np.asarray(metagraph.validator_permit, dtype=bool)
+    stake = np.asarray(metagraph.S, dtype=np.float64)
+    return is_serving & ~(validator_permit & (stake > vpermit_tao_limit))
+
+
+def _choice(
+    rng: np.random.Generator,
+    pool: np.ndarray,
+    size: int,
+    weights: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Draws `size` distinct elements of `pool`, proportionally to `weights` if given."""
+    if size <= 0:
+        return pool[:0]
+    if weights is None:
+        return rng.choice(pool, size=size, replace=False)
+    weights = np.nan_to_num(np.clip(weights, 0, None), nan=0.0, posinf=0.0)
+    positive = weights > 0
+    n_positive = int(positive.sum())
+    if n_positive >= size:
+        return rng.choice(pool, size=size, replace=False, p=weights / weights.sum())
+    # Not enough weighted candidates: take all of them and fill up uniformly from the rest.
+    return np.concatenate(
+        [pool[positive], rng.choice(pool[~positive], size=size - n_positive, replace=False)]
+    )
+
+
+def sample_uids(
+    available: np.ndarray,
+    k: int,
+    exclude: Optional[np.ndarray] = None,
+    weights: Optional[np.ndarray] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Samples k distinct available uids, preferring uids that are not excluded.
+    Args:
+        available (np.ndarray): Boolean mask over uids, True for available uids.
+        k (int): Number of uids to return. Capped at the number of available uids.
+        exclude (np.ndarray): Optional boolean mask over uids to avoid. Excluded uids are only drawn
+            when there are fewer than k other available uids.
+        weights (np.ndarray): Optional non-negative sampling weight per uid (e.g. `stake_weights` or
+            `latency_weights`). Uniform if None.
+        rng (np.random.Generator): Random generator to draw from.
+    Returns:
+        uids (np.ndarray): Sampled uids.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    available = np.asarray(available, dtype=bool)
+    excluded = (
+        np.zeros_like(available) if exclude is None else np.asarray(exclude, dtype=bool)
+    )
+    candidates = np.flatnonzero(available & ~excluded)
+    k = min(k, int(available.sum()))
+
+    def pool_weights(pool):
+        return None if weights is None else np.asarray(weights, dtype=np.float64)[pool]
+
+    if candidates.size >= k:
+        return _choice(rng, candidates, k, pool_weights(candidates))
+    # Not enough candidates: take them all and top up from the excluded available uids.
+    fallback = np.flatnonzero(available & excluded)
+    uids = np.concatenate(
+        [candidates, _choice(rng, fallback, k - candidates.size, pool_weights(fallback))]
+    )
+    return rng.permutation(uids)
+
+
+def stake_weights(metagraph: "bt.metagraph.Metagraph") -> np.ndarray:
+    """Sampling weights proportional to each uid's stake."""
+    return np.asarray(metagraph.S, dtype=np.float64)
+
+
+def latency_weights(latencies: np.ndarray) -> np.ndarray:
+    """Sampling weights inversely proportional to each uid's latency; unknown (NaN) latencies get 0."""
+    latencies = np.asarray(latencies, dtype=np.float64)
+    return np.divide(
+        1.0,
+        latencies,
+        out=np.zeros_like(latencies),
+        where=np.isfinite(latencies) & (latencies > 0),
+    )
+
+
+def get_random_uids(
+    self, k: int, exclude: List[int] = None, weights: Optional[np.ndarray] = None
+) -> np.ndarray:
     """Returns k available random uids from the metagraph.
     Args:
         k (int): Number of uids to return.
         exclude (List[int]): List of uids to exclude from the random sampling.
+        weights (np.ndarray): Optional sampling weight per uid, e.g. `stake_weights(self.metagraph)`.
     Returns:
         uids (np.ndarray): Randomly sampled available uids.
     Notes:
         If `k` is larger than the number of available `uids`, set `k` to the number of available `uids`.
     """
-    candidate_uids = []
-    avail_uids = []
+    available = available_uid_mask(self.metagraph, self.config.neuron.vpermit_tao_limit)
+    exclude_mask = None
+    if exclude is not None:
+        exclude_mask = np.zeros_like(available)
+        exclude = np.asarray(exclude, dtype=np.int64)
+        exclude_mask[exclude[exclude < available.size]] = True
+    return sample_uids(available, k, exclude=exclude_mask, weights=weights)
 
-    for uid in range(self.metagraph.n.item()):
-        uid_is_available = check_uid_availability(
-            self.metagraph, uid, self.config.neuron.vpermit_tao_limit
-        )
-        uid_is_not_excluded = exclude is None or uid not in exclude
-
-        if uid_is_available:
-            avail_uids.append(uid)
-            if uid_is_not_excluded:
-                candidate_uids.append(uid)
-    # If k is larger than the number of available uids, set k to the number of available uids.
-    k = min(k, len(avail_uids))
-    # Check if candidate_uids contain enough for querying, if not grab all avaliable uids
-    available_uids = candidate_uids
-    if len(candidate_uids) < k:
-        available_uids += random.sample(
-            [uid for uid in avail_uids if uid not in candidate_uids],
-            k - len(candidate_uids),
-        )
-    uids = np.array(random.sample(available_uids, k))
-    return uids
+
+def eligible_uid_mask(
+    metagraph: "bt.metagraph.Metagraph", vpermit_tao_limit: int, max_per_key: int = 15
+) -> np.ndarray:
+    """Vectorized check_uid_availability over every uid, with at most `max_per_key` uids per coldkey.
+    Args:
+        metagraph (:obj: bt.metagraph.Metagraph): Metagraph object
+        vpermit_tao_limit (int): Validator permit tao limit
+        max_per_key (int): Only the first `max_per_key` uids of a coldkey (in uid order, available or not) are eligible.
+    Returns:
+        mask (np.ndarray): Boolean mask over uids, True for eligible uids.
+    """
+    n = len(metagraph.coldkeys)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    available = available_uid_mask(metagraph, vpermit_tao_limit)
+
+    # Position of every uid among the uids of its coldkey, in uid order (a grouped cumcount).
+    _, group = np.unique(np.asarray(metagraph.coldkeys), return_inverse=True)
+    order = np.argsort(group, kind="stable")
+    sorted_group = group[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_group[1:] != sorted_group[:-1]])
+    position = np.empty(n, dtype=np.int64)
+    position[order] = np.arange(n) - np.repeat(group_start, np.diff(np.r_[group_start, n]))
+
+    return available & (position < max_per_key)
+
+
+class EligibilityIndex:
+    """
+    Cached array of the uids a validator may query.
+
+    Rebuilt from the metagraph with `eligible_uid_mask` whenever the metagraph is synced, so
+    forwards read a ready NumPy array instead of re-checking every uid.
+    """
+
+    def __init__(self, vpermit_tao_limit: int, max_per_key: int = 15):
+        self.vpermit_tao_limit = vpermit_tao_limit
+        self.max_per_key = max_per_key
+        self.uids = np.zeros(0, dtype=np.int64)
+
+    def rebuild(self, metagraph: "bt.metagraph.Metagraph") -> np.ndarray:
+        mask = eligible_uid_mask(metagraph, self.vpermit_tao_limit, self.max_per_key)
+        self.uids = np.flatnonzero(mask)
+        bt.logging.debug(f"Eligible uids rebuilt: {self.uids.size} of {mask.size}")
+        return self.uids
 
 
 def get_filtered_uids(self, max_per_key: int = 15) -> np.ndarray:
-    coldkeys = copy.deepcopy(self.metagraph.coldkeys)
-    counts = {}
-    available_uids = []
-
-    for i, ck in enumerate(coldkeys):
-        cnt = counts.get(ck, 0)
-        if cnt < max_per_key:
-            if check_uid_availability(
-                self.metagraph, i, self.config.neuron.vpermit_tao_limit
-            ):
-                available_uids.append(i)
-            counts[ck] = cnt + 1
-
-    uids = np.array(available_uids)
-    return uids
+    """Returns the available uids, at most `max_per_key` per coldkey.
+    Reads the validator's cached EligibilityIndex when it has one for the same cap.
+    """
+    index = getattr(self, "eligibility_index", None)
+    if index is not None and index.max_per_key == max_per_key:
+        return index.uids
+    return np.flatnonzero(
+        eligible_uid_mask(
+            self.metagraph, self.config.neuron.vpermit_tao_limit, max_per_key
+        )
+    )
@@ -0,0 +1,129 @@
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+import bittensor as bt
+
+from checkerchain.validator.prediction_log import PredictionLogBuffer
+
+if TYPE_CHECKING:
+    import pyarrow
+
+
+class PredictionArchive:
+    """
+    Append-only archive of scored rounds for offline analysis.
+
+    Each scored round is written as one Arrow IPC file under `root/date=YYYY-MM-DD/`, before the
+    round's products and predictions are deleted from the live SQLite tables. Arrow IPC files can be
+    memory-mapped, so per-miner history scans read only the pages they touch instead of
+    decoding whole files. Requires `pyarrow`.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def append(self, prediction_log: PredictionLogBuffer, block: int) -> Optional[str]:
+        """Writes a round's scored predictions and returns the file path, or None if it was empty."""
+        if not len(prediction_log):
+            return None
+        import pyarrow as pa
+
+        table = prediction_log.to_arrow()
+        scored_at = time.time()
+        table = table.append_column("block", pa.array([int(block)] * table.num_rows, type=pa.int64()))
+        table = table.append_column("scored_at", pa.array([scored_at] * table.num_rows, type=pa.float64()))
+
+        day = datetime.fromtimestamp(scored_at, tz=timezone.utc).strftime("%Y-%m-%d")
+        partition = os.path.join(self.root, f"date={day}")
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, f"block-{int(block)}-{uuid.uuid4().hex[:8]}.arrow")
+
+        # Write then rename so readers never see a partially written file.
+        tmp_path = path + ".tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return path
+
+    def files(self, since: Optional[str] = None) -> List[str]:
+        """Lists archive files in chronological partition order, optionally from day `since` (YYYY-MM-DD)."""
+        paths = []
+        for partition in sorted(os.listdir(self.root)):
+            if not partition.startswith("date="):
+                continue
+            if since is not None and partition[len("date="):] < since:
+                continue
+            directory = os.path.join(self.root, partition)
+            paths.extend(
+                os.path.join(directory, name)
+                for name in sorted(os.listdir(directory))
+                if name.endswith(".arrow")
+            )
+        return paths
+
+    def _tables(self, since: Optional[str] = None) -> Iterator["pyarrow.Table"]:
+        import pyarrow as pa
+
+        for path in self.files(since):
+            with pa.memory_map(path, "r") as source:
+                yield pa.ipc.open_file(source).read_all()
+
+    def miner_history(
+        self,
+        uid: Optional[int] = None,
+        hotkey: Optional[str] = None,
+        since: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Optional["pyarrow.Table"]:
+        """
+        Returns every archived prediction of one miner, selected by UID and/or hotkey.
+
+        Args:
+            uid (int, optional): Miner UID to select.
+            hotkey (str, optional): Miner hotkey to select; use it to follow a miner across UID reuse.
+            since (str, optional): First day (YYYY-MM-DD) to scan.
+            columns (List[str], optional): Columns to return. Defaults to all.
+
+        Returns:
+            pyarrow.Table: The matching rows, or None if nothing matched.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        selected = []
+        for table in self._tables(since):
+            mask = None
+            if uid is not None:
+                mask = pc.equal(table.column("uid"), uid)
+            if hotkey is not None:
+                hotkey_mask = pc.equal(table.column("hotkey").cast(pa.string()), hotkey)
+                mask = hotkey_mask if mask is None else pc.and_(mask, hotkey_mask)
+            if mask is not None:
+                table = table.filter(mask)
+            if columns is not None:
+                table = table.select(columns)
+            if table.num_rows:
+                selected.append(table.combine_chunks().unify_dictionaries())
+        if not selected:
+            return None
+        return pa.concat_tables(selected, promote_options="default")
+
+
+def build_prediction_archive(config: "bt.Config") -> Optional[PredictionArchive]:
+    """Returns the validator's prediction archive, or None if it is disabled or pyarrow is missing."""
+    if config.neuron.archive_off:
+        return None
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        bt.logging.warning(
+            "pyarrow is not installed; scored predictions will not be archived. "
+            "Install pyarrow or pass --neuron.archive_off to silence this warning."
+        )
+        return None
+    return PredictionArchive(os.path.join(config.neuron.full_path, "predictions_archive"))
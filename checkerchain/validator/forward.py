@@ -17,209 +17,343 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
+import asyncio
 import time
 import bittensor as bt
 import numpy as np
 import traceback
+from typing import TYPE_CHECKING
 
 from checkerchain.protocol import CheckerChainSynapse
 
-from checkerchain.database.actions import (
-    add_prediction,
-    get_predictions_for_product,
-    delete_a_product,
-    db_get_unreviewd_products,
-)
 from checkerchain.validator.reward import get_rewards
-from neurons.validator import Validator
+from checkerchain.validator.prediction_log import PredictionLogBuffer
+from checkerchain.validator.round import ValidatorRound
 from checkerchain.utils.checker_chain import fetch_products
-from checkerchain.utils.config import IS_OWNER, STATS_SERVER_URL, JWT_SECRET
-import requests
+from checkerchain.utils import logging as log
+from checkerchain.utils.config import IS_OWNER
+from checkerchain.utils.metrics import DENDRITE_LATENCY, DENDRITE_RESPONSES, ROUND_DURATION, ROUND_STAGE_DURATION
+from checkerchain.utils.profiling import profiled
+from checkerchain.utils.stats_server import PREDICTION_ENDPOINT
 from checkerchain.utils.uids import get_filtered_uids
 
+if TYPE_CHECKING:
+    # neurons.validator imports checkerchain, which imports this module.
+    from neurons.validator import Validator
 
-async def forward(self: Validator):
+# 25 mins until next validation
+FORWARD_INTERVAL = 25 * 60
+
+# One "prediction score is None" warning per miner every this many occurrences.
+_missing_prediction_log = log.LogSampler(every=100)
+
+
+async def forward(self: "Validator", shard: int = 0, num_shards: int = 1):
     """
     The forward function is called by the validator every time step.
 
-    It is responsible for querying the network and scoring the responses.
+    It is responsible for querying the network and scoring the responses. When the validator runs
+    several concurrent forwards, each one handles a disjoint shard of the eligible miner UIDs; the
+    last one to finish merges the results and updates the scores.
 
     Args:
         self (:obj:`bittensor.neuron.Neuron`): The neuron object which contains all the necessary state for the validator.
+        shard (int): Index of the miner UID shard handled by this forward.
+        num_shards (int): Total number of concurrent forwards in this step.
 
     """
-    # Initialize latest_miner_performance at the beginning of each forward pass.
-    self.latest_miner_performance = {}
+    # All shards of a step share one profile of the round, which stops before the sleep that
+    # would otherwise dominate it.
+    with profiled(self.profiler, "validator_forward", key=self.step):
+        validator_round = await get_round(self, num_shards)
+        shard_uids = validator_round.shard_uids(shard)
+        log.info("Forward shard %s/%s handling %s miner UIDs", shard, num_shards, len(shard_uids))
+        log.debug("Shard %s miner UIDs: %s", shard, log.Lazy(shard_uids.tolist))
+
+        results = None
+        try:
+            with ROUND_STAGE_DURATION.labels(stage="query").time():
+                await query_miners(self, validator_round, shard_uids)
+            with ROUND_STAGE_DURATION.labels(stage="score").time():
+                results = score_miners(self, validator_round, shard_uids)
+        except Exception:
+            bt.logging.error(
+                f"Forward shard {shard}/{num_shards} failed; its miners are not scored this round:\n"
+                f"{traceback.format_exc()}"
+            )
+        finally:
+            # Every shard must be accounted for, or the round would never be finalized.
+            await merge_shard(self, validator_round, shard, results)
 
+    await asyncio.sleep(FORWARD_INTERVAL)
+
+
+async def merge_shard(self: "Validator", validator_round: ValidatorRound, shard: int, results):
+    """Merges a shard's (rewards, prediction log), or None if it failed, and finalizes the round after the last shard."""
+    # Read before taking the lock: the block may need a subtensor call.
+    block = self.block
+    async with self.lock:
+        if results is None:
+            validator_round.fail(shard)
+        else:
+            validator_round.merge(shard, *results)
+        if validator_round.done:
+            with ROUND_STAGE_DURATION.labels(stage="finalize").time():
+                finalize_round(self, validator_round, block)
+            ROUND_DURATION.observe(time.perf_counter() - validator_round.started_at)
+
+
+async def get_round(self: "Validator", num_shards: int) -> ValidatorRound:
+    """Returns the round for the current step, building it if this is the first forward to ask."""
+    async with self.lock:
+        current_round = getattr(self, "current_round", None)
+        if current_round is None or current_round.step != self.step:
+            with ROUND_STAGE_DURATION.labels(stage="build").time():
+                self.current_round = build_round(self, num_shards)
+        return self.current_round
+
+
+def build_round(self: "Validator", num_shards: int) -> ValidatorRound:
+    """Fetches products and eligible miners once for every forward of this step."""
     # TODO(developer): Define how the validator selects a miner to query, how often, etc.
     # get_random_uids is an example method, but you can replace it with your own.
     # miner_uids = get_random_uids(self, k=self.config.neuron.sample_size)
-    # miner_uids = [5]
     miner_uids = get_filtered_uids(self)
-    bt.logging.info(f"Filtered miner UIDs for this round: {miner_uids}")
-    if not miner_uids:
+    log.info("Filtered %s miner UIDs for this round", len(miner_uids))
+    log.debug("Filtered miner UIDs: %s", log.Lazy(miner_uids.tolist))
+    if not len(miner_uids):
         bt.logging.warning("No miner UIDs eligible for this round. latest_miner_performance will likely be empty.")
 
-    bt.logging.info(f"Eligible Miner UIDs: {miner_uids}") # This line seems redundant with the one above, but kept as per original structure
     # Fetch product data
     data = fetch_products()
-    bt.logging.info(f"Fetched product data. Unmined products count: {len(data.unmined_products)}, Reward items count: {len(data.reward_items)}")
+    bt.logging.info(f"Fetched product data. Unmined products count: {len(data.unmined_products)}, Reward items count: {len(data.reward_items)}, Malformed products skipped: {data.decode_errors}")
     if not data.reward_items:
         bt.logging.warning("No reward items fetched. latest_miner_performance will likely be empty if it depends on reward_items processing.")
 
-    bt.logging.info(f"new products to send to miners: {data.unmined_products}")
-    products_to_score = []
+    log.debug("New products to send to miners: %s", data.unmined_products)
     if len(data.reward_items):
-        products_to_score = [r._id for r in data.reward_items]
-        bt.logging.info(f"Products to score: {[r._id for r in data.reward_items]}")
+        log.debug("Products to score: %s", log.Lazy(lambda: [r._id for r in data.reward_items]))
+
+    # The database layer (SQLAlchemy) is imported on first use rather than with the package,
+    # which miners import too.
+    from checkerchain.database.actions import db_get_unreviewd_products, get_predictions_for_product
 
     if len(data.unmined_products):
         queries = data.unmined_products  # Get product IDs from CheckerChain API
     else:
         unmined_db_products = db_get_unreviewd_products()
-        queries = {p._id for p in unmined_db_products}
-        bt.logging.info(f"Unmined products from DB: {queries}")
-
-    responses = []
-    # Query the miners if there are unmined products
-    if len(queries):
-        responses = await self.dendrite(
-            axons=[self.metagraph.axons[uid] for uid in miner_uids],
-            synapse=CheckerChainSynapse(query=queries),
-            timeout=25,
-            deserialize=True,
-        )
-        bt.logging.info(f"Received responses: {responses}")
+        queries = list({p._id for p in unmined_db_products})
+        log.info("Unmined products from DB: %s", len(queries))
+        log.debug("Unmined product IDs from DB: %s", queries)
 
-        # Add all responses to the database predictions table
-        for miner_uid, miner_predictions in zip(miner_uids, responses):
-            for product_id, prediction in zip(queries, miner_predictions):
-                if product_id not in products_to_score:
-                    add_prediction(product_id, miner_uid, prediction)
-    else:
+    # Load stored predictions once so shards never hit the DB concurrently for the same rows.
+    product_predictions = {}
+    for reward_product in data.reward_items:
+        product_predictions[reward_product._id] = [
+            (p.miner_id, p.prediction)
+            for p in get_predictions_for_product(reward_product._id) or []
+        ]
+
+    return ValidatorRound(
+        step=self.step,
+        miner_uids=miner_uids,
+        queries=queries,
+        reward_items=data.reward_items,
+        product_predictions=product_predictions,
+        num_shards=num_shards,
+        decode_errors=data.decode_errors,
+    )
+
+
+async def query_miners(self: "Validator", validator_round: ValidatorRound, shard_uids: np.ndarray):
+    """Sends the round's unmined products to this shard's miners and stores their predictions."""
+    queries = validator_round.queries
+    if not len(queries):
         bt.logging.info("No any products to send to miners.")
+        return
+    # Don't spend a full query timeout on miners whose health pings keep failing.
+    if self.health_prober is not None:
+        reachable_uids = self.health_prober.filter(shard_uids)
+        if len(reachable_uids) < len(shard_uids):
+            log.info("Skipping %s unreachable miners", len(shard_uids) - len(reachable_uids))
+            log.debug(
+                "Unreachable miners: %s",
+                log.Lazy(lambda: np.setdiff1d(shard_uids, reachable_uids).tolist()),
+            )
+        shard_uids = reachable_uids
+    if not len(shard_uids):
+        return
 
-    # Get one product which has been reviewed and is ready to score.
-    # Adjust the scores based on responses from miners.
-    reward_product = None
-    predictions = []
-    miner_ids = miner_uids
-    rewards = np.zeros_like(miner_uids, dtype=float)
-    if data.reward_items:
-        bt.logging.info(f"Starting processing of {len(data.reward_items)} reward items.")
-        prediction_logs = []
-        for reward_product in data.reward_items:
-            product_predictions = get_predictions_for_product(reward_product._id) or []
-            if not product_predictions:
-                continue
+    synapses = await self.dendrite(
+        axons=[self.metagraph.axons[uid] for uid in shard_uids],
+        synapse=CheckerChainSynapse(query=queries),
+        timeout=25,
+        deserialize=False,
+    )
+    responses = [synapse.deserialize() for synapse in synapses]
+    log.info("Received %s responses", len(responses))
+    log.debug("Responses: %s", responses)
+    record_dendrite_metrics(shard_uids, synapses)
 
-            # predictions = [p.prediction for p in product_predictions]
-            # prediction_miners = [p.miner_id for p in product_predictions]
-            predictions = []
-            prediction_miners = []
-            for pred in product_predictions:
-                if pred.miner_id in miner_ids:
-                    predictions.append(pred.prediction)
-                    prediction_miners.append(pred.miner_id)
-            _rewards = get_rewards(self, reward_product, responses=predictions)
-            bt.logging.info("Product ID: ", reward_product._id)
-            bt.logging.info("Miners: ", miner_ids)
-            bt.logging.info("Rewards: ", _rewards)
-            for i, (miner_id, reward, prediction_score) in enumerate(
-                zip(prediction_miners, _rewards, predictions)
-            ):
-                if reward is None:
-                    continue
-                try:
-                    if not prediction_score:
-                        bt.logging.warning(
-                            f"Prediction score is None for miner {int(miner_id)} and product {reward_product._id}"
-                        )
-                        continue
-                    idx = np.where(miner_ids == miner_id)[0][0]
-                    prediction_logs.append(
-                        {
-                            "productId": reward_product._id,
-                            "productName": reward_product.name,
-                            "productSlug": reward_product.slug,
-                            "predictionScore": prediction_score,
-                            "actualScore": reward_product.trustScore,
-                            "hotkey": self.metagraph.hotkeys[miner_id],
-                            "coldkey": self.metagraph.coldkeys[miner_id],
-                            "uid": int(miner_id),
-                        }
-                    )
-                    rewards[idx] += reward
-                except Exception as e:
-                    tb = traceback.format_exc()
-                    bt.logging.error(
-                        f"Error while processing product {reward_product._id}:\n{tb}"
+    # Add all responses to the database predictions table in one transaction.
+    from checkerchain.database.actions import add_predictions
+
+    products_to_score = set(validator_round.products_to_score)
+    add_predictions(
+        (product_id, miner_uid, prediction)
+        for miner_uid, miner_predictions in zip(shard_uids, responses)
+        for product_id, prediction in zip(queries, miner_predictions)
+        if product_id not in products_to_score
+    )
+
+
+def record_dendrite_metrics(uids: np.ndarray, synapses):
+    """Records the status code and, for answered queries, the response time of every miner."""
+    for uid, synapse in zip(uids, synapses):
+        dendrite = synapse.dendrite
+        DENDRITE_RESPONSES.labels(status_code=str(dendrite.status_code)).inc()
+        if dendrite.status_code == 200 and dendrite.process_time is not None:
+            DENDRITE_LATENCY.labels(uid=str(int(uid))).observe(float(dendrite.process_time))
+
+
+def score_miners(self: "Validator", validator_round: ValidatorRound, shard_uids: np.ndarray):
+    """
+    Scores this shard's miners against every reviewed product of the round.
+
+    Returns:
+        Tuple of the rewards array (aligned with `shard_uids`) and the shard's prediction log.
+    """
+    rewards = np.zeros(len(shard_uids), dtype=float)
+    prediction_log = PredictionLogBuffer()
+    uid_index = {int(uid): i for i, uid in enumerate(shard_uids)}
+
+    for reward_product in validator_round.reward_items:
+        product_predictions = validator_round.product_predictions.get(reward_product._id)
+        if not product_predictions:
+            continue
+
+        predictions = []
+        prediction_miners = []
+        for miner_id, prediction in product_predictions:
+            if miner_id in uid_index:
+                predictions.append(prediction)
+                prediction_miners.append(miner_id)
+        if not predictions:
+            continue
+
+        _rewards = get_rewards(self, reward_product, responses=predictions)
+        log.debug(
+            "Product ID: %s Miners: %s Rewards: %s",
+            reward_product._id,
+            prediction_miners,
+            log.Lazy(_rewards.tolist),
+        )
+
+        scored = []
+        for i, (miner_id, prediction_score) in enumerate(zip(prediction_miners, predictions)):
+            if not prediction_score:
+                miner_id = int(miner_id)
+                if _missing_prediction_log.allow(miner_id):
+                    log.warning(
+                        "Prediction score is None for miner %s and product %s (%s times so far)",
+                        miner_id,
+                        reward_product._id,
+                        _missing_prediction_log.count(miner_id),
                     )
-                    continue
+                continue
+            scored.append(i)
+        if not scored:
+            continue
 
+        scored_uids = [prediction_miners[i] for i in scored]
+        scored_rewards = _rewards[scored]
         try:
-            # You don't need to worry about this part of the code, it's for data collection for owners
-            if IS_OWNER:
-                import jwt
-
-                token = jwt.encode(
-                    {"sub": self.metagraph.coldkeys[0]},
-                    JWT_SECRET,
-                    algorithm="HS256",
-                )
-                headers = {
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {token}",
-                }
-                bt.logging.info(f"{STATS_SERVER_URL}/prediction/create", "url:")
-                result = requests.post(
-                    f"{STATS_SERVER_URL}/prediction/create",
-                    json=prediction_logs,
-                    headers=headers,
-                )
-                if result.status_code != 201:
-                    bt.logging.error(
-                        f"Error sending data to stats server: {result.status_code}"
-                    )
-                else:
-                    bt.logging.info("Successfully sent data to stats server")
-        except Exception as e:
-            bt.logging.error("Error while sending data to stats server", e)
-            bt.logging.error(prediction_logs)
-
-        bt.logging.info(f"Scored responses: {rewards}") # This is the cumulative rewards for miner_uids
-        bt.logging.info(f"Score ids: {miner_ids}")     # This is a copy of original miner_uids
-
-        # Populate self.latest_miner_performance with the rewards from this round.
-        # `rewards` array corresponds to the initial `miner_uids` list.
-        # These are the raw/final scores for each UID for this validation round.
-        bt.logging.info(f"Attempting to populate latest_miner_performance. miner_uids count: {len(miner_uids)}, rewards array: {rewards.tolist()[:10]}... (first 10 or all if fewer)")
-        if len(miner_uids) == len(rewards):
-            for i, uid in enumerate(miner_uids):
-                self.latest_miner_performance[int(uid)] = float(rewards[i])
-            bt.logging.info(f"Populated latest_miner_performance for current round: {self.latest_miner_performance}")
-        else:
-            # This case should ideally not happen if rewards array is initialized based on miner_uids
-            # and populated correctly. If it does, latest_miner_performance will be empty (as initialized).
+            prediction_log.append(
+                reward_product,
+                uids=scored_uids,
+                predictions=[predictions[i] for i in scored],
+                rewards=scored_rewards,
+                metagraph=self.metagraph,
+            )
+            np.add.at(rewards, [uid_index[uid] for uid in scored_uids], scored_rewards)
+        except Exception:
+            tb = traceback.format_exc()
             bt.logging.error(
-                f"Critical mismatch in length of miner_uids ({len(miner_uids)}) and rewards ({len(rewards)}). "
-                f"latest_miner_performance will be empty for this round, potentially leading to zero weights if not handled by set_weights."
+                f"Error while processing product {reward_product._id}:\n{tb}"
             )
-            # self.latest_miner_performance remains empty as initialized at the start of the function.
+            continue
 
-        mask = rewards > 0
-        filtered_rewards = rewards[mask]
-        # `miner_uids` is the correct array to filter here, as `rewards` corresponds to it.
-        filtered_miner_ids = miner_uids[mask] 
-        self.update_scores(filtered_rewards, filtered_miner_ids)
+    return rewards, prediction_log
 
-        for reward_product in data.reward_items:
-            delete_a_product(reward_product._id)
-    else:
-        # If there are no reward_items, latest_miner_performance remains empty (as initialized at the top).
+
+def finalize_round(self: "Validator", validator_round: ValidatorRound, block: int):
+    """
+    Commits the merged round: stats upload, scores update, archiving and product cleanup. Called
+    under `self.lock`. The scored predictions are only deleted once they have been archived.
+    """
+    self.latest_miner_performance = {}
+    miner_uids = validator_round.miner_uids
+    rewards = validator_round.rewards
+
+    if not validator_round.reward_items:
+        # If there are no reward_items, latest_miner_performance remains empty.
         # This ensures set_weights uses an empty dict, likely resulting in zero weights if it expects performance data.
         bt.logging.info("No reward items processed in this round. latest_miner_performance is empty.")
         self.update_to_last_scores()
+        return
+
+    # You don't need to worry about this part of the code, it's for data collection for owners
+    if IS_OWNER and self.stats_uploader is not None:
+        try:
+            self.stats_uploader.enqueue(
+                PREDICTION_ENDPOINT, validator_round.prediction_log.to_records()
+            )
+        except Exception as e:
+            bt.logging.error(f"Error while queueing data for stats server: {e}")
+
+    # `rewards` holds the cumulative rewards for miner_uids.
+    log.debug("Scored responses: %s", log.Lazy(rewards.tolist))
+    log.debug("Score ids: %s", log.Lazy(miner_uids.tolist))
+
+    # Populate self.latest_miner_performance with the rewards from this round.
+    # `rewards` array corresponds to the round's `miner_uids`.
+    for uid, reward in zip(miner_uids, rewards):
+        self.latest_miner_performance[int(uid)] = float(reward)
+    log.info(
+        "Populated latest_miner_performance for %s miners, %s rewarded",
+        len(self.latest_miner_performance),
+        int(np.count_nonzero(rewards)),
+    )
+    log.event(
+        "round",
+        step=int(validator_round.step),
+        miners=len(miner_uids),
+        products_scored=len(validator_round.reward_items),
+        products_queried=len(validator_round.queries),
+        decode_errors=validator_round.decode_errors,
+        rewarded=int(np.count_nonzero(rewards)),
+        reward_total=float(rewards.sum()),
+        duration=time.perf_counter() - validator_round.started_at,
+    )
+
+    mask = rewards > 0
+    self.update_scores(rewards[mask], miner_uids[mask])
+
+    # Every queried miner is recorded, so a miner that stops answering decays in the ranking.
+    # Miners of failed shards were never scored, so their history is left as it is.
+    scored = validator_round.scored
+    self.score_history.update(miner_uids[scored], rewards[scored] / len(validator_round.reward_items))
+
+    if self.prediction_archive is not None:
+        try:
+            self.prediction_archive.append(validator_round.prediction_log, block=block)
+        except Exception as e:
+            bt.logging.error(
+                f"Error while archiving scored predictions: {e}. Keeping them in the database."
+            )
+            return
+
+    from checkerchain.database.actions import delete_a_product
 
-    # 25 mins until next validation ??
-    time.sleep(25 * 60)
+    for reward_product in validator_round.reward_items:
+        delete_a_product(reward_product._id)
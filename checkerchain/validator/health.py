@@ -0,0 +1,106 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+import bittensor as bt
+import numpy as np
+
+from checkerchain.api.get_query_axons import probe_uids
+
+if TYPE_CHECKING:
+    from checkerchain.base.validator import BaseValidatorNeuron
+
+
+class HealthProber:
+    """
+    Up/down state of every miner axon, kept fresh by periodic lightweight pings.
+
+    Every `interval` seconds the candidate axons are pinged with an empty `bt.Synapse` and a short
+    timeout. A UID goes down after `down_after` consecutive failed pings and comes back up after
+    `up_after` consecutive successful ones, so a single dropped ping doesn't take a miner out of a
+    round. `forward` only sends the full (25 s) CheckerChainSynapse query to UIDs that are up.
+    UIDs start up, so a miner is never skipped before it has been probed.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        interval: float = 120.0,
+        timeout: float = 3.0,
+        down_after: int = 3,
+        up_after: int = 2,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.down_after = down_after
+        self.up_after = up_after
+        self.up = np.ones(n, dtype=bool)
+        self.failures = np.zeros(n, dtype=np.int64)
+        self.successes = np.zeros(n, dtype=np.int64)
+        # Latency of the last successful ping per UID, in seconds (NaN if unknown).
+        self.latency = np.full(n, np.nan)
+
+    def __len__(self) -> int:
+        return len(self.up)
+
+    def resize(self, n: int):
+        """Grows the state arrays to `n` UIDs; new UIDs start up."""
+        if n <= len(self):
+            return
+        old = len(self)
+        for name, fill in (("up", True), ("failures", 0), ("successes", 0), ("latency", np.nan)):
+            values = getattr(self, name)
+            grown = np.full(n, fill, dtype=values.dtype)
+            grown[:old] = values
+            setattr(self, name, grown)
+
+    def reset(self, uids):
+        """Forgets the health of `uids`, e.g. when their hotkey has been replaced."""
+        self.up[uids] = True
+        self.failures[uids] = 0
+        self.successes[uids] = 0
+        self.latency[uids] = np.nan
+
+    def record(self, uids: np.ndarray, ok: np.ndarray, latencies: np.ndarray):
+        """Applies one round of ping results to the up/down state."""
+        uids = np.asarray(uids, dtype=np.int64)
+        if not uids.size:
+            return
+        self.resize(int(uids.max()) + 1)
+        ok = np.asarray(ok, dtype=bool)
+        self.successes[uids] = np.where(ok, self.successes[uids] + 1, 0)
+        self.failures[uids] = np.where(ok, 0, self.failures[uids] + 1)
+        self.latency[uids[ok]] = np.asarray(latencies)[ok]
+
+        went_down = uids[self.up[uids] & (self.failures[uids] >= self.down_after)]
+        came_up = uids[~self.up[uids] & (self.successes[uids] >= self.up_after)]
+        self.up[went_down] = False
+        self.up[came_up] = True
+        if went_down.size or came_up.size:
+            bt.logging.info(f"Miner health changed. Down: {went_down.tolist()} Up: {came_up.tolist()}")
+
+    def filter(self, uids: np.ndarray) -> np.ndarray:
+        """Returns the UIDs of `uids` that are not known to be down."""
+        uids = np.asarray(uids, dtype=np.int64)
+        known = uids < len(self)
+        keep = np.ones(uids.size, dtype=bool)
+        keep[known] = self.up[uids[known]]
+        return uids[keep]
+
+    async def probe(self, dendrite: "bt.dendrite", metagraph: "bt.metagraph", uids: np.ndarray):
+        """Pings `uids` once and records the results."""
+        uids = np.asarray(uids, dtype=np.int64)
+        status_codes, latencies = await probe_uids(
+            dendrite, metagraph, uids.tolist(), timeout=self.timeout
+        )
+        self.record(uids, status_codes == 200, latencies)
+
+    async def run(self, validator: "BaseValidatorNeuron"):
+        """Probes the validator's eligible miners every `interval` seconds. Runs on the validator's event loop."""
+        while not validator.should_exit:
+            try:
+                await self.probe(
+                    validator.dendrite, validator.metagraph, validator.eligibility_index.uids
+                )
+            except Exception as e:
+                bt.logging.error(f"Health probe failed: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,168 @@
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from checkerchain.types.checker_chain import ProductSummary
+
+if TYPE_CHECKING:
+    import bittensor as bt
+    import pyarrow
+
+_COLUMNS = (
+    ("uid", np.int32),
+    ("product", np.int32),
+    ("prediction", np.float64),
+    ("actual", np.float64),
+    ("reward", np.float64),
+)
+
+
+class PredictionLogBuffer:
+    """
+    Structure-of-arrays log of scored (miner, product) predictions.
+
+    Numeric values live in NumPy columns that grow geometrically; product metadata and miner keys
+    are interned once per product / UID and referenced by index, instead of being copied into a
+    dict for every scored pair. The buffer converts to the stats server's record format, or to an
+    Arrow table / Parquet file for archiving.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self._size = 0
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in _COLUMNS}
+        # (productId, productName, productSlug), referenced by the `product` column.
+        self.products: List[Tuple[str, str, str]] = []
+        self._product_index: Dict[str, int] = {}
+        # uid -> (hotkey, coldkey) at the time the prediction was scored.
+        self.miner_keys: Dict[int, Tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str) -> np.ndarray:
+        """Returns a read-only view of a numeric column."""
+        view = self._columns[name][: self._size]
+        view.flags.writeable = False
+        return view
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        capacity = len(self._columns["uid"])
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for name, values in self._columns.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[: self._size] = values[: self._size]
+            self._columns[name] = grown
+
+    def _intern_product(self, product_id: str, name: str, slug: str) -> int:
+        index = self._product_index.get(product_id)
+        if index is None:
+            index = len(self.products)
+            self.products.append((product_id, name, slug))
+            self._product_index[product_id] = index
+        return index
+
+    def append(
+        self,
+        product: ProductSummary,
+        uids: Sequence[int],
+        predictions: Sequence[float],
+        rewards: Sequence[float],
+        metagraph: "bt.metagraph",
+    ):
+        """Appends the scored predictions of several miners for one reviewed product."""
+        n = len(uids)
+        if not n:
+            return
+        product_index = self._intern_product(product._id, product.name, product.slug)
+        for uid in uids:
+            uid = int(uid)
+            if uid not in self.miner_keys:
+                self.miner_keys[uid] = (metagraph.hotkeys[uid], metagraph.coldkeys[uid])
+
+        self._reserve(n)
+        rows = slice(self._size, self._size + n)
+        self._columns["uid"][rows] = uids
+        self._columns["product"][rows] = product_index
+        self._columns["prediction"][rows] = predictions
+        self._columns["actual"][rows] = product.trustScore
+        self._columns["reward"][rows] = rewards
+        self._size += n
+
+    def extend(self, other: "PredictionLogBuffer"):
+        """Appends every row of another buffer, remapping its product references."""
+        n = len(other)
+        if not n:
+            return
+        remap = np.array(
+            [self._intern_product(*p) for p in other.products], dtype=np.int32
+        )
+        self.miner_keys.update(other.miner_keys)
+        self._reserve(n)
+        rows = slice(self._size, self._size + n)
+        for name in self._columns:
+            self._columns[name][rows] = other._columns[name][:n]
+        self._columns["product"][rows] = remap[other._columns["product"][:n]]
+        self._size += n
+
+    def to_records(self) -> List[dict]:
+        """Returns the rows in the stats server's `/prediction/create` format."""
+        uids = self._columns["uid"][: self._size].tolist()
+        products = self._columns["product"][: self._size].tolist()
+        predictions = self._columns["prediction"][: self._size].tolist()
+        actuals = self._columns["actual"][: self._size].tolist()
+        records = []
+        for uid, product, prediction, actual in zip(uids, products, predictions, actuals):
+            product_id, product_name, product_slug = self.products[product]
+            hotkey, coldkey = self.miner_keys[uid]
+            records.append(
+                {
+                    "productId": product_id,
+                    "productName": product_name,
+                    "productSlug": product_slug,
+                    "predictionScore": prediction,
+                    "actualScore": actual,
+                    "hotkey": hotkey,
+                    "coldkey": coldkey,
+                    "uid": uid,
+                }
+            )
+        return records
+
+    def to_arrow(self) -> "pyarrow.Table":
+        """
+        Returns the rows as an Arrow table. Product and key strings are dictionary-encoded, so
+        they are stored once per product / miner rather than once per row. Requires `pyarrow`.
+        """
+        import pyarrow as pa
+
+        n = self._size
+        product_idx = pa.array(self._columns["product"][:n])
+        uid_values = self._columns["uid"][:n]
+        key_uids = np.array(sorted(self.miner_keys), dtype=np.int32)
+        key_idx = pa.array(np.searchsorted(key_uids, uid_values).astype(np.int32))
+
+        def dictionary(indices, values):
+            return pa.DictionaryArray.from_arrays(indices, pa.array(values, type=pa.string()))
+
+        return pa.table(
+            {
+                "product_id": dictionary(product_idx, [p[0] for p in self.products]),
+                "product_name": dictionary(product_idx, [p[1] for p in self.products]),
+                "product_slug": dictionary(product_idx, [p[2] for p in self.products]),
+                "uid": pa.array(uid_values),
+                "hotkey": dictionary(key_idx, [self.miner_keys[u][0] for u in key_uids.tolist()]),
+                "coldkey": dictionary(key_idx, [self.miner_keys[u][1] for u in key_uids.tolist()]),
+                "prediction": pa.array(self._columns["prediction"][:n]),
+                "actual": pa.array(self._columns["actual"][:n]),
+                "reward": pa.array(self._columns["reward"][:n]),
+            }
+        )
+
+    def to_parquet(self, path: str):
+        """Writes the rows to a Parquet file. Requires `pyarrow`."""
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path)
@@ -21,7 +21,7 @@ from typing import List
 import bittensor as bt
 from typing import List, Dict
 
-from checkerchain.types.checker_chain import ReviewedProduct
+from checkerchain.types.checker_chain import ProductSummary
 
 
 # def normalize(value: float, min_val: float, max_val: float) -> float:
@@ -108,7 +108,7 @@ def reward(prediction: float | None, actual: float) -> float:
 
 def get_rewards(
     self,
-    reviewed_product: ReviewedProduct,
+    reviewed_product: ProductSummary,
     responses: List[float | None],
 ) -> np.ndarray:
     """
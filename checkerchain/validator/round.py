@@ -0,0 +1,73 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from checkerchain.types.checker_chain import ProductSummary
+from checkerchain.validator.prediction_log import PredictionLogBuffer
+
+
+@dataclass
+class ValidatorRound:
+    """
+    Work shared by all concurrent forwards of one validator step.
+
+    The round is built once per step (under `self.lock`) and the eligible miner UIDs are split
+    into contiguous shards, one per concurrent forward. Every shard queries and scores only its
+    own UIDs, then merges its rewards back into the round. The last shard to finish commits the
+    merged result (scores, DB cleanup, stats upload).
+    """
+
+    step: int
+    miner_uids: np.ndarray
+    queries: List[str]
+    reward_items: List[ProductSummary]
+    # product_id -> [(miner_id, prediction), ...] loaded once from the DB for every reward item.
+    product_predictions: Dict[str, List[Tuple[int, float]]]
+    num_shards: int = 1
+    # Malformed products skipped while fetching the round's products.
+    decode_errors: int = 0
+    rewards: np.ndarray = field(init=False)
+    # False for miners whose shard failed and so were not scored this round.
+    scored: np.ndarray = field(init=False)
+    prediction_log: PredictionLogBuffer = field(init=False, default_factory=PredictionLogBuffer)
+    pending_shards: int = field(init=False)
+    # perf_counter() when the round was built, for the round duration metric.
+    started_at: float = field(init=False, default_factory=time.perf_counter)
+
+    def __post_init__(self):
+        self.miner_uids = np.asarray(self.miner_uids, dtype=np.int64)
+        self.num_shards = max(1, int(self.num_shards))
+        self.rewards = np.zeros(len(self.miner_uids), dtype=float)
+        self.scored = np.ones(len(self.miner_uids), dtype=bool)
+        self.pending_shards = self.num_shards
+        # Contiguous [start, stop) index ranges into miner_uids, one per shard.
+        bounds = np.linspace(0, len(self.miner_uids), self.num_shards + 1).astype(int)
+        self._shard_bounds = list(zip(bounds[:-1], bounds[1:]))
+
+    @property
+    def products_to_score(self) -> List[str]:
+        return [r._id for r in self.reward_items]
+
+    def shard_uids(self, shard: int) -> np.ndarray:
+        """Returns the miner UIDs assigned to `shard`."""
+        start, stop = self._shard_bounds[shard]
+        return self.miner_uids[start:stop]
+
+    def merge(self, shard: int, shard_rewards: np.ndarray, prediction_log: PredictionLogBuffer):
+        """Merges a shard's results into the round. Must be called while holding the round lock."""
+        start, stop = self._shard_bounds[shard]
+        self.rewards[start:stop] += shard_rewards
+        self.prediction_log.extend(prediction_log)
+        self.pending_shards -= 1
+
+    def fail(self, shard: int):
+        """Marks a shard whose forward failed as finished without results, so the round can still complete."""
+        start, stop = self._shard_bounds[shard]
+        self.scored[start:stop] = False
+        self.pending_shards -= 1
+
+    @property
+    def done(self) -> bool:
+        return self.pending_shards <= 0
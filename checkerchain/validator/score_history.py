@@ -0,0 +1,94 @@
+from typing import Dict
+
+import numpy as np
+
+
+class ScoreHistory:
+    """
+    Exponentially decayed per-UID accuracy over scoring rounds.
+
+    Equivalent to an EMA of each miner's per-round accuracy in which rounds the miner missed count
+    as zero, but updated lazily: every UID stores its decayed sum, its decayed weight and the round
+    it was last updated in, and the decay for missed rounds is applied in closed form when the UID
+    is next touched or read. A round therefore costs O(1) per scored UID, and all state lives in
+    fixed-size arrays indexed by UID.
+    """
+
+    def __init__(self, n: int, half_life: float = 12.0):
+        self.decay = 0.5 ** (1.0 / half_life)
+        self.round = 0
+        self.weighted_sum = np.zeros(n, dtype=np.float64)
+        self.weight = np.zeros(n, dtype=np.float64)
+        self.last_round = np.zeros(n, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.weighted_sum)
+
+    def _decayed(self, uids=slice(None)):
+        """Returns (sum, weight) for `uids` brought forward to the current round."""
+        gap = self.round - self.last_round[uids]
+        factor = self.decay**gap
+        # Missed rounds add zero to the sum but still add their (decayed) weight.
+        missed_weight = (1.0 - factor) / (1.0 - self.decay)
+        observed = self.weight[uids] > 0
+        weight = np.where(observed, self.weight[uids] * factor + missed_weight, 0.0)
+        return self.weighted_sum[uids] * factor, weight
+
+    def update(self, uids: np.ndarray, accuracy: np.ndarray):
+        """Records one scoring round for `uids` with their accuracy in this round."""
+        uids = np.asarray(uids, dtype=np.int64)
+        if not len(uids):
+            return
+        if uids.max() >= len(self):
+            self.resize(int(uids.max()) + 1)
+        weighted_sum, weight = self._decayed(uids)
+        self.round += 1
+        self.weighted_sum[uids] = self.decay * weighted_sum + np.nan_to_num(accuracy, nan=0.0)
+        self.weight[uids] = self.decay * weight + 1.0
+        self.last_round[uids] = self.round
+
+    def accuracy(self) -> np.ndarray:
+        """Decayed mean accuracy for every UID (0 for UIDs never scored)."""
+        weighted_sum, weight = self._decayed()
+        return np.divide(
+            weighted_sum, weight, out=np.zeros_like(weighted_sum), where=weight > 0
+        )
+
+    def observed(self) -> np.ndarray:
+        """Boolean mask of UIDs that have been scored at least once."""
+        return self.weight > 0
+
+    def performance(self) -> Dict[int, float]:
+        """Decayed accuracy of every scored UID, as {uid: accuracy}."""
+        uids = np.flatnonzero(self.observed())
+        return dict(zip(uids.tolist(), self.accuracy()[uids].tolist()))
+
+    def reset(self, uids):
+        """Forgets the history of `uids`, e.g. when their hotkey has been replaced."""
+        self.weighted_sum[uids] = 0.0
+        self.weight[uids] = 0.0
+        self.last_round[uids] = 0
+
+    def resize(self, n: int):
+        """Grows the arrays to `n` UIDs, keeping existing history."""
+        if n <= len(self):
+            return
+        for name in ("weighted_sum", "weight", "last_round"):
+            old = getattr(self, name)
+            new = np.zeros(n, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def state_dict(self) -> Dict[str, np.ndarray]:
+        return {
+            "history_round": np.asarray(self.round),
+            "history_weighted_sum": self.weighted_sum,
+            "history_weight": self.weight,
+            "history_last_round": self.last_round,
+        }
+
+    def load_state_dict(self, state):
+        self.round = int(state["history_round"])
+        self.weighted_sum = np.asarray(state["history_weighted_sum"], dtype=np.float64)
+        self.weight = np.asarray(state["history_weight"], dtype=np.float64)
+        self.last_round = np.asarray(state["history_last_round"], dtype=np.int64)
@@ -26,6 +26,7 @@ import checkerchain
 
 # import base miner class which takes care of most of the boilerplate
 from checkerchain.base.miner import BaseMinerNeuron
+from checkerchain.utils.profiling import profiled
 
 
 class Miner(BaseMinerNeuron):
@@ -57,7 +58,8 @@ class Miner(BaseMinerNeuron):
         The 'forward' function is a placeholder and should be overridden with logic that is appropriate for
         the miner's intended operation. This method demonstrates a basic transformation of input data.
         """
-        return await forward(self, synapse=synapse)
+        with profiled(self.profiler, "miner_forward"):
+            return await forward(self, synapse=synapse)
 
     async def blacklist(
         self, synapse: checkerchain.protocol.CheckerChainSynapse
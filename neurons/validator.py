@@ -6,9 +6,9 @@ class Validator(BaseValidatorNeuron):
     def __init__(self, config=None):
         super().__init__(config=config)
 
-    async def forward(self):
+    async def forward(self, shard: int = 0, num_shards: int = 1):
         # Implement your validation logic here.
-        # This is called every step for each batch of miners.
+        # This is called every step for each shard of miners.
         logging.info("Default forward called. Override this method with your logic.")
         return
 
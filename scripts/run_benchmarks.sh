@@ -0,0 +1,31 @@
+#!/bin/bash
+
+# Runs the benchmarks in tests/benchmarks and keeps their results as JSON baselines.
+#
+#   ./scripts/run_benchmarks.sh save [name]   Saves the results as a new baseline.
+#   ./scripts/run_benchmarks.sh compare       Compares against the latest baseline and fails if
+#                                             any mean got more than BENCHMARK_THRESHOLD slower.
+#
+# Baselines are machine-specific: save and compare on the same hardware.
+
+set -e
+
+cd "$(dirname "$0")/.."
+
+STORAGE="tests/benchmarks/baselines"
+THRESHOLD="${BENCHMARK_THRESHOLD:-20%}"
+# pytest.ini skips benchmarks by default (--benchmark-skip); drop that and run only them.
+BENCHMARK_ARGS=(tests/benchmarks -o addopts= --benchmark-only --benchmark-storage="file://$STORAGE" -q)
+
+case "$1" in
+    save)
+        python -m pytest "${BENCHMARK_ARGS[@]}" --benchmark-save="${2:-baseline}"
+        ;;
+    compare)
+        python -m pytest "${BENCHMARK_ARGS[@]}" --benchmark-compare --benchmark-compare-fail="mean:$THRESHOLD"
+        ;;
+    *)
+        echo "Usage: $0 save [name] | compare"
+        exit 1
+        ;;
+esac
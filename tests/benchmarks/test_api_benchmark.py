@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from checkerchain.types.checker_chain import ReviewedProductsApiResponse, parse_product_summaries
+from checkerchain.utils.simulator import make_product
+
+pytest.importorskip("pytest_benchmark")
+
+
+def reviewed_page(count):
+    return json.dumps(
+        {
+            "message": "ok",
+            "data": {"products": [make_product(i, trust_score=float(i % 100)) for i in range(count)]},
+        }
+    ).encode()
+
+
+@pytest.mark.parametrize("count", [30, 1000])
+def test_parse_reviewed_products(benchmark, count):
+    """Decoding and fully parsing one page of reviewed products."""
+    benchmark.group = "parse_reviewed_products"
+    payload = reviewed_page(count)
+    response = benchmark(lambda: ReviewedProductsApiResponse.from_dict(json.loads(payload)))
+    assert len(response.data.products) == count
+
+
+@pytest.mark.parametrize("count", [30, 1000])
+def test_parse_product_summaries(benchmark, count):
+    """Decoding one page of reviewed products into the summaries fetch_products uses."""
+    benchmark.group = "parse_reviewed_products"
+    payload = reviewed_page(count)
+    decoded = benchmark(parse_product_summaries, payload, True)
+    assert len(decoded.products) == count
@@ -0,0 +1,52 @@
+import pytest
+
+from checkerchain.database import actions, db
+
+pytest.importorskip("pytest_benchmark")
+
+MINERS = 256
+# Fewer products than a real round: storing them one commit at a time takes seconds.
+PRODUCTS = 5
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DATABASE_URL", f"sqlite:///{tmp_path / 'benchmark.db'}")
+    db.get_engine.cache_clear()
+    db._session_factory.cache_clear()
+    db.init_db()
+    for i in range(PRODUCTS):
+        actions.add_product(f"product-{i}", f"Product {i}")
+    yield
+    db.get_engine().dispose()
+    db.get_engine.cache_clear()
+    db._session_factory.cache_clear()
+
+
+def round_predictions(value):
+    return [
+        (f"product-{i}", uid, float(value))
+        for uid in range(MINERS)
+        for i in range(PRODUCTS)
+    ]
+
+
+def test_add_prediction(benchmark, database):
+    """One upsert and commit per prediction, as the validator stored them before add_predictions."""
+    benchmark.group = "store_round_predictions"
+    rows = round_predictions(50)
+
+    def store():
+        for product_id, miner_id, prediction in rows:
+            actions.add_prediction(product_id, miner_id, prediction)
+
+    benchmark.pedantic(store, rounds=3, iterations=1)
+    assert len(actions.get_predictions_for_product("product-0")) == MINERS
+
+
+def test_add_predictions(benchmark, database):
+    benchmark.group = "store_round_predictions"
+    rows = round_predictions(50)
+    benchmark.pedantic(actions.add_predictions, args=(rows,), rounds=10, iterations=1)
+    assert len(actions.get_predictions_for_product("product-0")) == MINERS
+
@@ -0,0 +1,43 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from checkerchain.miner.llm import ReviewScoreSchema, ScoreBreakdown
+from checkerchain.protocol import CheckerChainSynapse
+
+pytest.importorskip("pytest_benchmark")
+
+PRODUCTS = 30
+
+
+@pytest.fixture
+def miner_forward(monkeypatch):
+    """The miner's forward with the product API and the LLM stubbed out."""
+    import checkerchain.miner.forward as module
+
+    async def generate_review_score(product):
+        await asyncio.sleep(0)
+        breakdown = ScoreBreakdown(
+            project=7, userbase=6, utility=8, security=9, team=5,
+            tokenomics=6, marketing=7, roadmap=8, clarity=6, partnerships=5,
+        )
+        return ReviewScoreSchema(product=product.name, overall_score=70, breakdown=breakdown)
+
+    monkeypatch.setattr(module, "fetch_product_data", lambda product_id: SimpleNamespace(_id=product_id, name=product_id))
+    monkeypatch.setattr(module, "generate_review_score", generate_review_score)
+    return module
+
+
+def test_miner_forward(benchmark, miner_forward):
+    benchmark.group = "miner_forward"
+    query = [f"product-{i}" for i in range(PRODUCTS)]
+
+    def run():
+        # Measure uncached requests: every product goes through the (stubbed) LLM.
+        miner_forward.miner_preds.clear()
+        return asyncio.run(miner_forward.forward(None, CheckerChainSynapse(query=query)))
+
+    synapse = benchmark(run)
+    assert len(synapse.response) == PRODUCTS
+    assert all(score is not None for score in synapse.response)
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from checkerchain.utils.uids import EligibilityIndex, get_filtered_uids
+from checkerchain.validator.reward import get_rewards
+from checkerchain.validator.round import ValidatorRound
+from checkerchain.validator.score_history import ScoreHistory
+
+pytest.importorskip("pytest_benchmark")
+
+MINERS = 256
+PRODUCTS = 30
+
+
+def reviewed_products(count, rng):
+    return [
+        SimpleNamespace(_id=f"product-{i}", name=f"Product {i}", slug=f"product-{i}", trustScore=float(score))
+        for i, score in enumerate(rng.uniform(1, 100, size=count))
+    ]
+
+
+def random_metagraph(n, rng):
+    return SimpleNamespace(
+        n=n,
+        uids=np.arange(n),
+        hotkeys=[f"hk{uid}" for uid in range(n)],
+        coldkeys=[f"ck{c}" for c in rng.integers(0, max(1, n // 8), size=n)],
+        axons=[SimpleNamespace(is_serving=bool(s)) for s in rng.random(n) < 0.8],
+        validator_permit=rng.random(n) < 0.2,
+        S=rng.random(n) * 20000,
+        dividends=np.where(rng.random(n) < 0.05, rng.random(n), 0.0),
+    )
+
+
+def test_get_rewards(benchmark):
+    benchmark.group = "rewards"
+    rng = np.random.default_rng(0)
+    product = reviewed_products(1, rng)[0]
+    responses = rng.uniform(0, 100, size=MINERS).tolist()
+    rewards = benchmark(get_rewards, None, product, responses)
+    assert rewards.shape == (MINERS,)
+
+
+def test_score_round(benchmark):
+    """The validator's reward loop: every miner scored against every reviewed product of a round."""
+    from checkerchain.validator.forward import score_miners
+
+    benchmark.group = "rewards"
+    rng = np.random.default_rng(0)
+    products = reviewed_products(PRODUCTS, rng)
+    validator_round = ValidatorRound(
+        step=0,
+        miner_uids=np.arange(MINERS),
+        queries=[],
+        reward_items=products,
+        product_predictions={
+            p._id: list(zip(range(MINERS), rng.uniform(0, 100, size=MINERS).tolist())) for p in products
+        },
+    )
+    validator = SimpleNamespace(metagraph=random_metagraph(MINERS, rng))
+    rewards, _ = benchmark(score_miners, validator, validator_round, validator_round.miner_uids)
+    assert rewards.shape == (MINERS,)
+
+
+@pytest.mark.parametrize("n", [256, 4096])
+def test_set_weights(benchmark, n):
+    from checkerchain.base.validator import BaseValidatorNeuron
+
+    benchmark.group = "set_weights"
+    rng = np.random.default_rng(0)
+    score_history = ScoreHistory(n)
+    for _ in range(10):
+        uids = rng.choice(n, size=n // 2, replace=False)
+        score_history.update(uids, rng.uniform(0, 100, size=uids.size))
+    submitted = []
+    validator = SimpleNamespace(
+        metagraph=random_metagraph(n, rng),
+        score_history=score_history,
+        config=SimpleNamespace(netuid=1),
+        subtensor=None,
+        hyperparameters=SimpleNamespace(min_allowed_weights=8, max_weight_limit=0.1),
+        weight_setter=SimpleNamespace(submit=lambda uids, weights: submitted.append(weights)),
+    )
+    benchmark(BaseValidatorNeuron.set_weights, validator)
+    assert submitted and len(submitted[-1]) > 0
+
+
+@pytest.mark.parametrize("n", [256, 4096])
+def test_get_filtered_uids(benchmark, n):
+    benchmark.group = "get_filtered_uids"
+    metagraph = random_metagraph(n, np.random.default_rng(0))
+    validator = SimpleNamespace(
+        metagraph=metagraph, config=SimpleNamespace(neuron=SimpleNamespace(vpermit_tao_limit=4096))
+    )
+    uids = benchmark(get_filtered_uids, validator)
+    assert len(uids) > 0
+
+
+@pytest.mark.parametrize("n", [256, 4096])
+def test_rebuild_eligibility_index(benchmark, n):
+    benchmark.group = "get_filtered_uids"
+    metagraph = random_metagraph(n, np.random.default_rng(0))
+    index = EligibilityIndex(vpermit_tao_limit=4096)
+    benchmark(index.rebuild, metagraph)
+    assert len(index.uids) > 0
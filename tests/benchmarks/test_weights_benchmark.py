@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from checkerchain.base.utils.weight_utils import (
+    compute_rank_weights,
+    convert_weights_and_uids_for_emit,
+    normalize_max_weight,
+)
+
+pytest.importorskip("pytest_benchmark")
+
+METAGRAPH_SIZES = [256, 1024, 4096]
+
+
+def make_metagraph_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    # Rounded accuracies so ties actually occur, a few unscored UIDs and ~5% validators.
+    performance = np.round(rng.random(n) * 100, 1)
+    observed = rng.random(n) < 0.9
+    dividends = np.where(rng.random(n) < 0.05, rng.random(n), 0.0)
+    return performance, observed, dividends
+
+
+@pytest.mark.parametrize("n", METAGRAPH_SIZES)
+def test_compute_rank_weights(benchmark, n):
+    benchmark.group = "rank_weights"
+    performance, observed, dividends = make_metagraph_inputs(n)
+    weights = benchmark(compute_rank_weights, performance, observed, dividends)
+    assert weights.shape == (n,)
+
+
+@pytest.mark.parametrize("n", [4096, 65536])
+def test_normalize_max_weight(benchmark, n):
+    benchmark.group = "normalize_max_weight"
+    weights = np.random.default_rng(0).random(n) ** 4
+    benchmark(normalize_max_weight, weights, 0.01)
+
+
+@pytest.mark.parametrize("n", [4096, 65536])
+def test_convert_weights_and_uids_for_emit(benchmark, n):
+    benchmark.group = "convert_weights_and_uids_for_emit"
+    weights = np.random.default_rng(0).random(n)
+    benchmark(convert_weights_and_uids_for_emit, np.arange(n), weights)
+
+
+@pytest.mark.parametrize("n", METAGRAPH_SIZES)
+def test_score_store_update(benchmark, n):
+    from checkerchain.base.utils.score_store import ScoreStore
+
+    benchmark.group = "score_update"
+    store = ScoreStore(n)
+    uids = np.random.default_rng(0).choice(n, size=min(n, 256), replace=False)
+    benchmark(store.update, uids, np.ones(uids.size, dtype=np.float32), 0.1)
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from checkerchain.validator.archive import PredictionArchive
+from checkerchain.validator.prediction_log import PredictionLogBuffer
+
+metagraph = SimpleNamespace(
+    hotkeys=[f"hotkey-{i}" for i in range(8)],
+    coldkeys=[f"coldkey-{i}" for i in range(8)],
+)
+
+
+def scored_round(product_id, uids, trust_score=70.0):
+    buffer = PredictionLogBuffer()
+    product = SimpleNamespace(_id=product_id, name=product_id, slug=product_id, trustScore=trust_score)
+    predictions = [50.0 + uid for uid in uids]
+    rewards = [100 - abs(p - trust_score) for p in predictions]
+    buffer.append(product, uids, predictions, rewards, metagraph)
+    return buffer
+
+
+def test_miner_history_spans_rounds(tmp_path):
+    archive = PredictionArchive(str(tmp_path))
+    archive.append(scored_round("p1", [1, 2, 3]), block=100)
+    archive.append(scored_round("p2", [2, 3]), block=200)
+    assert archive.append(PredictionLogBuffer(), block=300) is None
+
+    history = archive.miner_history(uid=2)
+
+    assert len(archive.files()) == 2
+    assert history.column("product_id").to_pylist() == ["p1", "p2"]
+    assert history.column("block").to_pylist() == [100, 200]
+    assert history.column("reward").to_pylist() == [82.0, 82.0]
+    assert archive.miner_history(hotkey="hotkey-1").num_rows == 1
+    assert archive.miner_history(uid=7) is None
+
+
+class FailingArchive:
+    def append(self, prediction_log, block):
+        raise OSError("disk full")
+
+
+def test_failed_archive_keeps_predictions_in_database(monkeypatch):
+    import importlib
+
+    import numpy as np
+
+    from checkerchain.database import actions
+    from checkerchain.validator.round import ValidatorRound
+
+    forward = importlib.import_module("checkerchain.validator.forward")
+    deleted = []
+    monkeypatch.setattr(actions, "delete_a_product", deleted.append)
+
+    validator_round = ValidatorRound(
+        step=0,
+        miner_uids=np.arange(2),
+        queries=[],
+        reward_items=[SimpleNamespace(_id="p1")],
+        product_predictions={},
+    )
+    validator_round.merge(0, np.array([10.0, 20.0]), scored_round("p1", [0, 1]))
+    validator = SimpleNamespace(
+        stats_uploader=None,
+        prediction_archive=FailingArchive(),
+        update_scores=lambda rewards, uids: None,
+        score_history=SimpleNamespace(update=lambda uids, rewards: None),
+    )
+
+    forward.finalize_round(validator, validator_round, block=1)
+    assert deleted == []
+
+    validator.prediction_archive = None
+    forward.finalize_round(validator, validator_round, block=1)
+    assert deleted == ["p1"]
@@ -0,0 +1,97 @@
+import json
+import tracemalloc
+
+import pytest
+
+from checkerchain.types.checker_chain import (
+    DecodedProducts,
+    ProductSummary,
+    ReviewedProductsApiResponse,
+    parse_product_summaries,
+)
+from checkerchain.utils.simulator import make_product
+
+
+def page(products):
+    return json.dumps({"message": "ok", "data": {"products": products}}).encode()
+
+
+def test_summaries_match_the_full_parse():
+    products = [make_product(i, trust_score=i * 1.5) for i in range(20)]
+    full = ReviewedProductsApiResponse.from_dict(json.loads(page(products))).data.products
+    summaries = parse_product_summaries(page(products)).products
+    assert [(p._id, p.name, p.slug, p.trustScore) for p in full] == [
+        (s._id, s.name, s.slug, s.trustScore) for s in summaries
+    ]
+
+
+def test_unreviewed_products_have_zero_trust_score():
+    [summary] = parse_product_summaries(page([make_product(7)])).products
+    assert summary == ProductSummary(make_product(7)["_id"], "Product 7", "product-7", 0.0)
+
+
+def test_summaries_use_less_memory_than_the_full_parse():
+    payload = page([make_product(i, trust_score=50.0) for i in range(500)])
+
+    def retained(parse):
+        tracemalloc.start()
+        try:
+            result = parse()
+            return tracemalloc.get_traced_memory()[0], result
+        finally:
+            tracemalloc.stop()
+
+    full_size, _ = retained(lambda: ReviewedProductsApiResponse.from_dict(json.loads(payload)))
+    summary_size, _ = retained(lambda: parse_product_summaries(payload))
+    assert summary_size * 4 < full_size
+
+
+def test_malformed_products_are_skipped_and_counted():
+    good = make_product(1, trust_score=80.0)
+    no_score = make_product(2, trust_score=80.0)
+    no_score["trustScore"] = None
+    no_id = make_product(3, trust_score=80.0)
+    del no_id["_id"]
+    bad_score = make_product(4, trust_score=80.0)
+    bad_score["trustScore"] = "n/a"
+    payload = page([good, no_score, no_id, bad_score, "not a product", None])
+
+    decoded = parse_product_summaries(payload, require_trust_score=True)
+    assert decoded == DecodedProducts([ProductSummary.from_dict(good)], errors=5)
+    # Unreviewed pages don't need trust scores.
+    assert parse_product_summaries(payload).errors == 4
+
+
+def test_null_fields_that_are_not_read_are_ignored():
+    product = make_product(1, trust_score=80.0)
+    product.update(reviewDeadline=None, epoch=None, createdBy=None)
+    assert parse_product_summaries(page([product]), require_trust_score=True).errors == 0
+
+
+@pytest.mark.parametrize("payload", [b"not json", b"{}", b'{"data": {"products": null}}'])
+def test_malformed_pages_raise_value_error(payload):
+    with pytest.raises(ValueError):
+        parse_product_summaries(payload)
+
+
+def test_fetch_products_survives_malformed_products(tmp_path, monkeypatch):
+    from checkerchain.database import db
+    from checkerchain.utils import checker_chain
+    from checkerchain.utils.simulator import MockCheckerChainAPI
+
+    monkeypatch.setattr(db, "DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    db.get_engine.cache_clear()
+    db._session_factory.cache_clear()
+    db.init_db()
+    broken = make_product(2)
+    broken["_id"] = None
+    try:
+        with MockCheckerChainAPI({"published": [make_product(1), broken]}) as api:
+            monkeypatch.setattr(checker_chain, "API_URL", api.url)
+            data = checker_chain.fetch_products()
+    finally:
+        db.get_engine().dispose()
+        db.get_engine.cache_clear()
+        db._session_factory.cache_clear()
+    assert data.unmined_products == [make_product(1)["_id"]]
+    assert data.decode_errors == 1
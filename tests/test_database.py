@@ -0,0 +1,32 @@
+import pytest
+
+from checkerchain.database import actions, db
+
+MINERS = 8
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    db.get_engine.cache_clear()
+    db._session_factory.cache_clear()
+    db.init_db()
+    for i in range(2):
+        actions.add_product(f"product-{i}", f"Product {i}")
+    yield
+    db.get_engine().dispose()
+    db.get_engine.cache_clear()
+    db._session_factory.cache_clear()
+
+
+def test_add_predictions_upserts(database):
+    actions.add_predictions(
+        (f"product-{i}", uid, 10.0) for uid in range(MINERS) for i in range(2)
+    )
+    actions.add_predictions([("product-0", 0, 90.0), ("product-0", 1, None)])
+    predictions = {p.miner_id: p.prediction for p in actions.get_predictions_for_product("product-0")}
+    assert len(predictions) == MINERS
+    assert predictions[0] == 90
+    assert predictions[1] is None
+    assert predictions[2] == 10
+    assert len(actions.get_predictions_for_product("product-1")) == MINERS
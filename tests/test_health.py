@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from checkerchain.validator.health import HealthProber
+
+
+class FakeDendrite:
+    """Answers pings with 200 for uids in `alive`, 408 otherwise. Axons are their uids."""
+
+    def __init__(self, alive):
+        self.alive = set(alive)
+
+    async def __call__(self, axons, synapse, deserialize, timeout):
+        return [
+            SimpleNamespace(
+                dendrite=SimpleNamespace(
+                    status_code=200 if uid in self.alive else 408,
+                    process_time=0.1 if uid in self.alive else None,
+                )
+            )
+            for uid in axons
+        ]
+
+
+def probe(prober, dendrite, uids):
+    metagraph = SimpleNamespace(axons=list(range(10)))
+    asyncio.run(prober.probe(dendrite, metagraph, np.asarray(uids)))
+
+
+def test_hysteresis_takes_miners_down_and_back_up():
+    prober = HealthProber(4, down_after=2, up_after=2)
+    uids = [0, 1, 2, 3]
+    probe(prober, FakeDendrite(alive=[0, 1, 2]), uids)
+    assert prober.up.all()
+    probe(prober, FakeDendrite(alive=[0, 1, 2]), uids)
+    assert np.array_equal(prober.filter(uids), [0, 1, 2])
+
+    probe(prober, FakeDendrite(alive=[0, 1, 2, 3]), uids)
+    assert not prober.up[3]
+    probe(prober, FakeDendrite(alive=[0, 1, 2, 3]), uids)
+    assert prober.up[3]
+    assert np.allclose(prober.latency, 0.1)
+
+
+def test_unknown_and_reset_uids_are_queried():
+    prober = HealthProber(2, down_after=1)
+    probe(prober, FakeDendrite(alive=[]), [0, 1])
+    assert prober.filter([0, 1, 5]).tolist() == [5]
+    prober.reset([1])
+    assert prober.filter([0, 1]).tolist() == [1]
@@ -0,0 +1,61 @@
+import numpy as np
+
+from checkerchain.base.utils.hyperparameters import SubnetHyperparameterCache
+from checkerchain.base.utils.weight_utils import process_weights_for_netuid
+
+
+class CountingSubtensor:
+    def __init__(self):
+        self.calls = 0
+        self.block = 1000
+
+    def min_allowed_weights(self, netuid):
+        self.calls += 1
+        return 2
+
+    def max_weight_limit(self, netuid):
+        self.calls += 1
+        return 0.5
+
+    def get_current_block(self):
+        return self.block
+
+
+class Metagraph:
+    n = 4
+
+
+def test_refresh_respects_block_ttl():
+    subtensor = CountingSubtensor()
+    cache = SubnetHyperparameterCache(subtensor, netuid=1, ttl_blocks=100)
+    assert cache.refresh(1000)
+    assert not cache.refresh(1099)
+    assert subtensor.calls == 2
+    assert cache.refresh(1100)
+    assert subtensor.calls == 4
+
+
+def test_reads_hit_the_chain_only_when_empty():
+    subtensor = CountingSubtensor()
+    cache = SubnetHyperparameterCache(subtensor, netuid=1)
+    assert (cache.min_allowed_weights, cache.max_weight_limit) == (2, 0.5)
+    assert cache.min_allowed_weights == 2
+    assert subtensor.calls == 2
+    assert cache.fetched_at_block == 1000
+
+
+def test_process_weights_uses_cached_values_without_rpcs():
+    subtensor = CountingSubtensor()
+    cache = SubnetHyperparameterCache(subtensor, netuid=1)
+    cache.refresh(1000)
+    uids, weights = process_weights_for_netuid(
+        uids=np.arange(4),
+        weights=np.array([0.1, 0.2, 0.3, 0.4]),
+        netuid=1,
+        subtensor=subtensor,
+        metagraph=Metagraph(),
+        min_allowed_weights=cache.min_allowed_weights,
+        max_weight_limit=cache.max_weight_limit,
+    )
+    assert subtensor.calls == 2
+    assert np.isclose(weights.sum(), 1.0)
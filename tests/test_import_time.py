@@ -0,0 +1,63 @@
+import argparse
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported when the code path that needs them runs.
+DEFERRED_MODULES = ("sqlalchemy", "langchain", "langchain_openai", "openai", "jwt")
+
+
+def import_profile(module):
+    """Imports `module` in a fresh interpreter under `-X importtime`.
+
+    Returns:
+        Dict of imported top-level module name -> cumulative import time in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        cumulative = cumulative.strip()
+        if not cumulative.isdigit():
+            continue  # header line
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.mark.parametrize("module", ["checkerchain", "checkerchain.miner.llm", "neurons.miner"])
+def test_heavy_dependencies_are_deferred(module):
+    profile = import_profile(module)
+    loaded = {name.split(".")[0] for name in profile}
+    assert not loaded.intersection(DEFERRED_MODULES)
+
+    total_ms = profile[module] / 1000
+    budget_ms = os.getenv("CHECKERCHAIN_IMPORT_BUDGET_MS")
+    if budget_ms is not None:
+        assert total_ms <= float(budget_ms), (
+            f"import {module} took {total_ms:.0f} ms, over the {budget_ms} ms budget"
+        )
+
+
+def test_building_the_parser_does_not_probe_for_cuda(monkeypatch):
+    from checkerchain.utils import config
+
+    def fail(*args, **kwargs):
+        raise AssertionError("device detection ran while building the parser")
+
+    monkeypatch.setattr(config.subprocess, "check_output", fail)
+    parser = argparse.ArgumentParser()
+    config.add_args(None, parser)
+    assert parser.parse_args([]).__dict__["neuron.device"] == "auto"
+    assert config.resolve_device("cpu") == "cpu"
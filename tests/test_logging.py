@@ -0,0 +1,76 @@
+import json
+import logging
+
+import bittensor as bt
+import numpy as np
+import pytest
+
+from checkerchain.utils import logging as log
+
+
+@pytest.fixture
+def emitted(monkeypatch):
+    """Records the messages passed to bt.logging.debug and bt.logging.info."""
+    messages = []
+    monkeypatch.setattr(bt.logging, "debug", messages.append)
+    monkeypatch.setattr(bt.logging, "info", messages.append)
+    return messages
+
+
+def set_level(monkeypatch, level):
+    monkeypatch.setattr(bt.logging, "get_level", lambda: level)
+
+
+@pytest.fixture
+def events_log(tmp_path):
+    logger = log.setup_events_logger(str(tmp_path), 1 << 20)
+    yield tmp_path / "events.log"
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_disabled_level_skips_formatting(monkeypatch, emitted):
+    set_level(monkeypatch, logging.INFO)
+
+    def expensive():
+        raise AssertionError("must not be evaluated")
+
+    log.debug("scores: %s", log.Lazy(expensive))
+    log.info("%s miners", 3)
+
+    assert emitted == ["3 miners"]
+
+
+def test_enabled_level_formats_lazy_arguments(monkeypatch, emitted):
+    set_level(monkeypatch, logging.DEBUG)
+
+    log.debug("scores: %s", log.Lazy(np.array([1, 2]).tolist))
+    log.debug("no arguments: %s")
+
+    assert emitted == ["scores: [1, 2]", "no arguments: %s"]
+
+
+def test_event_writes_json_line(events_log):
+    log.event("round", step=np.int64(3), rewards=np.array([0.5, 1.0]))
+
+    line = events_log.read_text().strip()
+    assert "| EVENT |" in line
+    payload = json.loads(line.split(" | ", 2)[2])
+    assert payload == {"event": "round", "step": 3, "rewards": [0.5, 1.0]}
+
+
+def test_event_without_events_logger_is_noop(tmp_path):
+    assert not logging.getLogger("event").handlers
+    log.event("round", step=1)
+
+
+def test_sampler_allows_first_and_every_nth():
+    sampler = log.LogSampler(every=3)
+
+    allowed = [sampler.allow(7) for _ in range(7)]
+
+    assert allowed == [True, False, False, True, False, False, True]
+    assert sampler.count(7) == 7
+    assert sampler.allow(8)
+    assert sampler.count(9) == 0
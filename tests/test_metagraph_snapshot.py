@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from checkerchain.base.utils.metagraph_snapshot import MetagraphSnapshot
+
+
+def make_metagraph(hotkeys, ports=None):
+    ports = ports or [8091] * len(hotkeys)
+    axons = [
+        SimpleNamespace(
+            hotkey=hotkey, coldkey="cold", ip="1.2.3.4", port=port, ip_type=4, protocol=4, version=1
+        )
+        for hotkey, port in zip(hotkeys, ports)
+    ]
+    return SimpleNamespace(hotkeys=list(hotkeys), axons=axons)
+
+
+def test_unchanged_metagraph_has_empty_diff():
+    metagraph = make_metagraph(["a", "b", "c"])
+    diff = MetagraphSnapshot.from_metagraph(metagraph).diff(MetagraphSnapshot.from_metagraph(metagraph))
+    assert not diff.changed
+
+
+def test_diff_reports_replaced_added_and_reserved_uids():
+    old = MetagraphSnapshot.from_metagraph(make_metagraph(["a", "b", "c"]))
+    new = MetagraphSnapshot.from_metagraph(make_metagraph(["a", "x", "c", "d"], ports=[8091, 8091, 9000, 8091]))
+    diff = old.diff(new)
+    assert diff.changed
+    assert np.array_equal(diff.replaced, [1])
+    assert np.array_equal(diff.added, [3])
+    assert diff.removed.size == 0
+    assert np.array_equal(diff.updated_axons, [2])
+
+
+def test_diff_reports_removed_uids_and_restored_hotkeys():
+    live = MetagraphSnapshot.from_metagraph(make_metagraph(["a", "b"]))
+    restored = live.with_hotkeys(["a", "z", "y"])
+    diff = restored.diff(live)
+    assert np.array_equal(diff.replaced, [1])
+    assert np.array_equal(diff.removed, [2])
@@ -0,0 +1,57 @@
+import socket
+import urllib.request
+
+import pytest
+
+from checkerchain.mock import MinerProfile
+from checkerchain.utils import metrics
+from checkerchain.utils.simulator import run_simulation
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+
+def sample(name, **labels):
+    return metrics.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_noop_metric_accepts_every_call():
+    metric = metrics._NoopMetric()
+    with metric.labels(stage="x").time():
+        metric.observe(1)
+        metric.inc()
+        metric.dec()
+        metric.set(3)
+
+
+def test_simulated_rounds_are_recorded():
+    rounds = sample("checkerchain_round_duration_seconds_count")
+    inserts = sample("checkerchain_db_operation_duration_seconds_count", operation="add_predictions")
+    fetches = sample("checkerchain_api_fetch_duration_seconds_count", endpoint="reviewed")
+    answered = sample("checkerchain_dendrite_responses_total", status_code="200")
+
+    run_simulation(rounds=2, miners=4, products=2, profile=MinerProfile(latency=0, jitter=0), time_scale=0)
+
+    assert sample("checkerchain_round_duration_seconds_count") == rounds + 2
+    assert sample("checkerchain_round_stage_duration_seconds_count", stage="build") >= 2
+    assert sample("checkerchain_db_operation_duration_seconds_count", operation="add_predictions") == inserts + 2
+    assert sample("checkerchain_api_fetch_duration_seconds_count", endpoint="reviewed") == fetches + 2
+    assert sample("checkerchain_dendrite_responses_total", status_code="200") == answered + 8
+    assert sample("checkerchain_dendrite_latency_seconds_count", uid="0") >= 2
+
+
+def test_metrics_server_is_optional():
+    assert not metrics.start_metrics_server(None)
+
+
+def test_metrics_server_serves_the_registry():
+    port = free_port()
+    assert metrics.start_metrics_server(port)
+    metrics.record_cache("test", hit=True)
+    body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode()
+    assert 'checkerchain_cache_requests_total{cache="test",result="hit"}' in body
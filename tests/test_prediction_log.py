@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from checkerchain.validator.prediction_log import PredictionLogBuffer
+
+metagraph = SimpleNamespace(
+    hotkeys=[f"hotkey-{i}" for i in range(8)],
+    coldkeys=[f"coldkey-{i}" for i in range(8)],
+)
+
+
+def product(_id, trust_score):
+    return SimpleNamespace(_id=_id, name=f"name-{_id}", slug=f"slug-{_id}", trustScore=trust_score)
+
+
+def fill(buffer, uids, product_id="p1", trust_score=70.0):
+    predictions = [60.0 + uid for uid in uids]
+    rewards = [100 - abs(p - trust_score) for p in predictions]
+    buffer.append(product(product_id, trust_score), uids, predictions, rewards, metagraph)
+
+
+def test_records_match_stats_server_format():
+    buffer = PredictionLogBuffer(capacity=1)
+    fill(buffer, [1, 2])
+    fill(buffer, [3], product_id="p2", trust_score=50.0)
+
+    assert len(buffer) == 3
+    assert buffer.to_records() == [
+        {
+            "productId": "p1",
+            "productName": "name-p1",
+            "productSlug": "slug-p1",
+            "predictionScore": 61.0,
+            "actualScore": 70.0,
+            "hotkey": "hotkey-1",
+            "coldkey": "coldkey-1",
+            "uid": 1,
+        },
+        {
+            "productId": "p1",
+            "productName": "name-p1",
+            "productSlug": "slug-p1",
+            "predictionScore": 62.0,
+            "actualScore": 70.0,
+            "hotkey": "hotkey-2",
+            "coldkey": "coldkey-2",
+            "uid": 2,
+        },
+        {
+            "productId": "p2",
+            "productName": "name-p2",
+            "productSlug": "slug-p2",
+            "predictionScore": 63.0,
+            "actualScore": 50.0,
+            "hotkey": "hotkey-3",
+            "coldkey": "coldkey-3",
+            "uid": 3,
+        },
+    ]
+
+
+def test_extend_remaps_products():
+    first, second = PredictionLogBuffer(), PredictionLogBuffer()
+    fill(first, [0], product_id="p1")
+    fill(second, [4], product_id="p2")
+    fill(second, [5], product_id="p1")
+
+    first.extend(second)
+
+    assert [r["productId"] for r in first.to_records()] == ["p1", "p2", "p1"]
+    assert len(first.products) == 2
+    assert np.array_equal(first.column("uid"), [0, 4, 5])
+
+
+def test_to_arrow_round_trip():
+    pytest.importorskip("pyarrow")
+    buffer = PredictionLogBuffer()
+    fill(buffer, [1, 2, 3])
+
+    table = buffer.to_arrow()
+
+    assert table.num_rows == 3
+    assert table.column("hotkey").to_pylist() == ["hotkey-1", "hotkey-2", "hotkey-3"]
+    assert table.column("reward").to_pylist() == [91.0, 92.0, 93.0]
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import pstats
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+from checkerchain.utils.profiling import ForwardProfiler, build_profiler, profiled
+
+
+def busy(seconds=0.05):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def files(directory, suffix):
+    return sorted(name for name in os.listdir(directory) if name.endswith(suffix))
+
+
+def test_profiles_every_nth_call(tmp_path):
+    profiler = ForwardProfiler(str(tmp_path), every=3)
+
+    for _ in range(7):
+        with profiler.profile("validator_forward"):
+            busy(0.001)
+
+    dumps = files(tmp_path, ".prof")
+    assert len(dumps) == 2
+    assert [name.rsplit("-", 1)[1] for name in dumps] == ["3.prof", "6.prof"]
+    stats = pstats.Stats(str(tmp_path / dumps[0]))
+    assert any(func[2] == "busy" for func in stats.stats)
+
+
+def test_sampling_profiler_writes_folded_stacks(tmp_path):
+    profiler = ForwardProfiler(str(tmp_path), every=1, kind="sampling")
+
+    with profiler.profile("miner_forward"):
+        busy()
+
+    (folded,) = files(tmp_path, ".folded")
+    lines = (tmp_path / folded).read_text().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy (test_profiling.py" in line for line in lines)
+
+
+def test_memory_snapshot(tmp_path):
+    profiler = ForwardProfiler(str(tmp_path), every=1, memory=True)
+
+    with profiler.profile("miner_forward"):
+        data = [bytearray(1024) for _ in range(100)]
+
+    (dump,) = files(tmp_path, ".tracemalloc")
+    snapshot = tracemalloc.Snapshot.load(str(tmp_path / dump))
+    assert sum(stat.size for stat in snapshot.statistics("filename")) >= 100 * 1024
+    assert not tracemalloc.is_tracing()
+    del data
+
+
+def test_overlapping_forwards_profile_one_at_a_time(tmp_path):
+    profiler = ForwardProfiler(str(tmp_path), every=1)
+
+    async def forward():
+        with profiler.profile("validator_forward"):
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(forward(), forward(), forward())
+
+    asyncio.run(main())
+
+    assert len(files(tmp_path, ".prof")) == 1
+    assert not profiler.active
+
+
+def test_shards_of_a_round_share_one_profile(tmp_path):
+    profiler = ForwardProfiler(str(tmp_path), every=2)
+
+    async def shard(step, delay):
+        with profiler.profile("validator_forward", key=step):
+            await asyncio.sleep(delay)
+            busy(0.001)
+
+    async def run_round(step):
+        await asyncio.gather(shard(step, 0.01), shard(step, 0.03), shard(step, 0.02))
+
+    async def main():
+        for step in range(4):
+            await run_round(step)
+
+    asyncio.run(main())
+
+    # Rounds (steps), not shards, are counted: steps 1 and 3 are the 2nd and 4th rounds.
+    assert profiler.calls["validator_forward"] == 4
+    dumps = files(tmp_path, ".prof")
+    assert [name.rsplit("-", 1)[1] for name in dumps] == ["2.prof", "4.prof"]
+    stats = pstats.Stats(str(tmp_path / dumps[0]))
+    assert sum(calls for (_, _, name), (_, calls, *_) in stats.stats.items() if name == "busy") == 3
+    assert not profiler.active
+
+
+def test_keeps_last_profiles(tmp_path):
+    profiler = ForwardProfiler(str(tmp_path), every=1, keep=2)
+
+    for _ in range(4):
+        with profiler.profile("miner_forward"):
+            pass
+        time.sleep(0.01)
+
+    assert [name.rsplit("-", 1)[1] for name in files(tmp_path, ".prof")] == ["3.prof", "4.prof"]
+
+
+def test_disabled_profiling(tmp_path):
+    config = SimpleNamespace(
+        neuron=SimpleNamespace(profile_every=0, full_path=str(tmp_path), profiler="cprofile", profile_memory=False)
+    )
+
+    assert build_profiler(config) is None
+    with profiled(None, "validator_forward"):
+        pass
+    assert os.listdir(tmp_path) == []
+
+
+def test_unknown_profiler(tmp_path):
+    with pytest.raises(ValueError):
+        ForwardProfiler(str(tmp_path), every=1, kind="perf")
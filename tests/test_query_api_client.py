@@ -0,0 +1,111 @@
+import asyncio
+from types import SimpleNamespace
+
+import bittensor as bt
+import numpy as np
+import pytest
+
+from checkerchain.api import get_query_axons
+from checkerchain.api.get_query_axons import QueryApiClient, rank_query_api_nodes
+
+
+class CountingDendrite:
+    """Answers every ping with 200 and counts the calls. Axons are their uids."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, axons, synapse, deserialize, timeout):
+        self.calls += 1
+        return [
+            SimpleNamespace(dendrite=SimpleNamespace(status_code=200, process_time=0.1))
+            for _ in axons
+        ]
+
+
+def make_metagraph():
+    return SimpleNamespace(
+        netuid=21,
+        S=np.array([1.0, 50.0, 40.0, 30.0, 2.0, 60.0]),
+        validator_trust=np.array([1, 1, 1, 1, 1, 0]),
+        axons=list(range(6)),
+    )
+
+
+def test_rank_query_api_nodes_orders_trusted_top_stake():
+    # uid 5 has the most stake but no validator trust.
+    assert rank_query_api_nodes(make_metagraph(), n=0.5) == [1, 2]
+
+
+def test_client_memoizes_node_list():
+    client = QueryApiClient(
+        wallet=None, metagraph=make_metagraph(), n=0.5, dendrite=CountingDendrite()
+    )
+
+    async def query_twice():
+        return await client.get_axons(), await client.get_axons()
+
+    first, second = asyncio.run(query_twice())
+    assert sorted(first) == sorted(second) == [1, 2]
+    assert client.dendrite.calls == 1
+
+
+class FailingDendrite(CountingDendrite):
+    """Fails every ping, as a dendrite whose session belongs to a closed event loop does."""
+
+    async def __call__(self, axons, synapse, deserialize, timeout):
+        self.calls += 1
+        raise RuntimeError("Event loop is closed")
+
+
+def test_client_does_not_memoize_empty_node_list():
+    client = QueryApiClient(
+        wallet=None, metagraph=make_metagraph(), n=0.5, dendrite=FailingDendrite()
+    )
+
+    async def query_twice():
+        return await client.get_axons(), await client.get_axons()
+
+    assert asyncio.run(query_twice()) == ([], [])
+    assert client.dendrite.calls == 2
+
+
+def test_client_replaces_owned_dendrite_on_new_loop(monkeypatch):
+    created = []
+
+    def make_dendrite(wallet):
+        created.append(CountingDendrite())
+        return created[-1]
+
+    monkeypatch.setattr(bt, "dendrite", make_dendrite)
+    client = QueryApiClient(wallet=None, metagraph=make_metagraph(), n=0.5, nodes_ttl=0)
+
+    async def query_twice():
+        return await client.get_axons(), await client.get_axons()
+
+    asyncio.run(query_twice())
+    assert len(created) == 1 and created[0].calls == 2
+    asyncio.run(client.get_axons())
+    assert len(created) == 2 and client.dendrite is created[1]
+
+
+def test_query_api_axons_uses_latest_metagraph(monkeypatch):
+    monkeypatch.setattr(get_query_axons, "_clients", {})
+    monkeypatch.setattr(bt, "dendrite", lambda wallet: CountingDendrite())
+    wallet = SimpleNamespace(hotkey=SimpleNamespace(ss58_address="hotkey"))
+    old, new = make_metagraph(), make_metagraph()
+    new.axons = [f"axon-{uid}" for uid in range(6)]
+
+    asyncio.run(get_query_axons.get_query_api_axons(wallet, metagraph=old, n=0.5))
+    axons = asyncio.run(get_query_axons.get_query_api_axons(wallet, metagraph=new, n=0.5))
+    assert sorted(axons) == ["axon-1", "axon-2"]
+
+
+def test_client_does_not_sync_callers_metagraph():
+    metagraph = make_metagraph()
+    metagraph.sync = lambda **kwargs: pytest.fail("caller's metagraph must not be synced")
+    client = QueryApiClient(
+        wallet=None, metagraph=metagraph, n=0.5, metagraph_ttl=0, dendrite=CountingDendrite()
+    )
+
+    assert client.metagraph is metagraph
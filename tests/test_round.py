@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from checkerchain.validator.prediction_log import PredictionLogBuffer
+from checkerchain.validator.round import ValidatorRound
+
+
+def make_round(n_uids, num_shards):
+    return ValidatorRound(
+        step=0,
+        miner_uids=np.arange(n_uids),
+        queries=[],
+        reward_items=[],
+        product_predictions={},
+        num_shards=num_shards,
+    )
+
+
+@pytest.mark.parametrize("n_uids", [0, 1, 7, 64])
+@pytest.mark.parametrize("num_shards", [1, 2, 3, 8])
+def test_shards_partition_miner_uids(n_uids, num_shards):
+    validator_round = make_round(n_uids, num_shards)
+    shards = [validator_round.shard_uids(i) for i in range(num_shards)]
+    assert np.array_equal(np.concatenate(shards), np.arange(n_uids))
+
+
+def test_merge_completes_after_all_shards():
+    validator_round = make_round(6, 3)
+    for shard in range(3):
+        assert not validator_round.done
+        uids = validator_round.shard_uids(shard)
+        validator_round.merge(shard, uids.astype(float), PredictionLogBuffer())
+    assert validator_round.done
+    assert np.array_equal(validator_round.rewards, np.arange(6, dtype=float))
+
+
+def test_failed_shard_completes_round_unscored():
+    validator_round = make_round(6, 3)
+    validator_round.merge(0, np.ones(2), PredictionLogBuffer())
+    validator_round.fail(1)
+    assert not validator_round.done
+    validator_round.merge(2, np.ones(2), PredictionLogBuffer())
+    assert validator_round.done
+    assert validator_round.scored.tolist() == [True, True, False, False, True, True]
+
+
+def test_round_is_finalized_when_a_shard_raises(monkeypatch):
+    import asyncio
+    import importlib
+    from types import SimpleNamespace
+
+    forward = importlib.import_module("checkerchain.validator.forward")
+    validator_round = make_round(4, 2)
+    finalized = []
+
+    async def query_miners(self, round_, shard_uids):
+        if 0 in shard_uids:
+            raise RuntimeError("dendrite exploded")
+
+    async def get_round(self, num_shards):
+        return validator_round
+
+    monkeypatch.setattr(forward, "FORWARD_INTERVAL", 0)
+    monkeypatch.setattr(forward, "get_round", get_round)
+    monkeypatch.setattr(forward, "query_miners", query_miners)
+    monkeypatch.setattr(forward, "score_miners", lambda self, round_, uids: (np.ones(len(uids)), PredictionLogBuffer()))
+    monkeypatch.setattr(forward, "finalize_round", lambda self, round_, block: finalized.append(round_))
+
+    async def run():
+        validator = SimpleNamespace(step=0, block=1, profiler=None, lock=asyncio.Lock())
+        await asyncio.gather(*(forward.forward(validator, shard, 2) for shard in range(2)))
+
+    asyncio.run(run())
+    assert finalized == [validator_round]
+    assert validator_round.scored.tolist() == [False, False, True, True]
+    assert validator_round.rewards.tolist() == [0, 0, 1, 1]
@@ -0,0 +1,55 @@
+import numpy as np
+
+from checkerchain.validator.score_history import ScoreHistory
+
+
+def eager_reference(rounds, n, decay):
+    """Plain per-round EMA in which missed rounds count as zero once a UID has been seen."""
+    weighted_sum = np.zeros(n)
+    weight = np.zeros(n)
+    seen = np.zeros(n, dtype=bool)
+    for uids, accuracy in rounds:
+        values = np.zeros(n)
+        values[uids] = accuracy
+        seen[uids] = True
+        weighted_sum = np.where(seen, decay * weighted_sum + values, 0.0)
+        weight = np.where(seen, decay * weight + 1.0, 0.0)
+    return np.divide(weighted_sum, weight, out=np.zeros(n), where=weight > 0)
+
+
+def test_lazy_decay_matches_eager_ema():
+    rng = np.random.default_rng(0)
+    history = ScoreHistory(8, half_life=3)
+    rounds = []
+    for _ in range(50):
+        uids = np.flatnonzero(rng.random(8) < 0.6)
+        if not len(uids):
+            continue
+        accuracy = rng.random(len(uids)) * 100
+        rounds.append((uids, accuracy))
+        history.update(uids, accuracy)
+        assert np.allclose(history.accuracy(), eager_reference(rounds, 8, history.decay))
+
+
+def test_single_round_does_not_overturn_history():
+    history = ScoreHistory(2, half_life=12)
+    for _ in range(10):
+        history.update([0, 1], [90.0, 50.0])
+    history.update([0, 1], [0.0, 100.0])
+    performance = history.performance()
+    assert performance[0] > performance[1]
+
+
+def test_reset_resize_and_state_round_trip():
+    history = ScoreHistory(2)
+    history.update([0, 1], [80.0, 60.0])
+    history.update([3], [70.0])
+    assert len(history) == 4
+    assert set(history.performance()) == {0, 1, 3}
+
+    history.reset(1)
+    assert set(history.performance()) == {0, 3}
+
+    restored = ScoreHistory(0)
+    restored.load_state_dict(history.state_dict())
+    assert restored.performance() == history.performance()
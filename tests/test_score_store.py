@@ -0,0 +1,77 @@
+import numpy as np
+
+from checkerchain.base.utils.score_store import ScoreStore
+
+
+def legacy_update(scores, uids, rewards, alpha):
+    scattered = np.zeros_like(scores)
+    scattered[uids] = rewards
+    return alpha * scattered + (1 - alpha) * scores
+
+
+def test_update_matches_legacy_ema():
+    rng = np.random.default_rng(0)
+    store = ScoreStore(64)
+    expected = np.zeros(64, dtype=np.float32)
+    for _ in range(50):
+        uids = rng.choice(64, size=16, replace=False)
+        rewards = rng.random(16).astype(np.float32)
+        expected = legacy_update(expected, uids, rewards, 0.1)
+        store.update(uids, rewards, 0.1)
+    assert store.scores.dtype == np.float32
+    assert np.array_equal(store.scores, expected)
+    assert np.array_equal(store.last_scores, expected)
+
+
+def test_update_does_not_reallocate():
+    store = ScoreStore(300)
+    buffer = store.scores
+    store.update(np.arange(10), np.ones(10), 0.5)
+    store.resize(400)
+    store.update(np.arange(10), np.ones(10), 0.5)
+    assert np.shares_memory(store.scores, buffer)
+
+
+def test_resize_grows_capacity_and_keeps_values():
+    store = ScoreStore(4)
+    store.update(np.array([1, 3]), np.array([1.0, 2.0]), 1.0)
+    store.resize(5000)
+    assert len(store.scores) == 5000
+    assert store.capacity == 8192
+    assert store.scores[:4].tolist() == [0.0, 1.0, 0.0, 2.0]
+    assert not store.scores[4:].any()
+
+
+def test_revert_and_reset():
+    store = ScoreStore(4)
+    store.update(np.array([0, 1]), np.array([1.0, 1.0]), 1.0)
+    store.scores[:] = 5
+    store.revert()
+    assert store.scores.tolist() == [1.0, 1.0, 0.0, 0.0]
+    store.reset([0])
+    assert store.scores.tolist() == [0.0, 1.0, 0.0, 0.0]
+    assert store.last_scores.tolist() == [1.0, 1.0, 0.0, 0.0]
+
+
+def test_assign_resizes_and_zero_fills():
+    store = ScoreStore(4)
+    store.scores[:] = 7
+    store.assign(np.array([1.0, 2.0]), last_scores=np.arange(6))
+    assert store.scores.tolist() == [1.0, 2.0, 0.0, 0.0, 0.0, 0.0]
+    assert store.last_scores.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_memmap_persists_across_instances(tmp_path):
+    path = str(tmp_path / "scores.npy")
+    store = ScoreStore(4, path=path)
+    assert store.created
+    store.update(np.array([2]), np.array([3.0]), 1.0)
+    store.resize(1000)
+    store.flush()
+    del store
+
+    reopened = ScoreStore(1000, path=path)
+    assert not reopened.created
+    assert reopened.scores[2] == 3.0
+    assert reopened.last_scores[2] == 3.0
+    assert reopened.capacity == 1024
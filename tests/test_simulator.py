@@ -0,0 +1,83 @@
+import asyncio
+
+import bittensor as bt
+from bittensor_wallet.mock import get_mock_wallet
+
+from checkerchain.mock import MinerProfile, MockDendrite
+from checkerchain.protocol import CheckerChainSynapse
+from checkerchain.utils import checker_chain
+from checkerchain.utils.simulator import MockCheckerChainAPI, run_simulation
+
+
+def axon(hotkey):
+    return bt.AxonInfo(version=0, ip="127.0.0.1", port=8091, ip_type=4, hotkey=hotkey, coldkey="coldkey")
+
+
+def query(dendrite, hotkeys, products, timeout=25):
+    return asyncio.run(
+        dendrite(
+            axons=[axon(hotkey) for hotkey in hotkeys],
+            synapse=CheckerChainSynapse(query=products),
+            timeout=timeout,
+            deserialize=False,
+        )
+    )
+
+
+def test_mock_dendrite_initializes_base_dendrite_offline():
+    wallet = get_mock_wallet()
+    dendrite = MockDendrite(wallet)
+    assert dendrite.external_ip == "127.0.0.1"
+    assert dendrite.keypair.ss58_address == wallet.hotkey.ss58_address
+    assert dendrite.uuid and dendrite.synapse_history == []
+
+
+def test_mock_dendrite_follows_miner_profiles():
+    dendrite = MockDendrite(
+        get_mock_wallet(),
+        profiles={
+            "failing": MinerProfile(latency=0, jitter=0, error_rate=1.0),
+            "slow": MinerProfile(latency=30, jitter=0),
+        },
+        default_profile=MinerProfile(latency=0.01, jitter=0, noise=0),
+        truth=lambda product_id: 42.0,
+        time_scale=0,
+        seed=0,
+    )
+    ok, failing, slow = query(dendrite, ["ok", "failing", "slow"], ["a", "b"])
+    assert ok.dendrite.status_code == 200
+    assert ok.response == [42.0, 42.0]
+    assert failing.dendrite.status_code == 500
+    assert failing.response == []
+    assert slow.dendrite.status_code == 408
+    assert slow.response == []
+
+
+def test_mock_api_serves_published_and_reviewed_products(monkeypatch):
+    with MockCheckerChainAPI() as api:
+        api.publish(2)
+        monkeypatch.setattr(checker_chain, "BACKEND_URL", api.url)
+        product_id = api.published[0]["_id"]
+        assert checker_chain.fetch_product_data(product_id)._id == product_id
+
+        api.review()
+        api.publish(1)
+        assert [p["trustScore"] for p in api.reviewed] == [
+            api.trust_score(p["_id"]) for p in api.reviewed
+        ]
+        assert len(api.published) == 1
+
+
+def test_run_simulation_scores_rounds_after_the_first():
+    report = run_simulation(
+        rounds=3,
+        miners=8,
+        products=3,
+        num_shards=2,
+        profile=MinerProfile(latency=0, jitter=0),
+        time_scale=0,
+    )
+    assert len(report.rounds) == 3
+    assert all(r.wall > 0 and r.db > 0 for r in report.rounds)
+    assert all(r.scoring > 0 for r in report.rounds[1:])
+    assert set(report.summary()) == {"wall", "db", "scoring"}
@@ -0,0 +1,49 @@
+import os
+
+import numpy as np
+
+from checkerchain.base.utils.state_store import StateStore, decode_hotkeys, encode_hotkeys
+
+
+def make_state(step=1, scores=(0.5, 0.25)):
+    return dict(
+        step=np.asarray(step),
+        scores=np.asarray(scores, dtype=np.float32),
+        hotkeys=encode_hotkeys(["5Hotkey0", "5Hotkey1"]),
+    )
+
+
+def test_round_trip_without_pickle(tmp_path):
+    store = StateStore(str(tmp_path / "state.npz"))
+    assert store.load() is None
+    assert store.save(make_state())
+
+    loaded = StateStore(store.path).load()
+    assert loaded["hotkeys"].dtype.kind == "S"
+    assert decode_hotkeys(loaded["hotkeys"]) == ["5Hotkey0", "5Hotkey1"]
+    assert np.array_equal(loaded["scores"], [0.5, 0.25])
+    with np.load(store.path, allow_pickle=False) as npz:
+        assert int(npz["version"]) == 2
+
+
+def test_skips_writes_when_only_the_step_changed(tmp_path):
+    store = StateStore(str(tmp_path / "state.npz"))
+    assert store.save(make_state(step=1))
+    assert not store.save(make_state(step=2))
+    assert store.save(make_state(step=3, scores=(0.5, 0.3)))
+    assert not os.path.exists(store.path + ".tmp")
+
+
+def test_loads_legacy_state_with_object_hotkeys(tmp_path):
+    path = str(tmp_path / "state.npz")
+    np.savez(path, step=3, scores=np.zeros(2), hotkeys=np.array(["a", "b"], dtype=object))
+    loaded = StateStore(path).load()
+    assert decode_hotkeys(loaded["hotkeys"]) == ["a", "b"]
+
+
+def test_corrupt_state_is_set_aside(tmp_path):
+    path = str(tmp_path / "state.npz")
+    with open(path, "wb") as f:
+        f.write(b"PK\x03\x04 truncated")
+    assert StateStore(path).load() is None
+    assert os.path.exists(path + ".corrupt") and not os.path.exists(path)
@@ -0,0 +1,111 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from checkerchain.utils.stats_server import (
+    OwnerTelemetryClient,
+    StatsUploader,
+    TokenManager,
+    PREDICTION_ENDPOINT,
+)
+
+
+@pytest.fixture
+def stats_server():
+    received = []
+    statuses = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            if self.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            status = statuses.pop(0) if statuses else 201
+            if status == 201:
+                received.append((self.path, json.loads(body)))
+            self.send_response(status)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", received, statuses
+    server.shutdown()
+
+
+def make_uploader(tmp_path, url, **kwargs):
+    return StatsUploader(
+        outbox_path=str(tmp_path / "outbox.db"),
+        client=OwnerTelemetryClient(coldkey="ck", url=url, jwt_secret="secret"),
+        **kwargs,
+    )
+
+
+def test_flush_uploads_batches(tmp_path, stats_server):
+    url, received, _ = stats_server
+    uploader = make_uploader(tmp_path, url, batch_size=2)
+    uploader.enqueue(PREDICTION_ENDPOINT, [{"uid": i} for i in range(3)])
+
+    assert uploader.flush_once()
+    assert uploader.flush_once()
+    assert uploader.pending() == 0
+    assert [path for path, _ in received] == [PREDICTION_ENDPOINT] * 2
+    assert [r["uid"] for _, batch in received for r in batch] == [0, 1, 2]
+
+
+def test_failed_upload_stays_in_outbox(tmp_path, stats_server):
+    url, received, statuses = stats_server
+    statuses.append(503)
+    uploader = make_uploader(tmp_path, url)
+    uploader.enqueue(PREDICTION_ENDPOINT, [{"uid": 1}])
+
+    assert not uploader.flush_once()
+    assert uploader.pending() == 1
+
+    # A new uploader on the same outbox picks up where the previous one stopped.
+    restarted = make_uploader(tmp_path, url)
+    assert restarted.flush_once()
+    assert restarted.pending() == 0
+    assert received == [(PREDICTION_ENDPOINT, [{"uid": 1}])]
+
+
+@pytest.mark.parametrize("status", [203, 302, 307, 503])
+def test_unexpected_status_stays_in_outbox(tmp_path, stats_server, status):
+    url, _, statuses = stats_server
+    statuses.append(status)
+    uploader = make_uploader(tmp_path, url)
+    uploader.enqueue(PREDICTION_ENDPOINT, [{"uid": 1}])
+
+    assert not uploader.flush_once()
+    assert uploader.pending() == 1
+
+
+def test_stop_flushes_outbox(tmp_path, stats_server):
+    url, received, _ = stats_server
+    # A long flush interval keeps the thread from uploading before it is stopped.
+    uploader = make_uploader(tmp_path, url, batch_size=2, flush_interval=3600)
+    uploader.start()
+    uploader.enqueue(PREDICTION_ENDPOINT, [{"uid": 1}])
+
+    uploader.stop(flush=True)
+    assert not uploader._thread.is_alive()
+    assert uploader.pending() == 0
+    assert received == [(PREDICTION_ENDPOINT, [{"uid": 1}])]
+
+
+def test_token_is_cached_until_refresh_margin(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("checkerchain.utils.stats_server.time.time", lambda: now[0])
+    tokens = TokenManager(subject="ck", secret="secret", ttl=600, refresh_margin=60)
+
+    first = tokens.token()
+    now[0] += 500
+    assert tokens.token() == first
+    now[0] += 50
+    assert tokens.token() != first
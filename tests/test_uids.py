@@ -0,0 +1,96 @@
+import copy
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from checkerchain.utils.uids import (
+    EligibilityIndex,
+    check_uid_availability,
+    eligible_uid_mask,
+    get_filtered_uids,
+    latency_weights,
+    sample_uids,
+)
+
+
+def legacy_filtered_uids(metagraph, vpermit_tao_limit, max_per_key):
+    """The per-uid loop that eligible_uid_mask replaced."""
+    coldkeys = copy.deepcopy(metagraph.coldkeys)
+    counts = {}
+    available_uids = []
+    for i, ck in enumerate(coldkeys):
+        cnt = counts.get(ck, 0)
+        if cnt < max_per_key:
+            if check_uid_availability(metagraph, i, vpermit_tao_limit):
+                available_uids.append(i)
+            counts[ck] = cnt + 1
+    return np.array(available_uids, dtype=np.int64)
+
+
+def random_metagraph(rng, n):
+    return SimpleNamespace(
+        n=n,
+        coldkeys=[f"ck{c}" for c in rng.integers(0, max(1, n // 8), size=n)],
+        axons=[SimpleNamespace(is_serving=bool(s)) for s in rng.random(n) < 0.8],
+        validator_permit=rng.random(n) < 0.2,
+        S=rng.random(n) * 20000,
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_eligible_uid_mask_matches_legacy_loop(seed):
+    rng = np.random.default_rng(seed)
+    metagraph = random_metagraph(rng, int(rng.integers(0, 300)))
+    max_per_key = int(rng.integers(1, 20))
+    assert np.array_equal(
+        np.flatnonzero(eligible_uid_mask(metagraph, 4096, max_per_key)),
+        legacy_filtered_uids(metagraph, 4096, max_per_key),
+    )
+
+
+def test_get_filtered_uids_reads_the_cached_index():
+    metagraph = random_metagraph(np.random.default_rng(0), 64)
+    index = EligibilityIndex(vpermit_tao_limit=4096)
+    index.rebuild(metagraph)
+    validator = SimpleNamespace(
+        metagraph=metagraph,
+        eligibility_index=index,
+        config=SimpleNamespace(neuron=SimpleNamespace(vpermit_tao_limit=4096)),
+    )
+    assert get_filtered_uids(validator) is index.uids
+    assert np.array_equal(get_filtered_uids(validator, max_per_key=2), legacy_filtered_uids(metagraph, 4096, 2))
+
+
+@pytest.mark.parametrize("k", [0, 3, 10, 50])
+def test_sample_uids_prefers_non_excluded_available_uids(k):
+    rng = np.random.default_rng(k)
+    available = np.zeros(40, dtype=bool)
+    available[::2] = True  # 20 available uids
+    exclude = np.zeros(40, dtype=bool)
+    exclude[:20] = True  # 10 of them excluded
+    uids = sample_uids(available, k, exclude=exclude, rng=rng)
+    assert uids.size == min(k, 20)
+    assert np.unique(uids).size == uids.size
+    assert available[uids].all()
+    allowed = np.flatnonzero(available & ~exclude)
+    if k >= allowed.size:
+        assert np.isin(allowed, uids).all()
+    else:
+        assert np.isin(uids, allowed).all()
+
+
+def test_weighted_sampling_skips_zero_weights_until_needed():
+    rng = np.random.default_rng(0)
+    available = np.ones(10, dtype=bool)
+    weights = np.zeros(10)
+    weights[[2, 5, 7]] = [1.0, 2.0, 3.0]
+    assert set(sample_uids(available, 3, weights=weights, rng=rng).tolist()) == {2, 5, 7}
+    uids = sample_uids(available, 5, weights=weights, rng=rng)
+    assert {2, 5, 7} <= set(uids.tolist()) and uids.size == 5
+
+
+def test_latency_weights_favour_fast_miners():
+    weights = latency_weights(np.array([0.5, 2.0, np.nan, 0.0]))
+    assert weights[0] > weights[1] > 0
+    assert weights[2] == weights[3] == 0
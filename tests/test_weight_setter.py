@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+
+from checkerchain.base.utils.weight_setter import WeightSetter
+from checkerchain.mock import MockSubtensor
+
+
+class FakeSubtensor:
+    def __init__(self, fail=0):
+        self.block = 100
+        self.last_update = [0, 0]
+        self.fail = fail
+        self.submitted = []
+
+    def get_current_block(self):
+        return self.block
+
+    def get_hyperparameter(self, param_name, netuid):
+        assert param_name == "LastUpdate"
+        return self.last_update
+
+    def set_weights(self, uids, weights, **kwargs):
+        if self.fail:
+            self.fail -= 1
+            return False, "boom"
+        self.submitted.append((uids, weights))
+        return True, ""
+
+
+def make_setter(subtensor):
+    return WeightSetter(subtensor, wallet=None, netuid=1, uid=1, version_key=1, inclusion_timeout=5)
+
+
+def test_submits_then_confirms_inclusion():
+    subtensor = FakeSubtensor()
+    setter = make_setter(subtensor)
+    assert setter.submit([0], [65535])
+    setter.poll_once()
+    assert subtensor.submitted == [([0], [65535])]
+    assert setter.in_flight.block == 100 and setter.pending is None
+
+    subtensor.block = 102
+    setter.poll_once()
+    assert setter.in_flight is not None
+
+    subtensor.last_update = [0, 101]
+    setter.poll_once()
+    assert setter.in_flight is None
+    assert setter.last_included.weights == [65535]
+
+
+def test_skips_vector_already_in_flight():
+    subtensor = FakeSubtensor()
+    setter = make_setter(subtensor)
+    setter.submit([0], [65535])
+    setter.poll_once()
+    assert not setter.submit([0], [65535])
+    assert setter.submit([0, 1], [65535, 10])
+
+
+def test_retries_failed_and_lost_submissions():
+    subtensor = FakeSubtensor(fail=1)
+    setter = make_setter(subtensor)
+    setter.submit([0], [65535])
+    setter.poll_once()
+    assert setter.pending is not None and not subtensor.submitted
+
+    setter.poll_once()
+    assert len(subtensor.submitted) == 1
+
+    # Never included: after the timeout the vector is queued again and resent.
+    subtensor.block = 106
+    setter.poll_once()
+    assert setter.in_flight is None and setter.pending is not None
+    setter.poll_once()
+    assert len(subtensor.submitted) == 2
+
+
+def test_validator_shutdown_stops_weight_setter():
+    from neurons.validator import Validator
+
+    setter = make_setter(FakeSubtensor())
+    setter.start()
+    validator = Validator.__new__(Validator)
+    validator.is_running = False
+    validator.weight_setter = setter
+    validator.stats_uploader = None
+
+    validator.stop_run_thread()
+    assert not setter._thread.is_alive()
+
+    setter.start()
+    validator.__exit__(None, None, None)
+    assert not setter._thread.is_alive()
+
+
+def register(subtensor, netuid, uid, hotkey):
+    """Registers `hotkey` at `uid` in the mock chain state."""
+    state = subtensor.chain_state["SubtensorModule"]
+    block = subtensor.get_current_block()
+    state["Uids"][netuid][hotkey] = {block: uid}
+    state["Keys"][netuid][uid] = {block: hotkey}
+    state["SubnetworkN"][netuid][block] = max(uid + 1, state["SubnetworkN"][netuid].get(block, 0))
+
+
+def test_confirms_inclusion_through_mock_subtensor():
+    subtensor = MockSubtensor(netuid=1, n=0)
+    register(subtensor, 1, 0, "miner-hotkey")
+    register(subtensor, 1, 1, "validator-hotkey")
+    wallet = SimpleNamespace(hotkey=SimpleNamespace(ss58_address="validator-hotkey"))
+    setter = WeightSetter(subtensor, wallet=wallet, netuid=1, uid=1, version_key=1, inclusion_timeout=5)
+
+    setter.submit([0], [65535])
+    setter.poll_once()
+    assert setter.in_flight is not None and setter.pending is None
+    assert subtensor.get_hyperparameter(param_name="LastUpdate", netuid=1)[1] == setter.in_flight.block
+
+    subtensor.do_block_step()
+    setter.poll_once()
+    assert setter.in_flight is None
+    assert setter.last_included.weights == [65535]
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from checkerchain.base.utils.weight_utils import (
+    U16_MAX,
+    compute_rank_weights,
+    convert_weights_and_uids_for_emit,
+    normalize_max_weight,
+    rankdata_average,
+)
+
+
+def legacy_normalize_max_weight(x, limit=0.1):
+    """The loop-based implementation that normalize_max_weight replaced."""
+    epsilon = 1e-7
+    weights = x.copy()
+    values = np.sort(weights)
+    if x.sum() == 0 or len(x) * limit <= 1:
+        return np.ones_like(x) / x.size
+    estimation = values / values.sum()
+    if estimation.max() <= limit:
+        return weights / weights.sum()
+    cumsum = np.cumsum(estimation, 0)
+    estimation_sum = np.array(
+        [(len(values) - i - 1) * estimation[i] for i in range(len(values))]
+    )
+    n_values = (estimation / (estimation_sum + cumsum + epsilon) < limit).sum()
+    cutoff_scale = (limit * cumsum[n_values - 1] - epsilon) / (
+        1 - (limit * (len(estimation) - n_values))
+    )
+    cutoff = cutoff_scale * values.sum()
+    weights[weights > cutoff] = cutoff
+    return weights / weights.sum()
+
+
+def legacy_convert_weights_and_uids_for_emit(uids, weights):
+    """The loop-based implementation that convert_weights_and_uids_for_emit replaced."""
+    uids = np.asarray(uids)
+    weights = np.asarray(weights)
+    if np.sum(weights) == 0:
+        return [], []
+    max_weight = float(np.max(weights))
+    weights = [float(value) / max_weight for value in weights]
+    weight_vals = []
+    weight_uids = []
+    for weight_i, uid_i in zip(weights, uids):
+        uint16_val = round(float(weight_i) * int(U16_MAX))
+        if uint16_val != 0:
+            weight_vals.append(uint16_val)
+            weight_uids.append(uid_i)
+    return weight_uids, weight_vals
+
+
+def random_weights(rng, dtype):
+    """Weights with a random size, zeros, ties and a few dominant values."""
+    n = int(rng.integers(1, 300))
+    weights = rng.random(n) ** rng.uniform(0.5, 8)
+    weights[rng.random(n) < 0.2] = 0.0
+    weights[rng.random(n) < 0.05] *= 1000
+    if rng.random() < 0.3:
+        weights = np.round(weights, 2)
+    return weights.astype(dtype)
+
+
+def reference_rankdata(x):
+    """Average ranks by definition: 1 + (#smaller) + (#equal - 1) / 2."""
+    x = np.asarray(x)
+    smaller = (x[None, :] < x[:, None]).sum(axis=1)
+    equal = (x[None, :] == x[:, None]).sum(axis=1)
+    return 1 + smaller + (equal - 1) / 2
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rankdata_average_matches_definition(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, 10, size=50).astype(float)
+    assert np.array_equal(rankdata_average(x), reference_rankdata(x))
+
+
+def test_rankdata_average_empty():
+    assert rankdata_average(np.array([])).size == 0
+
+
+def test_rank_weights_match_rank_order_and_drop_dividends():
+    performance = np.array([10.0, 30.0, 20.0, 30.0, 5.0, 0.0])
+    observed = np.array([True, True, True, True, True, False])
+    dividends = np.array([0.0, 0.0, 0.0, 0.0, 1.0, 0.0])
+    weights = compute_rank_weights(performance, observed, dividends)
+    # Ranks: uid4=1 (zeroed by dividends), uid0=2, uid2=3, uid1/uid3 share (4+5)/2.
+    expected = np.array([2.0, 4.5, 3.0, 4.5, 0.0, 0.0])
+    assert np.allclose(weights, expected / expected.sum())
+
+
+def test_rank_weights_all_zero_without_observations():
+    weights = compute_rank_weights(np.zeros(4), np.zeros(4, dtype=bool), np.zeros(4))
+    assert not weights.any()
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_normalize_max_weight_matches_legacy(seed):
+    rng = np.random.default_rng(seed)
+    x = random_weights(rng, rng.choice([np.float32, np.float64]))
+    limit = float(rng.choice([0.01, 0.05, 0.1, 0.25, 0.5, 1.0]))
+    assert np.array_equal(normalize_max_weight(x, limit), legacy_normalize_max_weight(x, limit))
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_convert_weights_and_uids_for_emit_matches_legacy(seed):
+    rng = np.random.default_rng(seed)
+    weights = random_weights(rng, rng.choice([np.float32, np.float64]))
+    uids = rng.permutation(len(weights))
+    assert convert_weights_and_uids_for_emit(uids, weights) == legacy_convert_weights_and_uids_for_emit(
+        uids, weights
+    )
+
+
+def test_convert_weights_rounds_half_to_even():
+    # Half of the max scales to exactly 32767.5, which Python's round() takes to the even 32768.
+    uids, vals = convert_weights_and_uids_for_emit(np.arange(3), np.array([2.0, 1.0, 0.0]))
+    assert uids == [0, 1]
+    assert vals == [U16_MAX, 32768]